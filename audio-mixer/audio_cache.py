@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""On-disk cache of decoded audio for the audio server.
+
+Decoding a track (``sf.read`` + resample to 44.1 kHz stereo float32) on every
+``/cue`` or ``/load_buffer`` stalls cueing on the Raspberry Pi, even when the
+same sectioned part was loaded minutes ago.  This module stores the decoded,
+engine-format PCM as ``.npy`` files keyed by source path, mtime, size and
+target rate, so :class:`AudioBuffer` can open them with ``np.load(mmap_mode="r")``:
+reloads are O(1) and the OS page cache is shared between server restarts.
+
+Usage:
+    # Pre-warm the cache from the mixer CSV(s)
+    python audio_cache.py warm track_data_Cm-Gm_122-d3.csv
+
+    # Show / prune stale entries / wipe the cache
+    python audio_cache.py stats
+    python audio_cache.py prune
+    python audio_cache.py clear
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+ENGINE_SAMPLE_RATE = 44100
+# Sample storage formats for decoded PCM; players convert gathered frames to float32
+SAMPLE_FORMATS = ("float32", "int16", "float16")
+INT16_SCALE = 1.0 / 32768.0
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("CROWDSTREAM_AUDIO_CACHE", Path.home() / ".cache" / "crowdstream" / "decoded")
+)
+
+
+def sample_scale(data: np.ndarray) -> float:
+    """Factor that maps stored samples of ``data`` to float32 full scale."""
+    return INT16_SCALE if data.dtype == np.int16 else 1.0
+
+
+def to_sample_format(audio_data: np.ndarray, sample_format: str = "float32",
+                     block_frames: int = 1 << 16) -> np.ndarray:
+    """Convert float32 PCM to ``sample_format`` storage (block-wise, no full-size temporaries).
+
+    int16 stores ``round(x * 32768)`` clipped to the int16 range, which is
+    lossless for 16-bit sources; float16 keeps about 11 bits of mantissa.
+    """
+    if sample_format not in SAMPLE_FORMATS:
+        raise ValueError(f"Unknown sample format '{sample_format}' (expected {'|'.join(SAMPLE_FORMATS)})")
+    dtype = np.dtype(sample_format)
+    if audio_data.dtype == dtype:
+        return audio_data
+    if dtype != np.int16:
+        return np.ascontiguousarray(audio_data, dtype=dtype)
+    out = np.empty(audio_data.shape, dtype=np.int16)
+    tmp = np.empty((min(block_frames, audio_data.shape[0]),) + audio_data.shape[1:], dtype=np.float32)
+    for start in range(0, audio_data.shape[0], block_frames):
+        block = audio_data[start:start + block_frames]
+        t = tmp[:block.shape[0]]
+        np.multiply(block, 32768.0, out=t)
+        np.rint(t, out=t)
+        np.clip(t, -32768.0, 32767.0, out=t)
+        np.copyto(out[start:start + block.shape[0]], t, casting="unsafe")
+    return out
+
+
+def decode_audio_file(file_path: str | Path, target_sr: int = ENGINE_SAMPLE_RATE,
+                      sample_format: str = "float32") -> Tuple[np.ndarray, int]:
+    """Decode a file to stereo PCM at ``target_sr`` stored as ``sample_format``.
+
+    Returns ``(audio_data, sample_rate)``; if resampling fails the original rate
+    is returned so the caller can decide what to do. 16-bit files already at
+    ``target_sr`` are read as int16 directly for the int16 format.
+    """
+    if sample_format == "int16":
+        info = sf.info(str(file_path))
+        if info.samplerate == target_sr and info.subtype == "PCM_16":
+            audio_data, sample_rate = sf.read(str(file_path), dtype=np.int16, always_2d=True)
+            if audio_data.shape[1] == 1:
+                audio_data = np.tile(audio_data, (1, 2))
+            return np.ascontiguousarray(audio_data[:, :2]), sample_rate
+
+    audio_data, sample_rate = sf.read(str(file_path), dtype=np.float32)
+
+    if audio_data.ndim == 1:
+        audio_data = np.column_stack((audio_data, audio_data))
+    elif audio_data.shape[1] == 1:
+        audio_data = np.tile(audio_data, (1, 2))
+    elif audio_data.shape[1] > 2:
+        audio_data = np.ascontiguousarray(audio_data[:, :2])
+
+    # --- Ensure buffer matches engine sample rate (prevents pitch/time stretch) ---
+    if sample_rate != target_sr:
+        try:
+            # Linear resample per channel
+            n_src = audio_data.shape[0]
+            n_dst = int(round(n_src * target_sr / sample_rate))
+            x_src = np.linspace(0.0, n_src - 1, num=n_src, endpoint=True, dtype=np.float64)
+            x_dst = np.linspace(0.0, n_src - 1, num=n_dst, endpoint=True, dtype=np.float64)
+            resampled = np.empty((n_dst, 2), dtype=np.float32)
+            resampled[:, 0] = np.interp(x_dst, x_src, audio_data[:, 0]).astype(np.float32)
+            resampled[:, 1] = np.interp(x_dst, x_src, audio_data[:, 1]).astype(np.float32)
+            print(f"↻ Resampled '{Path(file_path).stem}' {n_src}@{sample_rate}→{n_dst}@{target_sr}")
+            audio_data = resampled
+            sample_rate = target_sr
+        except Exception as _res_exc:
+            print(f"⚠️  Resample failed ({_res_exc}); continuing with original rate {sample_rate} Hz")
+
+    return to_sample_format(np.ascontiguousarray(audio_data, dtype=np.float32), sample_format), sample_rate
+
+
+class DecodedAudioCache:
+    """Directory of decoded PCM ``.npy`` files plus a small JSON sidecar each.
+
+    Entries are immutable: a changed source file (mtime/size) maps to a new key,
+    and ``prune()`` removes entries whose source changed or disappeared. Entries
+    are stored in ``sample_format``, which is part of the key for int16/float16.
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR, target_sr: int = ENGINE_SAMPLE_RATE,
+                 sample_format: str = "float32"):
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unknown sample format '{sample_format}' (expected {'|'.join(SAMPLE_FORMATS)})")
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.target_sr = int(target_sr)
+        self.sample_format = sample_format
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, source: Path) -> Optional[str]:
+        try:
+            st = source.stat()
+        except OSError:
+            return None
+        ident = f"{source}|{st.st_mtime_ns}|{st.st_size}|{self.target_sr}"
+        if self.sample_format != "float32":
+            ident += f"|{self.sample_format}"
+        digest = hashlib.sha1(ident.encode("utf-8")).hexdigest()[:20]
+        return f"{source.stem[:48]}-{digest}"
+
+    def entry_path(self, file_path: str | Path) -> Optional[Path]:
+        """Cache file for ``file_path`` as it is on disk now (None if unreadable)."""
+        source = Path(file_path).expanduser().resolve()
+        key = self._key(source)
+        return self.cache_dir / f"{key}.npy" if key else None
+
+    def load(self, file_path: str | Path) -> Optional[np.ndarray]:
+        """Memory-map the cached PCM for ``file_path``, or None on a miss."""
+        entry = self.entry_path(file_path)
+        if entry is None or not entry.exists():
+            self.misses += 1
+            return None
+        try:
+            data = np.load(entry, mmap_mode="r")
+        except Exception as exc:
+            print(f"⚠️  Cache entry unreadable ({entry.name}): {exc}; decoding again")
+            self.misses += 1
+            return None
+        if data.ndim != 2 or data.shape[1] != 2 or data.dtype != np.dtype(self.sample_format):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def store(self, file_path: str | Path, audio_data: np.ndarray) -> Optional[Path]:
+        """Write decoded PCM atomically (tmp file + rename); returns the entry path.
+
+        Each call writes its own temporary file, so loader threads (or processes)
+        storing the same track at once never interleave; the last rename wins.
+        """
+        source = Path(file_path).expanduser().resolve()
+        entry = self.entry_path(source)
+        if entry is None:
+            return None
+        tmp: Optional[str] = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f"{entry.stem}.", suffix=".tmp",
+                                             delete=False) as f:
+                tmp = f.name
+                np.save(f, to_sample_format(np.ascontiguousarray(audio_data), self.sample_format))
+            os.replace(tmp, entry)
+            tmp = None
+            st = source.stat()
+            meta = {
+                "source": str(source),
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "target_sr": self.target_sr,
+                "sample_format": self.sample_format,
+                "frames": int(audio_data.shape[0]),
+                "created": time.time(),
+            }
+            entry.with_suffix(".json").write_text(json.dumps(meta))
+            return entry
+        except Exception as exc:
+            print(f"⚠️  Could not write audio cache entry for {source.name}: {exc}")
+            return None
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def get_or_decode(self, file_path: str | Path) -> Tuple[np.ndarray, int, bool]:
+        """Return ``(audio_data, sample_rate, cache_hit)``.
+
+        On a miss the file is decoded, stored and re-opened as a memmap so the
+        resident copy is page-cache backed like a hit.
+        """
+        data = self.load(file_path)
+        if data is not None:
+            return data, self.target_sr, True
+        audio_data, sample_rate = decode_audio_file(file_path, self.target_sr, self.sample_format)
+        if sample_rate == self.target_sr:
+            entry = self.store(file_path, audio_data)
+            if entry is not None:
+                try:
+                    audio_data = np.load(entry, mmap_mode="r")
+                except Exception:
+                    pass
+        return audio_data, sample_rate, False
+
+    def entries(self) -> List[Tuple[Path, dict]]:
+        """All entries with their sidecar metadata (empty dict if missing)."""
+        out: List[Tuple[Path, dict]] = []
+        if not self.cache_dir.exists():
+            return out
+        for npy in sorted(self.cache_dir.glob("*.npy")):
+            meta_path = npy.with_suffix(".json")
+            try:
+                meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+            except Exception:
+                meta = {}
+            out.append((npy, meta))
+        return out
+
+    def _remove(self, npy: Path) -> int:
+        size = 0
+        for p in (npy, npy.with_suffix(".json")):
+            try:
+                size += p.stat().st_size
+                p.unlink()
+            except FileNotFoundError:
+                pass
+        return size
+
+    def prune(self) -> Tuple[int, int]:
+        """Remove entries whose source is gone or changed; returns (count, bytes)."""
+        removed = freed = 0
+        for npy, meta in self.entries():
+            source = Path(meta.get("source", ""))
+            current = self.entry_path(source) if meta.get("source") else None
+            if current is None or current.name != npy.name:
+                freed += self._remove(npy)
+                removed += 1
+        return removed, freed
+
+    def clear(self) -> Tuple[int, int]:
+        removed = freed = 0
+        for npy, _ in self.entries():
+            freed += self._remove(npy)
+            removed += 1
+        return removed, freed
+
+
+def _csv_audio_paths(csv_paths: Iterable[str | Path], columns: Iterable[str]) -> List[Path]:
+    """Audio paths referenced by the mixer CSV(s), de-duplicated, in CSV order.
+
+    Relative paths are resolved like the server does (current directory) and,
+    failing that, relative to the CSV file itself.
+    """
+    seen = set()
+    paths: List[Path] = []
+    for csv_path in csv_paths:
+        csv_path = Path(csv_path)
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                for col in columns:
+                    value = (row.get(col) or "").strip()
+                    if not value:
+                        continue
+                    p = Path(value).expanduser()
+                    if not p.is_absolute() and not p.exists():
+                        alt = csv_path.parent / p
+                        if alt.exists():
+                            p = alt
+                    p = p.resolve()
+                    if p not in seen:
+                        seen.add(p)
+                        paths.append(p)
+    return paths
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Decoded audio cache for audio_server.py")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                        help=f"Cache directory (default: {DEFAULT_CACHE_DIR}; env CROWDSTREAM_AUDIO_CACHE)")
+    parser.add_argument("--sample-format", choices=SAMPLE_FORMATS, default="float32",
+                        help="Stored sample format; must match the server's --sample-format (default: float32)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm", help="Decode every track referenced by mixer CSV(s) into the cache")
+    warm.add_argument("csv", nargs="+", help="Mixer CSV file(s), e.g. track_data_*.csv")
+    warm.add_argument("--column", action="append", default=None,
+                      help="CSV column holding audio paths (repeatable; default: part_file)")
+    sub.add_parser("stats", help="Show cache size and entry count")
+    sub.add_parser("prune", help="Remove entries whose source file changed or disappeared")
+    sub.add_parser("clear", help="Remove all entries")
+    args = parser.parse_args()
+
+    cache = DecodedAudioCache(args.cache_dir, sample_format=args.sample_format)
+
+    if args.command == "warm":
+        paths = _csv_audio_paths(args.csv, args.column or ["part_file"])
+        print(f"🔥 Warming {len(paths)} track(s) into {cache.cache_dir}")
+        decoded = cached = failed = 0
+        t_start = time.perf_counter()
+        for i, p in enumerate(paths, 1):
+            if not p.exists():
+                print(f"  [{i}/{len(paths)}] ❌ missing: {p}")
+                failed += 1
+                continue
+            entry = cache.entry_path(p)
+            if entry is not None and entry.exists():
+                cached += 1
+                continue
+            t0 = time.perf_counter()
+            try:
+                data, sr = decode_audio_file(p, cache.target_sr, cache.sample_format)
+                if sr != cache.target_sr or cache.store(p, data) is None:
+                    raise RuntimeError("not stored")
+                decoded += 1
+                print(f"  [{i}/{len(paths)}] ✅ {p.name} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+            except Exception as exc:
+                failed += 1
+                print(f"  [{i}/{len(paths)}] ❌ {p.name}: {exc}")
+        print(f"✅ Done in {time.perf_counter() - t_start:.1f}s: {decoded} decoded, "
+              f"{cached} already cached, {failed} failed")
+        return 1 if failed else 0
+
+    if args.command == "stats":
+        entries = cache.entries()
+        total = sum(npy.stat().st_size for npy, _ in entries)
+        print(f"📦 {cache.cache_dir}: {len(entries)} entries, {total / (1024 * 1024):.1f} MB")
+        return 0
+
+    if args.command == "prune":
+        removed, freed = cache.prune()
+        print(f"🧹 Pruned {removed} stale entries ({freed / (1024 * 1024):.1f} MB)")
+        return 0
+
+    removed, freed = cache.clear()
+    print(f"🧹 Cleared {removed} entries ({freed / (1024 * 1024):.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
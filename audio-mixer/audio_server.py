@@ -14,33 +14,51 @@ pure Python environment.
 from __future__ import annotations
 
 import argparse
+import heapq
+import itertools
 import json
+import os
 import platform
 import threading
 import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, Any, Tuple, Union
 
 import numpy as np
 
-# Time-stretch libraries (audiotsm is faster, pyrubberband is higher quality)
-try:
-    import audiotsm
-    from audiotsm import wsola
-    from audiotsm.io.array import ArrayReader, ArrayWriter
-    AUDIOTSM_AVAILABLE = True
-except Exception:  # pragma: no cover - optional dependency
-    AUDIOTSM_AVAILABLE = False
-
+# Time-stretch libraries (audiotsm is faster, pyrubberband is higher quality);
+# the streaming stages in time_stretch.py handle the optional audiotsm import.
 try:
     import pyrubberband as pyrb
 except Exception:  # pragma: no cover - optional dependency
     pyrb = None
 
 import pyaudio
-import soundfile as sf
 from pythonosc import dispatcher
-from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from audio_cache import (DEFAULT_CACHE_DIR, ENGINE_SAMPLE_RATE, SAMPLE_FORMATS, DecodedAudioCache,
+                         decode_audio_file, sample_scale)
+from disk_stream import (RESIDENCY_POLICIES, RING_SECONDS, DiskStream, ProgressiveDecode, choose_residency,
+                         get_reader, stream_info)
+from metrics import MetricsRegistry, serve_metrics
+from osc_receiver import RECEIVER_MODES, BundleDispatcher, make_osc_server
+from realtime import DEFAULT_FIFO_PRIORITY, GCController, lock_memory, promote_thread
+from shm_store import SharedPCMStore
+from time_stretch import (
+    AUDIOTSM_AVAILABLE,
+    STREAMING_METHODS,
+    StreamingTimeStretch,
+    TempoVariantStore,
+    create_streaming_stretch,
+    tempo_variant_ratios,
+)
+
+# Deck/player snapshot for --resume (see PythonAudioServer.restore_state)
+DEFAULT_STATE_FILE = DEFAULT_CACHE_DIR.parent / "server-state.json"
 
 # Try to import scipy for optimized filters
 try:
@@ -76,11 +94,12 @@ class _ThreeBand:
         self._lp_prev = np.zeros(2, dtype=np.float32)
         self._hp_prev = np.zeros(2, dtype=np.float32)
         self._x_prev = np.zeros(2, dtype=np.float32)
-        # Smoothing: exponential interpolation towards target gains
+        # Smoothing: per-sample exponential interpolation towards target gains
         # smoothing_factor = 1 - exp(-1 / (smoothing_time_ms * sample_rate / 1000))
-        # For 50ms at 44100Hz: factor ≈ 0.00113 per sample, or ~0.5 per buffer (512 samples)
+        # For 50ms at 44100Hz: factor ≈ 0.00045 per sample, i.e. ~37% of the way per 1024-sample buffer
         smoothing_samples = max(1.0, smoothing_time_ms * self.fs / 1000.0)
         self._smoothing_factor = 1.0 - np.exp(-1.0 / smoothing_samples)
+        self._decay_pows = np.ones(0)
         # Target gains (set by user)
         self._target_low_gain = 1.0
         self._target_mid_gain = 1.0
@@ -103,25 +122,63 @@ class _ThreeBand:
         else:
             raise ValueError(f"Unknown band '{band}' (expected 'low'|'mid'|'high')")
 
-    def process(self, x: np.ndarray) -> np.ndarray:
+    def _decay(self, n: int) -> np.ndarray:
+        """``(1 - sf) ** [1..n]``, the smoother's decay per sample (cached, sliced per block)."""
+        if self._decay_pows.shape[0] < n:
+            self._decay_pows = np.power(1.0 - self._smoothing_factor, np.arange(1, n + 1, dtype=np.float64))
+        return self._decay_pows[:n]
+
+    def _smoothed_gains(self, n: int) -> list:
+        """Per-sample smoothed gain of each band for an ``n``-frame block.
+
+        The one-pole smoother g[k] = g[k-1] + sf·(target − g[k-1]) has the closed
+        form g[k] = target + (g[-1] − target)·(1 − sf)^(k+1), so a band's whole ramp
+        is one vectorized expression. Bands already at their target stay scalars.
+        """
+        current = []
+        for band in ("low", "mid", "high"):
+            g = getattr(self, f"{band}_gain")
+            target = getattr(self, f"_target_{band}_gain")
+            if abs(target - g) < 1e-6:
+                setattr(self, f"{band}_gain", target)
+                current.append(target)
+                continue
+            ramp = target + (g - target) * self._decay(n)
+            setattr(self, f"{band}_gain", float(ramp[-1]))
+            current.append(ramp)
+        return current
+
+    def _ramped_gains(self, gains: Optional[Tuple[Optional[np.ndarray], ...]], n: int) -> Tuple[Any, Any, Any]:
+        """Per-band gain for this block: the smoothed gain, or a ramp envelope.
+
+        Smoothed gains are scalars when settled and ``(n,)`` ramps while moving.
+        ``gains`` is ``(low, mid, high)`` with ``(N, 1)`` per-sample envelopes (or
+        None per band); a ramped band ends the block at the envelope's last value.
+        """
+        current = self._smoothed_gains(n)
+        if gains is not None:
+            for i, (band, env) in enumerate(zip(("low", "mid", "high"), gains)):
+                if env is not None:
+                    last = float(env[-1, 0])
+                    setattr(self, f"{band}_gain", last)
+                    setattr(self, f"_target_{band}_gain", last)
+                    current[i] = env[:, 0]
+        return current[0], current[1], current[2]
+
+    def process(self, x: np.ndarray, gains: Optional[Tuple[Optional[np.ndarray], ...]] = None) -> np.ndarray:
         if x.size == 0:
             return x
-        # Smooth gain interpolation towards targets (exponential smoothing)
-        sf = self._smoothing_factor
-        self.low_gain += sf * (self._target_low_gain - self.low_gain)
-        self.mid_gain += sf * (self._target_mid_gain - self.mid_gain)
-        self.high_gain += sf * (self._target_high_gain - self.high_gain)
-        
-        out = np.empty_like(x)
+        # Per-sample gain smoothing towards targets (closed form, see _ThreeBand._smoothed_gains)
+        lg, mg, hg = self._ramped_gains(gains, x.shape[0])
+
+        lp = np.empty_like(x)
+        hp = np.empty_like(x)
         # copy states locally for speed
         lp_prev = self._lp_prev.astype(np.float32)
         hp_prev = self._hp_prev.astype(np.float32)
         x_prev = self._x_prev.astype(np.float32)
         a_lp = float(self._alp_low)
         a_hp = float(self._alp_high)
-        lg = float(self.low_gain)
-        mg = float(self.mid_gain)
-        hg = float(self.high_gain)
         # sample‑wise update per channel (256 frames per buffer; cheap)
         for n in range(x.shape[0]):
             xnL = x[n, 0]
@@ -132,10 +189,8 @@ class _ThreeBand:
             # high‑pass yH[n] = a*(yH[n-1] + x - x[n-1])
             hpL = a_hp * (hp_prev[0] + xnL - x_prev[0])
             hpR = a_hp * (hp_prev[1] + xnR - x_prev[1])
-            midL = xnL - lpL - hpL
-            midR = xnR - lpR - hpR
-            out[n, 0] = lg * lpL + mg * midL + hg * hpL
-            out[n, 1] = lg * lpR + mg * midR + hg * hpR
+            lp[n, 0] = lpL; lp[n, 1] = lpR
+            hp[n, 0] = hpL; hp[n, 1] = hpR
             # update state
             lp_prev[0] = lpL; lp_prev[1] = lpR
             hp_prev[0] = hpL; hp_prev[1] = hpR
@@ -144,7 +199,10 @@ class _ThreeBand:
         self._lp_prev[:] = lp_prev
         self._hp_prev[:] = hp_prev
         self._x_prev[:] = x_prev
-        return out
+        # Mid = residual; gains are scalars or per-sample ramps
+        mid = x - lp - hp
+        lg, mg, hg = (g[:, None] if np.ndim(g) else g for g in (lg, mg, hg))
+        return (lg * lp + mg * mid + hg * hp).astype(np.float32)
 
 
 class _ThreeBandOptimized:
@@ -197,6 +255,7 @@ class _ThreeBandOptimized:
         # Smoothing: exponential interpolation towards target gains
         smoothing_samples = max(1.0, smoothing_time_ms * self.fs / 1000.0)
         self._smoothing_factor = 1.0 - np.exp(-1.0 / smoothing_samples)
+        self._decay_pows = np.ones(0)
         # Target gains (set by user)
         self._target_low_gain = 1.0
         self._target_mid_gain = 1.0
@@ -219,16 +278,20 @@ class _ThreeBandOptimized:
         else:
             raise ValueError(f"Unknown band '{band}' (expected 'low'|'mid'|'high')")
 
-    def process(self, x: np.ndarray) -> np.ndarray:
-        """Process audio using vectorized scipy.signal.lfilter (50-100x faster than Python loops)."""
+    _decay = _ThreeBand._decay
+    _smoothed_gains = _ThreeBand._smoothed_gains
+    _ramped_gains = _ThreeBand._ramped_gains
+
+    def process(self, x: np.ndarray, gains: Optional[Tuple[Optional[np.ndarray], ...]] = None) -> np.ndarray:
+        """Process audio using vectorized scipy.signal.lfilter (50-100x faster than Python loops).
+
+        ``gains`` optionally carries per-sample ramp envelopes per band (see ``_ThreeBand``).
+        """
         if x.size == 0:
             return x
 
-        # Smooth gain interpolation towards targets (exponential smoothing)
-        sf = self._smoothing_factor
-        self.low_gain += sf * (self._target_low_gain - self.low_gain)
-        self.mid_gain += sf * (self._target_mid_gain - self.mid_gain)
-        self.high_gain += sf * (self._target_high_gain - self.high_gain)
+        # Per-sample gain smoothing towards targets (closed form, see _ThreeBand._smoothed_gains)
+        lg, mg, hg = self._ramped_gains(gains, x.shape[0])
 
         # Process each channel separately
         x_L = x[:, 0].astype(np.float32)
@@ -247,13 +310,617 @@ class _ThreeBandOptimized:
         mid_R = x_R - lp_R - hp_R
 
         # Apply gains and combine
-        out_L = self.low_gain * lp_L + self.mid_gain * mid_L + self.high_gain * hp_L
-        out_R = self.low_gain * lp_R + self.mid_gain * mid_R + self.high_gain * hp_R
+        out_L = lg * lp_L + mg * mid_L + hg * hp_L
+        out_R = lg * lp_R + mg * mid_R + hg * hp_R
 
         # Stack back to stereo
         return np.column_stack([out_L, out_R]).astype(np.float32)
 
 
+class MultiDeckEQ:
+    """All decks' 3-band EQ in one vectorized pass (scipy.signal.lfilter).
+
+    Same one-pole low-pass / high-pass / residual-mid split as ``_ThreeBandOptimized``,
+    but the whole deck bus ``(decks, N, channels)`` goes through one ``lfilter``
+    call per band along the time axis, with the filter state of every deck and
+    channel stacked in one ``(decks, 1, channels)`` ``zi``. Band gains are applied
+    by broadcasting a per-deck gain array over the bus:
+
+        out = g_mid·x + (g_low − g_mid)·low + (g_high − g_mid)·high
+
+    ``deck(i)`` returns a view with the per-deck ``set_gain``/``*_gain`` API of
+    the single-deck classes, so OSC handlers don't care which EQ is in use.
+    """
+
+    BANDS = ("low", "mid", "high")
+
+    def __init__(self, sample_rate: int, decks: int = 4, channels: int = 2, low_hz: float = 200.0,
+                 high_hz: float = 2000.0, smoothing_time_ms: float = 50.0):
+        if not SCIPY_AVAILABLE:
+            raise ImportError("scipy is required for optimized filters")
+        self.fs = float(sample_rate)
+        self.decks = decks
+        alp_low = np.exp(-2.0 * np.pi * low_hz / self.fs)
+        alp_high = np.exp(-2.0 * np.pi * high_hz / self.fs)
+        self._b_lp = np.array([1.0 - alp_low], dtype=np.float32)
+        self._a_lp = np.array([1.0, -alp_low], dtype=np.float32)
+        self._b_hp = np.array([alp_high, -alp_high], dtype=np.float32)
+        self._a_hp = np.array([1.0, -alp_high], dtype=np.float32)
+        # Stacked first-order state for every deck and channel
+        self._zi_lp = np.zeros((decks, 1, channels), dtype=np.float32)
+        self._zi_hp = np.zeros((decks, 1, channels), dtype=np.float32)
+        smoothing_samples = max(1.0, smoothing_time_ms * self.fs / 1000.0)
+        self._smoothing_factor = 1.0 - np.exp(-1.0 / smoothing_samples)
+        self._decay_pows = np.ones(0)
+        # (decks, bands) target and current (smoothed) linear gains
+        self._target = np.ones((decks, 3), dtype=np.float64)
+        self.gains = np.ones((decks, 3), dtype=np.float64)
+        # Broadcast weights: mid, low - mid, high - mid per deck
+        self._w = np.ones((3, decks, 1, 1), dtype=np.float32)
+
+    _decay = _ThreeBand._decay
+
+    def deck(self, index: int) -> "_DeckEQView":
+        return _DeckEQView(self, index)
+
+    def set_gain(self, deck: int, band: str, value: float) -> None:
+        """Set target gain for one deck's band (smoothly interpolated)."""
+        self._target[deck, self._band_index(band)] = float(value)
+
+    @classmethod
+    def _band_index(cls, band: str) -> int:
+        b = (band or "").strip().lower()
+        for i, name in enumerate(cls.BANDS):
+            if b.startswith(name[:2]):
+                return i
+        raise ValueError(f"Unknown band '{band}' (expected 'low'|'mid'|'high')")
+
+    def process(self, bus: np.ndarray, gains: Optional[list] = None) -> None:
+        """Filter ``bus`` (decks, N, channels) in place.
+
+        ``gains`` optionally holds, per deck, None or a ``(low, mid, high)`` tuple of
+        ``(N, 1)`` per-sample ramp envelopes (None per band), as for ``_ThreeBand``.
+        """
+        n = bus.shape[1]
+        if n == 0:
+            return
+
+        low, self._zi_lp = lfilter(self._b_lp, self._a_lp, bus, axis=1, zi=self._zi_lp)
+        high, self._zi_hp = lfilter(self._b_hp, self._a_hp, bus, axis=1, zi=self._zi_hp)
+
+        offset = self.gains - self._target
+        ramping = gains is not None and any(g is not None for g in gains)
+        if ramping or np.any(np.abs(offset) > 1e-6):
+            # Per-sample gains (decks, bands, n): closed-form smoothing (see
+            # _ThreeBand._smoothed_gains) for every band at once, with /ramp
+            # envelopes written over their bands
+            g = self._target[:, :, None] + offset[:, :, None] * self._decay(n)
+            for d, deck_gains in enumerate(gains or ()):
+                for i, env in enumerate(deck_gains or ()):
+                    if env is not None:
+                        g[d, i] = env[:, 0]
+                        self._target[d, i] = float(env[-1, 0])
+            self.gains[:] = g[:, :, -1]
+            w = np.empty((3, self.decks, n, 1), dtype=np.float32)
+            w[0, :, :, 0] = g[:, 1]
+            np.subtract(g[:, 0], g[:, 1], out=w[1, :, :, 0])
+            np.subtract(g[:, 2], g[:, 1], out=w[2, :, :, 0])
+        else:
+            # Settled: one broadcast weight per deck and band
+            self.gains[:] = self._target
+            g = self.gains
+            w = self._w
+            w[0, :, 0, 0] = g[:, 1]
+            w[1, :, 0, 0] = g[:, 0] - g[:, 1]
+            w[2, :, 0, 0] = g[:, 2] - g[:, 1]
+
+        bus *= w[0]
+        low *= w[1]
+        bus += low
+        high *= w[2]
+        bus += high
+
+
+class _DeckEQView:
+    """One deck of a ``MultiDeckEQ`` with the single-deck filter API."""
+
+    def __init__(self, eq: MultiDeckEQ, index: int):
+        self._eq = eq
+        self._index = index
+
+    def set_gain(self, band: str, value: float) -> None:
+        self._eq.set_gain(self._index, band, value)
+
+    @property
+    def low_gain(self) -> float:
+        return float(self._eq.gains[self._index, 0])
+
+    @property
+    def mid_gain(self) -> float:
+        return float(self._eq.gains[self._index, 1])
+
+    @property
+    def high_gain(self) -> float:
+        return float(self._eq.gains[self._index, 2])
+
+
+class _AudioRingBuffer:
+    """Fixed-capacity float32 ring buffer of interleaved frames.
+
+    Single producer / single consumer: the writer only advances ``_write_pos``
+    and the reader only advances ``_read_pos`` (both monotonic frame counters),
+    so the mixer thread and the PortAudio callback never need a lock.  Python
+    int assignment is atomic under the GIL, which is all the handshake needs.
+    """
+
+    def __init__(self, capacity_frames: int, channels: int = 2):
+        self.capacity = max(1, int(capacity_frames))
+        self.channels = channels
+        self._data = np.zeros((self.capacity, channels), dtype=np.float32)
+        self._write_pos = 0
+        self._read_pos = 0
+
+    @property
+    def available(self) -> int:
+        """Frames ready to be read."""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """Frames that can be written without overwriting unread data."""
+        return self.capacity - (self._write_pos - self._read_pos)
+
+    def write(self, frames: np.ndarray) -> int:
+        """Copy as many frames as fit; returns the number written."""
+        n = min(frames.shape[0], self.free)
+        if n <= 0:
+            return 0
+        start = self._write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = frames[:first]
+        if n > first:
+            self._data[:n - first] = frames[first:n]
+        self._write_pos += n
+        return n
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Copy up to ``len(out)`` frames into ``out``; returns the number read."""
+        n = min(out.shape[0], self.available)
+        if n <= 0:
+            return 0
+        start = self._read_pos % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        if n > first:
+            out[first:n] = self._data[:n - first]
+        self._read_pos += n
+        return n
+
+    def clear(self) -> None:
+        """Drop all unread frames (reader side)."""
+        self._read_pos = self._write_pos
+
+    def reserve(self, frames: int) -> None:
+        """Grow (keeping unread frames) so ``frames`` more fit.
+
+        Reallocates, so only call it when producer and consumer are the same
+        thread (the time-stretch buffers), never on the output ring.
+        """
+        needed = self.available + int(frames)
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        data = np.zeros((capacity, self.channels), dtype=np.float32)
+        n = self.read_into(data)
+        self._data = data
+        self.capacity = capacity
+        self._read_pos = 0
+        self._write_pos = n
+
+
+class _AllocationProbe:
+    """Debug-only heap allocation counter for the audio loop (tracemalloc-based).
+
+    ``begin()``/``end()`` bracket one loop iteration; the difference between the
+    traced peak and the baseline is the transient heap allocated during it.
+    NumPy reports array data to tracemalloc, so a steady state that only reuses
+    preallocated buffers shows a handful of bytes (Python scalars), while any
+    per-chunk ``np.zeros``/temporary shows up as whole chunk-sized blocks.
+    """
+
+    def __init__(self) -> None:
+        import tracemalloc
+        self._tm = tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._baseline = 0
+        self.samples = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+
+    def begin(self) -> None:
+        self._tm.reset_peak()
+        self._baseline = self._tm.get_traced_memory()[0]
+
+    def end(self) -> int:
+        allocated = max(0, self._tm.get_traced_memory()[1] - self._baseline)
+        self.samples += 1
+        self.total_bytes += allocated
+        if allocated > self.max_bytes:
+            self.max_bytes = allocated
+        return allocated
+
+    def report(self) -> str:
+        avg = self.total_bytes / self.samples if self.samples else 0.0
+        return f"heap/chunk avg={avg:.0f}B max={self.max_bytes}B over {self.samples} chunks"
+
+    def reset(self) -> None:
+        self.samples = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+
+
+class _EventScheduler:
+    """Sample-accurate event queue drained by the mixer at chunk boundaries.
+
+    Events are ``(frame, seq, action)`` entries in a heap keyed on the mix sample
+    clock (frames rendered by ``_render_mix``). Control threads push events; the
+    audio thread runs each one at its exact sample offset inside the chunk being
+    rendered, splitting the render there. Wall-clock times are mapped to frames
+    through the anchor the audio thread publishes every loop iteration.
+
+    An event whose frame has already been rendered runs at the start of the next
+    chunk; the lateness statistics (the scheduling error) record by how much.
+    """
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.frame = 0           # first frame of the chunk being rendered
+        self.current_frame = 0   # frame at which the running action applies
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._anchor: Tuple[float, int, float] = (time.perf_counter(), 0, float(sample_rate))
+        self.applied = 0
+        self.late = 0
+        self.total_late_frames = 0
+        self.max_late_frames = 0
+
+    def publish(self, t: float, frames_per_second: float) -> None:
+        """Audio thread: mix frame ``self.frame`` is being rendered at perf time ``t``."""
+        self._anchor = (t, self.frame, frames_per_second)
+
+    def frame_for_time(self, t: float) -> int:
+        """Mix frame that plays at perf_counter time ``t``."""
+        t0, f0, fps = self._anchor
+        return f0 + int(round((t - t0) * fps))
+
+    def schedule(self, frame: int, action: Any) -> int:
+        with self._lock:
+            heapq.heappush(self._heap, (int(frame), next(self._seq), action))
+        return int(frame)
+
+    def schedule_many(self, events: list) -> None:
+        """Push ``(frame, action)`` pairs under one lock: the audio thread sees all or none."""
+        with self._lock:
+            for frame, action in events:
+                heapq.heappush(self._heap, (int(frame), next(self._seq), action))
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap)
+
+    def next_offset(self, start: int, frames: int) -> Optional[int]:
+        """Offset of the next event due in ``[start, start + frames)``, or None."""
+        if not self._heap:
+            return None
+        with self._lock:
+            if self._heap and self._heap[0][0] < start + frames:
+                return max(0, self._heap[0][0] - start)
+        return None
+
+    def run_due(self, frame: int) -> None:
+        """Run every event due at or before ``frame`` (audio thread)."""
+        while True:
+            with self._lock:
+                if not self._heap or self._heap[0][0] > frame:
+                    return
+                target, _, action = heapq.heappop(self._heap)
+            late = frame - target
+            self.applied += 1
+            if late > 0:
+                self.late += 1
+                self.total_late_frames += late
+                self.max_late_frames = max(self.max_late_frames, late)
+            self.current_frame = frame
+            try:
+                action()
+            except Exception as exc:  # pragma: no cover - runtime diagnostic
+                print(f"❌ Scheduled event failed: {exc}")
+
+    def stats(self) -> Dict[str, float]:
+        ms = 1000.0 / self.sample_rate
+        return {
+            "applied": self.applied,
+            "late": self.late,
+            "pending": self.pending,
+            "mean_late_ms": (self.total_late_frames / self.late * ms) if self.late else 0.0,
+            "max_late_ms": self.max_late_frames * ms,
+        }
+
+
+class _Ramp:
+    """One parameter transition: ``v0`` → ``v1`` over ``frames`` samples."""
+
+    __slots__ = ("key", "v0", "v1", "frames", "curve", "elapsed", "last", "buf", "transform")
+
+    def __init__(self, key: Any, v0: Optional[float], v1: float, frames: int, curve: str,
+                 chunk_size: int, transform: Any = None):
+        self.key = key
+        self.v0 = v0          # None = start from the current value
+        self.v1 = float(v1)
+        self.frames = max(1, int(frames))
+        self.curve = curve
+        self.elapsed = 0
+        self.last = v0
+        self.buf = np.empty(chunk_size, dtype=np.float32)
+        self.transform = transform  # in-place map from parameter units to gain (EQ percent)
+
+
+class _ParamRamps:
+    """Per-sample parameter envelopes (``/ramp``, ``/fade``) evaluated by the mixer.
+
+    Control threads queue ramps (or cancellations) on a deque; the audio thread
+    starts them at the next segment, or at an exact frame via the scheduler.
+    ``advance(n)`` fills every active ramp's envelope for the ``n`` frames about
+    to be rendered, and the mixer multiplies by ``env(key)`` instead of the
+    scalar parameter. When a ramp ends, ``set_value(key, v1)`` stores the final
+    value in the scalar parameter.
+    """
+
+    CURVES = ("linear", "exp", "equal_power", "scurve")
+
+    def __init__(self, chunk_size: int, get_value: Any, set_value: Any):
+        self.chunk_size = chunk_size
+        self._get = get_value
+        self._set = set_value
+        self._active: Dict[Any, _Ramp] = {}
+        self._incoming: deque = deque()
+        self._envs: Dict[Any, np.ndarray] = {}
+        self._steps = np.arange(1, chunk_size + 1, dtype=np.float64)
+        self._u = np.empty(chunk_size, dtype=np.float64)
+        self._u2 = np.empty(chunk_size, dtype=np.float64)
+
+    def resize(self, chunk_size: int) -> None:
+        """Audio thread: evaluate envelopes for chunks of up to ``chunk_size`` frames."""
+        self.chunk_size = chunk_size
+        self._steps = np.arange(1, chunk_size + 1, dtype=np.float64)
+        self._u = np.empty(chunk_size, dtype=np.float64)
+        self._u2 = np.empty(chunk_size, dtype=np.float64)
+
+    def submit(self, ramp: _Ramp) -> None:
+        """Any thread: start ``ramp`` at the next rendered segment."""
+        self._incoming.append(ramp)
+
+    def cancel(self, key: Any) -> None:
+        """Any thread: drop the ramp on ``key`` (a direct set overrides it)."""
+        self._incoming.append(key)
+
+    def start(self, ramp: _Ramp) -> None:
+        """Audio thread: replace any ramp on the same key, continuing from its current value."""
+        if ramp.v0 is None:
+            running = self._active.get(ramp.key)
+            ramp.v0 = running.last if running is not None else float(self._get(ramp.key))
+        ramp.last = ramp.v0
+        self._active[ramp.key] = ramp
+
+    @property
+    def has_envelopes(self) -> bool:
+        return bool(self._envs)
+
+    def env(self, key: Any, default: Any = None) -> Any:
+        """``(n, 1)`` envelope for ``key`` in the current segment, else ``default``."""
+        return self._envs.get(key, default)
+
+    def advance(self, n: int) -> None:
+        """Audio thread: evaluate all active ramps for the next ``n`` frames."""
+        while self._incoming:
+            item = self._incoming.popleft()
+            if isinstance(item, _Ramp):
+                self.start(item)
+            else:
+                self._active.pop(item, None)
+        if self._envs:
+            self._envs.clear()
+        if not self._active:
+            return
+        for key, ramp in list(self._active.items()):
+            u = self._u[:n]
+            np.add(self._steps[:n], ramp.elapsed, out=u)
+            u *= 1.0 / ramp.frames
+            np.minimum(u, 1.0, out=u)
+            v0, v1 = ramp.v0, ramp.v1
+            if ramp.curve == "exp":
+                # Linear in dB, with a -60 dB floor so fades to/from 0 work
+                lo, hi = max(v0, 1e-3), max(v1, 1e-3)
+                np.power(hi / lo, u, out=u)
+                u *= lo
+            else:
+                if ramp.curve == "equal_power":
+                    # sin rise / 1-cos fall: complementary equal-power crossfade pair
+                    u *= np.pi / 2.0
+                    if v1 >= v0:
+                        np.sin(u, out=u)
+                    else:
+                        np.cos(u, out=u)
+                        np.subtract(1.0, u, out=u)
+                elif ramp.curve == "scurve":
+                    # smoothstep u²(3 - 2u)
+                    u2 = self._u2[:n]
+                    np.multiply(u, u, out=u2)
+                    u *= -2.0
+                    u += 3.0
+                    u *= u2
+                u *= v1 - v0
+                u += v0
+            if ramp.buf.shape[0] < n:
+                ramp.buf = np.empty(self.chunk_size, dtype=np.float32)  # queued before a resize
+            env = ramp.buf[:n]
+            np.copyto(env, u, casting="unsafe")
+            ramp.elapsed += n
+            if ramp.elapsed >= ramp.frames:
+                # Land exactly on the target and hand the value back to the scalar
+                env[max(0, n - (ramp.elapsed - ramp.frames) - 1):] = ramp.v1
+                del self._active[key]
+                self._set(key, ramp.v1)
+            ramp.last = float(env[-1])
+            if ramp.transform is not None:
+                ramp.transform(env)
+            self._envs[key] = env[:, None]
+
+    def active_keys(self) -> list:
+        return list(self._active)
+
+
+class _ControlTable:
+    """Last-value-wins parameter slots: OSC handlers write, the mixer applies.
+
+    Handlers only store ``key → value`` (one dict item assignment, atomic under
+    the GIL, so no lock is taken), and the audio thread drains the table with
+    ``popitem`` once per chunk, applying each slot through ``apply(key, value)``.
+    A burst of messages for the same parameter collapses into one write, and
+    engine state is only mutated on the audio thread.
+    """
+
+    def __init__(self, apply: Any):
+        self._apply = apply
+        self._slots: Dict[Any, Any] = {}
+        # next() on itertools.count is atomic; handlers run on several threads
+        self._counter = itertools.count(1)
+        self.received = 0
+        self.applied = 0
+
+    def post(self, key: Any, value: Any) -> None:
+        """Any thread: set ``key`` to ``value`` from the next chunk on."""
+        self._slots[key] = value
+        n = next(self._counter)
+        if n > self.received:
+            self.received = n
+
+    def drain(self) -> int:
+        """Audio thread: apply and clear every pending slot; returns how many."""
+        slots = self._slots
+        applied = 0
+        while slots:
+            try:
+                key, value = slots.popitem()
+            except KeyError:
+                break
+            try:
+                self._apply(key, value)
+            except Exception as exc:  # pragma: no cover - runtime diagnostic
+                print(f"⚠️  Control {key} = {value}: {exc}")
+            applied += 1
+        self.applied += applied
+        return applied
+
+    def stats(self) -> Dict[str, int]:
+        pending = len(self._slots)
+        return {
+            "received": self.received,
+            "applied": self.applied,
+            "pending": pending,
+            "coalesced": max(0, self.received - self.applied - pending),
+        }
+
+
+class _DegradationLadder:
+    """Decides when to step render quality down or back up from audio loop timing.
+
+    Loop times are summarised per window of ``window_s`` seconds. A window is
+    overloaded when the mean exceeds ``high`` of the chunk budget or the worst
+    loop overruns the budget; ``down_windows`` overloaded windows in a row step
+    one rung down. Stepping back up needs ``up_windows`` consecutive windows
+    with the mean under ``low`` and the worst loop under ``high`` of the budget.
+    A rung that overloads again soon after being restored doubles the calm
+    stretch needed next time (up to 16x), so a venue at the edge settles
+    instead of flapping. The server owns the rungs; this only counts.
+    """
+
+    STEPS = ("interpolation", "filters", "stretch", "chunk")
+
+    def __init__(self, steps: Tuple[str, ...], high: float = 0.8, low: float = 0.5, window_s: float = 1.0,
+                 down_windows: int = 2, up_windows: int = 10):
+        unknown = [st for st in steps if st not in self.STEPS]
+        if unknown:
+            raise ValueError(f"Unknown degradation steps {unknown} (expected {'|'.join(self.STEPS)})")
+        if not 0.0 < low < high:
+            raise ValueError(f"Degradation thresholds need 0 < low < high (got low={low}, high={high})")
+        self.steps = tuple(steps)
+        self.high = float(high)
+        self.low = float(low)
+        self.window_s = float(window_s)
+        self.down_windows = max(1, int(down_windows))
+        self.up_windows = max(1, int(up_windows))
+        self._up_required = self.up_windows
+        self._windows_since_up: Optional[int] = None
+        self._overloaded = 0
+        self._calm = 0
+        self._reset_window(0.0)
+        self.transitions = 0
+        self.last_window: Tuple[float, float] = (0.0, 0.0)  # (avg_ms, max_ms)
+
+    def _reset_window(self, now: float) -> None:
+        self._start = now
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def observe(self, now: float, loop_time: float, budget_s: float, degraded: bool) -> int:
+        """Add one loop time; returns -1 to step down, +1 to step up, else 0.
+
+        ``degraded`` tells whether any rung is applied (only then can it step up).
+        """
+        if self._count == 0:
+            self._start = now
+        self._count += 1
+        self._total += loop_time
+        self._max = max(self._max, loop_time)
+        if now - self._start < self.window_s:
+            return 0
+        avg, worst = self._total / self._count, self._max
+        self.last_window = (avg * 1000.0, worst * 1000.0)
+        self._reset_window(now)
+        if self._windows_since_up is not None:
+            self._windows_since_up += 1
+
+        if avg > self.high * budget_s or worst > budget_s:
+            self._calm = 0
+            self._overloaded += 1
+            if self._overloaded >= self.down_windows:
+                self._overloaded = 0
+                if self._windows_since_up is not None and self._windows_since_up <= 4 * self.up_windows:
+                    # Restored too early: wait longer before trying again
+                    self._up_required = min(self._up_required * 2, 16 * self.up_windows)
+                self._windows_since_up = None
+                return -1
+            return 0
+        self._overloaded = 0
+        if degraded and avg < self.low * budget_s and worst < self.high * budget_s:
+            self._calm += 1
+            if self._calm >= self._up_required:
+                self._calm = 0
+                self._windows_since_up = 0
+                return 1
+        else:
+            self._calm = 0
+        return 0
+
+    def settled(self) -> None:
+        """Back at full quality: forget the restore backoff."""
+        self._up_required = self.up_windows
+
+
 class TempoClock:
     """High precision clock used to keep stems in sync."""
 
@@ -286,9 +953,26 @@ class TempoClock:
 
 
 class AudioBuffer:
-    """Represents an audio buffer with playback capabilities."""
+    """Represents an audio buffer with playback capabilities.
+
+    ``residency`` is ``resident`` (decoded into ``audio_data``) or ``streamed``
+    (only metadata is loaded; each player reads the file through a DiskStream).
+    ``sample_format`` is the dtype of ``audio_data`` (float32, int16 or float16);
+    players convert the frames they gather to float32.
+
+    With ``head_seconds`` > 0 a resident buffer loads progressively: the
+    ``head_seconds`` from ``start_pos`` are decoded before the constructor
+    returns (the buffer is playable), the rest by the read-ahead thread
+    (``decode``; None once loaded in one go or from the decoded cache).
+
+    With a ``pcm_store`` the decoded audio lives in shared memory: an earlier
+    server process's segment for the same file is attached instead of decoding.
+    """
 
-    def __init__(self, file_path: str | Path, buffer_id: int, name: str = ""):
+    def __init__(self, file_path: str | Path, buffer_id: int, name: str = "",
+                 cache: Optional[DecodedAudioCache] = None, residency: str = "resident",
+                 sample_format: str = "float32", start_pos: float = 0.0, head_seconds: float = 0.0,
+                 pcm_store: Optional[SharedPCMStore] = None):
         self.buffer_id = buffer_id
         self.name = name or Path(file_path).stem
         self.file_path = str(file_path)
@@ -297,51 +981,216 @@ class AudioBuffer:
         self.channels: int = 2
         self.frames: int = 0
         self.loaded = False
+        self.cache = cache
+        self.cache_hit = False
+        self.residency = residency
+        self.sample_format = cache.sample_format if cache is not None else sample_format
+        self.last_used = time.perf_counter()
+        self.reloads = 0
+        self._reload_lock = threading.Lock()
+        self.decode: Optional[ProgressiveDecode] = None
+        self.pcm_store = pcm_store if pcm_store is not None and pcm_store.sample_format == self.sample_format else None
+        self.shared = False  # audio_data maps a shared memory segment
+
+        if self.streamed:
+            self.load_stream_info()
+        elif head_seconds > 0:
+            self.load_progressive(start_pos, head_seconds)
+        else:
+            self.load_audio()
+
+    @property
+    def streamed(self) -> bool:
+        return self.residency == "streamed"
+
+    @property
+    def decoding(self) -> bool:
+        """A progressive load is still decoding the rest of the file."""
+        decode = self.decode
+        return decode is not None and not decode.done and not decode.cancelled
+
+    def cancel_decode(self) -> None:
+        if self.decoding:
+            self.decode.cancel()
+            self.discard_shared()  # never completed: not attachable
+
+    def discard_shared(self) -> None:
+        """Release this buffer's shared memory segment, unlinked with its last holder (players keep their mapping)."""
+        if self.shared:
+            self.shared = False
+            self.pcm_store.discard(self.file_path)
 
-        self.load_audio()
+    @property
+    def resident_bytes(self) -> int:
+        """Bytes of decoded audio this buffer holds (0 when streamed or evicted)."""
+        data = self.audio_data
+        return data.nbytes if data is not None else 0
+
+    def release(self) -> int:
+        """Drop the decoded audio but keep the metadata; returns the bytes released.
+
+        Players already reading it keep their own reference; ``ensure_resident``
+        loads it again.
+        """
+        if self.decoding:
+            return 0  # the decoder is still writing into it
+        freed = self.resident_bytes
+        self.audio_data = None
+        self.discard_shared()
+        return freed
+
+    def ensure_resident(self) -> bool:
+        """Reload audio dropped by ``release()`` (a memory map on a decoded-cache hit)."""
+        self.last_used = time.perf_counter()
+        if self.streamed or self.audio_data is not None or not self.loaded:
+            return self.loaded
+        with self._reload_lock:
+            if self.audio_data is None:
+                self.load_audio()
+                self.reloads += 1
+        return self.loaded
+
+    @property
+    def variant_key(self) -> Tuple[str, int]:
+        """Identity of the decoded audio for pre-rendered tempo variants."""
+        return (self.file_path, self.frames)
+
+    def load_stream_info(self) -> None:
+        """Streamed buffer: read the file's length; audio stays on disk."""
+        try:
+            self.frames, self.sample_rate = stream_info(self.file_path)
+            self.channels = 2
+            self.loaded = True
+            memory_mb = (self.frames * self.channels * 4) / (1024 * 1024)
+            print(f"✅ Streaming {self.name} from disk ({memory_mb:.1f} MB decoded, "
+                  f"{RING_SECONDS:.0f}s ring per player)")
+        except Exception as exc:
+            print(f"❌ Cannot stream {self.name} (buffer {self.buffer_id}): {exc}")
+            self.loaded = False
+
+    def open_stream(self, start_frame: int, loop: bool) -> DiskStream:
+        """New read-ahead stream over the file, positioned at ``start_frame``."""
+        return DiskStream(self.file_path, start_frame, loop)
+
+    def load_progressive(self, start_pos: float, head_seconds: float) -> None:
+        """Decode ``head_seconds`` from ``start_pos`` now and the rest in the background.
+
+        Falls back to ``load_audio`` for shared memory and decoded-cache hits
+        and for files that need resampling or can't seek.
+        """
+        if self._attach_shared():
+            return
+        entry = self.cache.entry_path(self.file_path) if self.cache is not None else None
+        if entry is not None and entry.exists():
+            return self.load_audio()
+        try:
+            frames, sample_rate = stream_info(self.file_path)
+            if sample_rate != ENGINE_SAMPLE_RATE or frames <= 0:
+                return self.load_audio()
+            t_start = time.perf_counter()
+            data = None
+            if self.pcm_store is not None:
+                # Decode straight into a (zeroed) segment; committed when complete
+                data = self.pcm_store.create(self.file_path, (frames, 2), self.sample_format)
+                self.shared = data is not None
+            if data is None:
+                data = np.zeros((frames, 2), dtype=self.sample_format)
+            decode = ProgressiveDecode(self.file_path, data)
+            start = int(max(0.0, min(start_pos, 1.0)) * frames)
+            # One frame before the cue point: history for cubic interpolation
+            decode.decode_range(start - 1, start + int(head_seconds * ENGINE_SAMPLE_RATE))
+            self.audio_data = data
+            self.sample_rate = sample_rate
+            self.frames = frames
+            self.channels = 2
+            self.loaded = True
+            head_ms = (time.perf_counter() - t_start) * 1000
+            if decode.done:
+                print(f"✅ Loaded {self.name} ({data.nbytes / (1024 * 1024):.1f} MB {data.dtype}) "
+                      f"@ {sample_rate} Hz in {head_ms:.0f} ms")
+                self._decode_finished()
+                return
+            self.decode = decode
+            decode.on_done = self._decode_finished
+            get_reader().add_decode(decode)
+            print(f"⏩ {self.name} playable after {head_ms:.0f} ms ({head_seconds:.1f}s from {start_pos:.3f}); "
+                  f"decoding the rest ({frames / sample_rate:.0f}s) in the background")
+        except Exception as exc:  # pragma: no cover - runtime diagnostic
+            print(f"⚠️  Progressive load of {self.name} failed ({exc}); decoding it whole")
+            self.decode = None
+            self.load_audio()
+
+    def _decode_finished(self) -> None:
+        """Progressive decode complete: publish the PCM (shared memory, decoded cache) off the reader thread.
+
+        This runs on the read-ahead thread that feeds every DiskStream, so the
+        shared-segment commit (stat, CRC sample, manifest rewrite) and the cache
+        write go to a short-lived thread.
+        """
+        decode = self.decode
+        if decode is not None:
+            print(f"✅ Decoded {self.name} in the background "
+                  f"({(time.perf_counter() - decode.t_start) * 1000:.0f} ms, {decode.starved} starved chunks)")
+        data = self.audio_data
+        if data is not None and (self.shared or self.cache is not None):
+            threading.Thread(target=self._persist_decoded, args=(data,),
+                             name="decoded-audio-store", daemon=True).start()
+
+    def _persist_decoded(self, data: np.ndarray) -> None:
+        """Mark the shared segment complete and store the decoded cache entry."""
+        if self.shared:  # not discarded (buffer replaced) in the meantime
+            self.pcm_store.commit(self.file_path, data)
+        if self.cache is not None:
+            self.cache.store(self.file_path, data)
+
+    def _attach_shared(self) -> bool:
+        """Map a complete shared memory segment of this file left by this or an earlier process."""
+        if self.pcm_store is None:
+            return False
+        t_start = time.perf_counter()
+        data = self.pcm_store.attach(self.file_path)
+        if data is None:
+            return False
+        self.audio_data = data
+        self.sample_rate = ENGINE_SAMPLE_RATE
+        self.frames = data.shape[0]
+        self.channels = data.shape[1]
+        self.loaded = True
+        self.shared = True
+        print(f"✅ Attached {self.name} ({data.nbytes / (1024 * 1024):.1f} MB {data.dtype}) from shared memory "
+              f"in {(time.perf_counter() - t_start) * 1000:.1f} ms")
+        return True
 
     def load_audio(self) -> None:
-        """Load audio file into memory."""
+        """Load audio file into memory (memory-mapped from the decoded cache when enabled)."""
+        if self._attach_shared():
+            return
         try:
             # Check file exists before trying to read
             if not Path(self.file_path).exists():
                 raise FileNotFoundError(f"Audio file not found: {self.file_path}")
 
-            audio_data, sample_rate = sf.read(self.file_path, dtype=np.float32)
-
-            if audio_data.ndim == 1:
-                audio_data = np.column_stack((audio_data, audio_data))
-            elif audio_data.shape[1] == 1:
-                audio_data = np.tile(audio_data, (1, 2))
-
-            # --- Ensure buffer matches engine sample rate (prevents pitch/time stretch) ---
-            target_sr = 44100
-            if sample_rate != target_sr:
-                try:
-                    # Linear resample per channel
-                    n_src = audio_data.shape[0]
-                    n_dst = int(round(n_src * target_sr / sample_rate))
-                    x_src = np.linspace(0.0, n_src - 1, num=n_src, endpoint=True, dtype=np.float64)
-                    x_dst = np.linspace(0.0, n_src - 1, num=n_dst, endpoint=True, dtype=np.float64)
-                    resampled = np.empty((n_dst, 2), dtype=np.float32)
-                    # channel 0
-                    resampled[:, 0] = np.interp(x_dst, x_src, audio_data[:, 0]).astype(np.float32)
-                    # channel 1
-                    resampled[:, 1] = np.interp(x_dst, x_src, audio_data[:, 1]).astype(np.float32)
-                    audio_data = resampled
-                    sample_rate = target_sr
-                    print(f"↻ Resampled '{self.name}' {n_src}@{self.sample_rate}→{n_dst}@{target_sr}")
-                except Exception as _res_exc:
-                    print(f"⚠️  Resample failed ({_res_exc}); continuing with original rate {sample_rate} Hz")
+            t_start = time.perf_counter()
+            if self.cache is not None:
+                audio_data, sample_rate, self.cache_hit = self.cache.get_or_decode(self.file_path)
+            else:
+                audio_data, sample_rate = decode_audio_file(self.file_path, ENGINE_SAMPLE_RATE, self.sample_format)
 
+            if self.pcm_store is not None and sample_rate == ENGINE_SAMPLE_RATE:
+                shared = self.pcm_store.publish(self.file_path, audio_data)
+                self.shared = shared is not audio_data
+                audio_data = shared
             self.audio_data = audio_data
             self.sample_rate = sample_rate
             self.frames = len(audio_data)
             self.channels = audio_data.shape[1]
             self.loaded = True
 
-            memory_mb = (self.frames * self.channels * 4) / (1024 * 1024)
-            print(f"✅ Loaded {self.name} ({memory_mb:.1f} MB) @ {self.sample_rate} Hz")
+            memory_mb = audio_data.nbytes / (1024 * 1024)
+            load_ms = (time.perf_counter() - t_start) * 1000
+            source = " (cache hit, mmap)" if self.cache_hit else ""
+            print(f"✅ Loaded {self.name} ({memory_mb:.1f} MB {audio_data.dtype}) @ {self.sample_rate} Hz "
+                  f"in {load_ms:.0f} ms{source}")
 
         except FileNotFoundError as exc:
             print(f"❌ File not found: {self.file_path}")
@@ -356,8 +1205,123 @@ class AudioBuffer:
             self.loaded = False
 
 
+class _BufferRegistry(dict):
+    """``buffer_id → AudioBuffer`` with a byte budget on resident decoded audio.
+
+    ``enforce(in_use)`` releases the least recently used buffers that no player
+    or armed deck references until the resident total fits the budget (0 =
+    unlimited). An evicted buffer keeps its id, path and length; the next
+    player created for it reloads the audio transparently.
+    """
+
+    def __init__(self, budget_bytes: int = 0):
+        super().__init__()
+        self.budget_bytes = int(budget_bytes)
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def resident_bytes(self) -> int:
+        return sum(buf.resident_bytes for buf in list(self.values()))
+
+    def enforce(self, in_use: set, keep: Tuple[int, ...] = ()) -> list:
+        """Evict idle buffers, least recently used first; returns the evicted ids.
+
+        Buffers in ``in_use`` count as used now; ``keep`` is only protected.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            for buffer_id in in_use:
+                buf = self.get(buffer_id)
+                if buf is not None:
+                    buf.last_used = now
+            if self.budget_bytes <= 0:
+                return []
+            total = self.resident_bytes()
+            evicted = []
+            for buffer_id, buf in sorted(list(self.items()), key=lambda item: item[1].last_used):
+                if total <= self.budget_bytes:
+                    break
+                if buffer_id in in_use or buffer_id in keep or not buf.resident_bytes or buf.decoding:
+                    continue
+                freed = buf.release()
+                total -= freed
+                evicted.append(buffer_id)
+                print(f"♻️  Evicted buffer {buffer_id} ({buf.name}, {freed / (1024 * 1024):.1f} MB, "
+                      f"idle {now - buf.last_used:.0f}s)")
+            self.evictions += len(evicted)
+        if total > self.budget_bytes:
+            print(f"⚠️  Buffer budget exceeded: {total / (1024 * 1024):.1f} MB resident, "
+                  f"all of it in use (budget {self.budget_bytes / (1024 * 1024):.0f} MB)")
+        return evicted
+
+    def stats(self) -> Dict[str, float]:
+        buffers = list(self.values())
+        return {
+            "resident_mb": sum(b.resident_bytes for b in buffers) / (1024 * 1024),
+            "budget_mb": self.budget_bytes / (1024 * 1024),
+            "resident": sum(1 for b in buffers if b.resident_bytes),
+            "evicted": sum(1 for b in buffers if b.loaded and not b.streamed and not b.resident_bytes),
+            "streamed": sum(1 for b in buffers if b.streamed),
+            "evictions": self.evictions,
+            "reloads": sum(b.reloads for b in buffers),
+        }
+
+
+def _interpolation_weights(t: np.ndarray, weights: np.ndarray, tmp: np.ndarray, kind: str) -> None:
+    """Fill ``weights`` (taps × N) with interpolation weights for fractional offsets ``t``.
+
+    linear: taps x[i], x[i+1].  cubic: 4-point Catmull-Rom over x[i-1]..x[i+2].
+    All arithmetic goes through ``out=`` into the caller's scratch buffers.
+    """
+    if kind == "cubic":
+        t2, t3 = tmp[0], tmp[1]
+        np.multiply(t, t, out=t2)
+        np.multiply(t2, t, out=t3)
+        w0, w1, w2, w3 = weights
+        # w0 = -0.5t³ + t² - 0.5t
+        np.multiply(t3, -0.5, out=w0)
+        w0 += t2
+        np.multiply(t, 0.5, out=w3)
+        w0 -= w3
+        # w1 = 1.5t³ - 2.5t² + 1
+        np.multiply(t3, 1.5, out=w1)
+        np.multiply(t2, 2.5, out=w2)
+        w1 -= w2
+        w1 += 1.0
+        # w2 = -1.5t³ + 2t² + 0.5t   (w3 still holds 0.5t)
+        np.multiply(t3, -1.5, out=w2)
+        w2 += t2
+        w2 += t2
+        w2 += w3
+        # w3 = 0.5t³ - 0.5t²
+        np.subtract(t3, t2, out=w3)
+        w3 *= 0.5
+    else:
+        np.subtract(1.0, t, out=weights[0])
+        weights[1][...] = t
+
+
 class StemPlayer:
-    """Individual stem player with rate, volume, and position control."""
+    """Individual stem player with rate, volume, and position control.
+
+    The read position is an integer frame (``position``) plus a fractional phase
+    accumulator (``_frac``) carried across chunks, so non-unity rates interpolate
+    between neighbouring frames instead of truncating to the nearest one.
+
+    int16/float16 sources are gathered in their own dtype; only the gathered
+    frames are converted to float32 (``np.copyto``, which doesn't buffer like a
+    mixed-dtype ufunc) and scaled in place by volume (and 1/32768 for int16).
+
+    A buffer still loading progressively is read only where it is decoded: a
+    chunk that reaches undecoded frames plays as silence (the timeline keeps
+    going) and is counted in ``decode.starved``.
+    """
+
+    # Tap offsets relative to floor(read position) per interpolation kind
+    _TAPS = {
+        "linear": (0, 1),
+        "cubic": (-1, 0, 1, 2),
+    }
 
     def __init__(
         self,
@@ -366,60 +1330,539 @@ class StemPlayer:
         volume: float = 0.8,
         start_pos: float = 0.0,
         loop: bool = True,
+        interpolation: str = "linear",
     ):
         self.buffer = buffer
+        # Hold the decoded audio: an evicted buffer is reloaded here, and a later
+        # eviction of the buffer doesn't silence this player
+        buffer.ensure_resident()
+        self._data: Optional[np.ndarray] = buffer.audio_data
+        self._decode: Optional[ProgressiveDecode] = buffer.decode if buffer.decoding else None
         self.rate = rate
         self.volume = volume
         self.loop = loop
+        self.interpolation = interpolation
         self.playing = False
         self.position = int(start_pos * buffer.frames) if buffer.loaded else 0
         self.original_position = self.position
+        self._frac = 0.0
+        # Tempo variant being read (None = the buffer's audio) and its stretch ratio
+        self._source: Optional[np.ndarray] = None
+        self.variant_ratio = 1.0
+        self._variant_query: Optional[Tuple[float, int]] = None
+        self._fade: Optional[Tuple[np.ndarray, float, int, float]] = None
+        self._fade_buf: Optional[np.ndarray] = None
+        # Streamed buffers: this player's read-ahead ring and the window rendered from
+        self._stream: Optional[DiskStream] = (buffer.open_stream(self.position, loop)
+                                              if buffer.loaded and buffer.streamed else None)
+        self._window: Optional[np.ndarray] = None
+        # Scratch buffers reused across chunks (no per-chunk allocations)
+        self._scratch_size = 0
+        self._scratch_kind = ""
+
+    def _ensure_scratch(self, chunk_size: int, kind: str) -> None:
+        # Shorter requests (chunks split by a scheduled event) use views
+        if self._scratch_size >= chunk_size and self._scratch_kind == kind:
+            return
+        taps = len(self._TAPS[kind])
+        self._ramp = np.arange(chunk_size, dtype=np.float64)
+        self._pos_buf = np.empty(chunk_size, dtype=np.float64)
+        self._floor_buf = np.empty(chunk_size, dtype=np.float64)
+        self._base_idx = np.empty(chunk_size, dtype=np.int64)
+        self._tap_idx = np.empty((taps, chunk_size), dtype=np.int64)
+        self._tap_buf = np.empty((taps, chunk_size, 2), dtype=np.float32)
+        self._t_buf = np.empty(chunk_size, dtype=np.float32)
+        self._w_buf = np.empty((taps, chunk_size), dtype=np.float32)
+        self._tmp_buf = np.empty((2, chunk_size), dtype=np.float32)
+        self._raw_taps: Optional[np.ndarray] = None
+        self._scratch_size = chunk_size
+        self._scratch_kind = kind
+
+    def _compact_taps(self, dtype: np.dtype) -> np.ndarray:
+        """Gather scratch in a compact sample dtype, shaped like the float32 tap buffer."""
+        raw = self._raw_taps
+        if raw is None or raw.dtype != dtype:
+            raw = self._raw_taps = np.empty(self._tap_buf.shape, dtype=dtype)
+        return raw
+
+    def _copy_unity(self, out: np.ndarray, data: np.ndarray, frames: int) -> int:
+        """rate == 1.0: copy straight from buffer slices (no index arrays); returns frames written."""
+        n = out.shape[0]
+        filled = 0
+        pos = self.position
+        gain = np.float32(self.volume * sample_scale(data))
+        while filled < n:
+            if pos >= frames:
+                if not self.loop:
+                    break
+                pos %= frames
+            take = min(n - filled, frames - pos)
+            dst = out[filled:filled + take]
+            if data.dtype == np.float32:
+                np.multiply(data[pos:pos + take], gain, out=dst)
+            else:
+                # Convert with copyto, then scale: a mixed-dtype ufunc would buffer the cast
+                np.copyto(dst, data[pos:pos + take], casting="unsafe")
+                dst *= gain
+            filled += take
+            pos += take
+        self.position = pos % frames if self.loop else pos
+        return filled
+
+    def follow_tempo_variants(self, store: Any, ratio: float) -> None:
+        """Play the pre-rendered variant closest to ``ratio`` (``prerendered`` method).
+
+        The residual ``variant_ratio / ratio`` becomes the playback rate, which is
+        exactly 1.0 (the copy path) once the tempo settles on a rendered step.
+        Streamed buffers have no variants and follow the tempo by rate alone.
+        """
+        if self._stream is not None:
+            self.rate = 1.0 / ratio
+            return
+        query = (ratio, store.version)
+        if query != self._variant_query:
+            self._variant_query = query
+            variant_ratio, data = store.nearest(self.buffer.variant_key, ratio)
+            self.use_variant(data, variant_ratio)
+        rate = self.variant_ratio / ratio
+        # The smoothed BPM only approaches a step asymptotically; snap to unity
+        self.rate = 1.0 if abs(rate - 1.0) < 1e-4 else rate
+
+    def use_variant(self, data: Optional[np.ndarray], variant_ratio: float) -> None:
+        """Switch the read source to a tempo variant (None = original audio).
+
+        The position is mapped onto the new variant's timeline and the next
+        chunk crossfades from the old source to the new one.
+        """
+        if variant_ratio == self.variant_ratio and data is self._source:
+            return
+        old_data = self._source if self._source is not None else self._data
+        self._fade = (old_data, self.variant_ratio, self.position, self._frac)
+        scaled = (self.position + self._frac) * variant_ratio / self.variant_ratio
+        self._source = data
+        self.variant_ratio = variant_ratio
+        self.position = int(scaled)
+        self._frac = scaled - self.position
+        frames = data.shape[0] if data is not None else self.buffer.frames
+        if self.loop and frames:
+            self.position %= frames
+
+    @property
+    def source(self) -> Optional[np.ndarray]:
+        """Audio currently read: the tempo variant, else the buffer's data (None when streamed)."""
+        return self._source if self._source is not None else self._data
+
+    @property
+    def stream(self) -> Optional[DiskStream]:
+        return self._stream
 
-    def get_audio_chunk(self, chunk_size: int) -> np.ndarray:
-        """Retrieve next audio chunk for playback respecting playback rate."""
-        if not self.buffer.loaded or not self.playing or self.buffer.audio_data is None:
+    @property
+    def decoding(self) -> bool:
+        """Reading a buffer whose progressive decode hasn't finished."""
+        decode = self._decode
+        if decode is not None and (decode.done or decode.cancelled):
+            self._decode = decode = None
+        return decode is not None
+
+    def seek(self, frame: int) -> None:
+        """Continue from buffer frame ``frame`` (cue point)."""
+        self.position = max(0, int(frame))
+        self._frac = 0.0
+        if self._stream is not None:
+            self._stream.seek(self.position)
+            self.position = self._stream.position
+        elif self.loop and self.buffer.frames:
+            self.position %= self.buffer.frames
+
+    def get_audio_chunk(self, chunk_size: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Retrieve next audio chunk for playback respecting playback rate.
+
+        When ``out`` (a float32 ``(chunk_size, 2)`` array) is given the chunk is
+        rendered into it and no memory is allocated.
+        """
+        if out is None:
+            out = np.zeros((chunk_size, 2), dtype=np.float32)
+        if self._stream is not None and self.playing:
+            return self._render_streamed(out, self._stream, max(self.rate, 0.01))
+        data = self.source
+        if not self.buffer.loaded or not self.playing or data is None:
             # Detailed debug when returning silence
-            if self.buffer.loaded and self.playing and self.buffer.audio_data is None:
+            if self.buffer.loaded and self.playing and data is None:
                 print(f"⚠️  Buffer {self.buffer.buffer_id} loaded but audio_data is None!")
-            return np.zeros((chunk_size, 2), dtype=np.float32)
-
-        output = np.zeros((chunk_size, 2), dtype=np.float32)
-        samples_needed = chunk_size
-        output_pos = 0
+            out.fill(0.0)
+            return out
 
-        # Pre-calculate rate increments for vectorised slicing.
         rate = max(self.rate, 0.01)
+        if self.decoding and data is self._data and not self._decode.ready(
+                self.position - 1, self.position + int(self._frac + chunk_size * rate) + 3, self.loop):
+            return self._starve(out, rate)
+        fade = self._fade
+        if fade is None:
+            return self._render(out, data, rate)
+
+        # Variant switch: render the outgoing source at the same effective tempo
+        # and crossfade linearly over this chunk
+        self._fade = None
+        old_data, old_ratio, old_position, old_frac = fade
+        if self._fade_buf is None or self._fade_buf.shape[0] != chunk_size:
+            self._fade_buf = np.empty((chunk_size, 2), dtype=np.float32)
+            self._fade_in = np.linspace(0.0, 1.0, chunk_size, dtype=np.float32)[:, None]
+        new_position, new_frac = self.position, self._frac
+        self.position, self._frac = old_position, old_frac
+        self._render(self._fade_buf, old_data, max(rate * old_ratio / self.variant_ratio, 0.01))
+        self.position, self._frac = new_position, new_frac
+        self._render(out, data, rate)
+        out *= self._fade_in
+        self._fade_buf *= 1.0 - self._fade_in
+        out += self._fade_buf
+        return out
 
-        while samples_needed > 0 and self.playing:
-            available = self.buffer.frames - self.position
-            if available <= 0:
-                if self.loop:
-                    # Log loop wrap for debugging: end -> start
-                    try:
-                        print(f"🔁 Loop wrap: {self.buffer.name} (buffer {self.buffer.buffer_id}) end {self.buffer.frames} → start 0")
-                    except Exception:
-                        pass
-                    self.position = 0
-                    available = self.buffer.frames
-                else:
-                    break
+    def _starve(self, out: np.ndarray, rate: float) -> np.ndarray:
+        """Playback outran the progressive decode: silence, advancing as if rendered."""
+        self._decode.starved += 1
+        out.fill(0.0)
+        advance = self._frac + out.shape[0] * rate
+        whole = int(advance)
+        self._frac = advance - whole
+        self.position += whole
+        if self.loop and self.buffer.frames:
+            self.position %= self.buffer.frames
+        return out
 
-            step = min(samples_needed, int(available / rate) or available)
-            if step <= 0:
-                break
+    def _render_streamed(self, out: np.ndarray, stream: DiskStream, rate: float) -> np.ndarray:
+        """Render from a DiskStream through the in-memory path.
+
+        The frames this chunk reads (from one frame before the position, for
+        the cubic tap) are copied out of the ring into a window that is already
+        linear across loop boundaries, so ``_render`` treats it as a one-shot
+        buffer; the stream then advances by the whole frames consumed. Frames
+        the reader hasn't delivered yet render as silence.
+        """
+        if stream.loop != self.loop:
+            stream.set_loop(self.loop)
+        need = int(self._frac + out.shape[0] * rate) + 3 + DiskStream.HISTORY
+        if self._window is None or self._window.shape[0] < need:
+            self._window = np.zeros((max(need, 2 * out.shape[0] + 8), 2), dtype=np.float32)
+        window = self._window[:need]
+        got = stream.peek(window)
+        if got < need:
+            window[got:].fill(0.0)
+        if not self.loop:
+            # One-shot: end the window at the end of the file, as for resident data
+            window = window[:max(1, min(need, stream.frames - self.position + DiskStream.HISTORY))]
+        loop = self.loop
+        self.loop, self.position = False, DiskStream.HISTORY
+        try:
+            self._render(out, window, rate)
+        finally:
+            self.loop = loop
+        stream.consume(self.position - DiskStream.HISTORY)
+        self.position = stream.position
+        return out
+
+    def _render(self, out: np.ndarray, data: np.ndarray, rate: float) -> np.ndarray:
+        """Render ``out.shape[0]`` frames of ``data`` at ``rate`` from the current position."""
+        chunk_size = out.shape[0]
+        frames = data.shape[0]
+
+        if rate == 1.0:
+            # Realign to the integer grid (a sub-sample shift) and use plain slices
+            if self._frac:
+                self.position += int(round(self._frac))
+                self._frac = 0.0
+            written = self._copy_unity(out, data, frames)
+            if written < chunk_size:
+                out[written:].fill(0.0)
+            return out
+
+        kind = self.interpolation if self.interpolation in self._TAPS else "linear"
+        self._ensure_scratch(chunk_size, kind)
+        ramp, pos, whole_pos, base, t = self._ramp, self._pos_buf, self._floor_buf, self._base_idx, self._t_buf
+        tap_idx, tap_buf, w_buf, tmp_buf = self._tap_idx, self._tap_buf, self._w_buf, self._tmp_buf
+        if chunk_size != self._scratch_size:
+            ramp, pos, whole_pos, base, t = (a[:chunk_size] for a in (ramp, pos, whole_pos, base, t))
+            tap_idx, tap_buf, w_buf, tmp_buf = (a[:, :chunk_size] for a in (tap_idx, tap_buf, w_buf, tmp_buf))
+
+        # Read positions relative to self.position: frac + k * rate (always >= 0,
+        # so the int cast is a floor); t is the fractional part of each position.
+        np.multiply(ramp, rate, out=pos)
+        pos += self._frac
+        np.floor(pos, out=whole_pos)
+        np.copyto(base, whole_pos, casting="unsafe")
+        pos -= whole_pos
+        np.copyto(t, pos, casting="unsafe")
+        base += self.position
+
+        # One gather for all taps; loop wrap is modular index arithmetic
+        for k, offset in enumerate(self._TAPS[kind]):
+            np.add(base, offset, out=tap_idx[k])
+        if self.loop:
+            np.mod(tap_idx, frames, out=tap_idx)
+        fused = data.dtype != np.float32
+        if fused:
+            # Compact storage: gather in its own dtype, convert, then scale with the volume folded in
+            raw = self._compact_taps(data.dtype)
+            if chunk_size != self._scratch_size:
+                raw = raw[:, :chunk_size]
+            np.take(data, tap_idx, axis=0, out=raw, mode="clip")
+            np.copyto(tap_buf, raw, casting="unsafe")
+            tap_buf *= np.float32(self.volume * sample_scale(data))
+        else:
+            np.take(data, tap_idx, axis=0, out=tap_buf, mode="clip")
+
+        _interpolation_weights(t, w_buf, tmp_buf, kind)
+        np.einsum("kn,knc->nc", w_buf, tap_buf, out=out)
+        if not fused:
+            out *= self.volume
+
+        # Advance the phase accumulator
+        advance = self._frac + chunk_size * rate
+        whole = int(advance)
+        self._frac = advance - whole
+        self.position += whole
+        if self.loop:
+            self.position %= frames
+        elif base[-1] > frames - 1:
+            # Past the end: silence the frames that read beyond the last sample
+            valid = int(np.searchsorted(base, frames - 1, side="right"))
+            out[valid:].fill(0.0)
+        return out
 
-            end_pos = self.position + int(step * rate)
-            indices = np.linspace(self.position, end_pos, step, endpoint=False)
-            indices = indices.astype(np.int64).clip(0, self.buffer.frames - 1)
-            audio_chunk = self.buffer.audio_data[indices]
-            audio_chunk *= self.volume
 
-            output[output_pos : output_pos + step] = audio_chunk
-            self.position = end_pos
-            output_pos += step
-            samples_needed -= step
+class _PlayerMatrix:
+    """Renders all active players of a chunk in one batched pass.
+
+    Player state (integer read position, phase, rate, volume, source length,
+    loop flag and deck) is packed into arrays, so read positions, tap indices,
+    interpolation weights and the phase update are computed for every player at
+    once as ``(players, frames)`` / ``(taps, players, frames)`` arrays. Each
+    player's taps are gathered with one ``np.take`` (each buffer is its own
+    array) into a tap-major tensor, weighted tap by tap, and reduced onto the
+    deck buses by a ``(decks × players)`` routing matrix holding the stem
+    volumes: ``bus = routing @ rendered``. Output matches
+    ``StemPlayer.get_audio_chunk``. int16/float16 sources are gathered in their
+    own dtype and scaled to float32 in one pass (the volume is applied by the
+    routing matrix).
+
+    Like the per-player path, steady-state rendering allocates no arrays: every
+    ufunc runs on contiguous (or 1-D) preallocated scratch with ``out=``, and
+    broadcasts go through ``np.copyto`` (NumPy buffers broadcast and strided
+    multi-dimensional ufunc operands on the heap).
+    """
 
-        return output
+    def __init__(self, chunk_size: int, decks: int = 4):
+        self.chunk_size = chunk_size
+        self.decks = decks
+        self._ramp = np.arange(chunk_size, dtype=np.float64)
+        self._mixed = np.empty(decks * chunk_size * 2, dtype=np.float32)
+        self._capacity = 0
+        self._ensure(8)
+
+    def resize(self, chunk_size: int) -> None:
+        """Reallocate the scratch for segments of up to ``chunk_size`` frames."""
+        self.chunk_size = chunk_size
+        self._ramp = np.arange(chunk_size, dtype=np.float64)
+        self._mixed = np.empty(self.decks * chunk_size * 2, dtype=np.float32)
+        players, self._capacity = self._capacity, 0
+        self._ensure(players)
+
+    def _ensure(self, players: int) -> None:
+        """Grow the per-player arrays (scratch is flat, reshaped per segment)."""
+        if players <= self._capacity:
+            return
+        cap = max(players, 2 * self._capacity)
+        n = self.chunk_size
+        taps = max(len(t) for t in StemPlayer._TAPS.values())
+        self.position = np.zeros(cap, dtype=np.int64)
+        self.frac = np.zeros(cap, dtype=np.float64)
+        self.rate = np.ones(cap, dtype=np.float64)
+        self.frames = np.ones(cap, dtype=np.int64)
+        self.loop = np.zeros(cap, dtype=bool)
+        self.routing = np.zeros((self.decks, cap), dtype=np.float32)
+        self._sources: list = [None] * cap
+        self._whole = np.empty(cap, dtype=np.float64)
+        self._pos = np.empty(cap * n, dtype=np.float64)
+        self._floor = np.empty(cap * n, dtype=np.float64)
+        self._rows = np.empty(cap * n, dtype=np.float64)
+        self._base = np.empty(cap * n, dtype=np.int64)
+        self._irows = np.empty(cap * n, dtype=np.int64)
+        self._t = np.empty(cap * n, dtype=np.float32)
+        self._idx = np.empty(taps * cap * n, dtype=np.int64)
+        self._taps = np.empty(taps * cap * n * 2, dtype=np.float32)
+        self._w = np.empty(taps * cap * n, dtype=np.float32)
+        self._tmp = np.empty(2 * cap * n, dtype=np.float32)
+        self._out = np.empty(cap * n * 2, dtype=np.float32)
+        # One player's tap indices and gathered taps (np.take needs contiguous arrays)
+        self._gather_idx = np.empty(taps * n, dtype=np.int64)
+        self._gather = np.empty(taps * n * 2, dtype=np.float32)
+        # One player's taps in a compact sample dtype, per dtype in use
+        self._raw: Dict[np.dtype, np.ndarray] = {}
+        self._capacity = cap
+
+    def render(self, batch: list, bus: np.ndarray, frames: int, interpolation: str = "linear") -> None:
+        """Add ``frames`` frames of every player in ``batch`` to ``bus`` (decks, frames, 2).
+
+        ``batch`` holds ``(player, deck_index, gain_env)`` tuples; ``gain_env`` is a
+        ``(frames, 1)`` stem-volume ramp envelope (replacing the volume) or None.
+        """
+        P, m = len(batch), frames
+        if P == 0 or m == 0:
+            return
+        self._ensure(P)
+        position, frac, rate, length = self.position[:P], self.frac[:P], self.rate[:P], self.frames[:P]
+        sources, routing = self._sources, self.routing[:, :P]
+        routing.fill(0.0)
+        unity = 0
+        for i, (player, deck_index, gain_env) in enumerate(batch):
+            data = player.source
+            sources[i] = data
+            r = max(player.rate, 0.01)
+            rate[i] = r
+            if r == 1.0:
+                # Unity-rate players realign to the integer grid (as StemPlayer._render does)
+                position[i] = player.position + round(player._frac)
+                frac[i] = 0.0
+                unity += 1
+            else:
+                position[i] = player.position
+                frac[i] = player._frac
+            length[i] = data.shape[0]
+            self.loop[i] = player.loop
+            routing[deck_index, i] = 1.0 if gain_env is not None else player.volume
+
+        if unity == P:
+            rendered = self._copy(P, m)
+        else:
+            rendered = self._interpolate(P, m, interpolation)
+
+        for i, (_, _, gain_env) in enumerate(batch):
+            if gain_env is not None:
+                env = gain_env[:, 0]
+                for c in (0, 1):
+                    np.multiply(rendered[i, :, c], env, out=rendered[i, :, c])
+
+        # Reduce onto the deck buses: (decks × players) @ (players × frames·channels)
+        mixed = self._mixed[:self.decks * m * 2].reshape(self.decks, m * 2)
+        np.matmul(routing, rendered.reshape(P, m * 2), out=mixed)
+        mixed = mixed.reshape(self.decks, m, 2)
+        if bus.flags.c_contiguous:
+            bus += mixed
+        else:
+            # Split segment: each deck's frames [a, b) are contiguous, the buses aren't
+            for d in range(self.decks):
+                np.add(bus[d], mixed[d], out=bus[d])
+
+        # Advance every phase accumulator at once and write positions back
+        whole = self._whole[:P]
+        np.multiply(rate, m, out=whole)
+        frac += whole
+        np.floor(frac, out=whole)
+        frac -= whole
+        np.add(position, whole, out=position, casting="unsafe")
+        for i, (player, _, _) in enumerate(batch):
+            pos, frames = int(position[i]), int(length[i])
+            if player.loop:
+                pos %= frames
+            elif pos > frames and rate[i] == 1.0:
+                # The unity copy path stops at the end of a source that doesn't loop
+                pos = max(frames, pos - m)
+            player.position = pos
+            player._frac = float(frac[i])
+            sources[i] = None
+
+    def _copy(self, P: int, m: int) -> np.ndarray:
+        """Unity rate: slice copies into the (players, frames, 2) tensor."""
+        rendered = self._out[:P * m * 2].reshape(P, m, 2)
+        for i in range(P):
+            data = self._sources[i]
+            dst, pos, frames, filled = rendered[i], int(self.position[i]), data.shape[0], 0
+            while filled < m:
+                if pos >= frames:
+                    if not self.loop[i]:
+                        dst[filled:].fill(0.0)
+                        break
+                    pos %= frames
+                take = min(m - filled, frames - pos)
+                np.copyto(dst[filled:filled + take], data[pos:pos + take], casting="unsafe")
+                if data.dtype != np.float32:
+                    dst[filled:filled + take] *= np.float32(sample_scale(data))
+                filled += take
+                pos += take
+        return rendered
+
+    def _interpolate(self, P: int, m: int, interpolation: str) -> np.ndarray:
+        """Fractional rates: one tap gather per source, then a weighted sum per tap."""
+        kind = interpolation if interpolation in StemPlayer._TAPS else "linear"
+        offsets = StemPlayer._TAPS[kind]
+        taps = len(offsets)
+        position, frac, rate, length, loop = (self.position[:P], self.frac[:P], self.rate[:P],
+                                              self.frames[:P], self.loop[:P])
+
+        # Read positions for all players: frac + k * rate, floor and phase
+        pos = self._pos[:P * m].reshape(P, m)
+        whole_pos = self._floor[:P * m].reshape(P, m)
+        rows = self._rows[:P * m].reshape(P, m)
+        base = self._base[:P * m].reshape(P, m)
+        irows = self._irows[:P * m].reshape(P, m)
+        np.copyto(pos, self._ramp[:m])
+        np.copyto(rows, rate[:, None])
+        pos *= rows
+        np.copyto(rows, frac[:, None])
+        pos += rows
+        np.floor(pos, out=whole_pos)
+        np.copyto(base, whole_pos, casting="unsafe")
+        np.copyto(irows, position[:, None])
+        base += irows
+        pos -= whole_pos
+        t = self._t[:P * m].reshape(P, m)
+        np.copyto(t, pos, casting="unsafe")
+
+        # Tap indices (taps, players, frames); rows are increasing, so only looping
+        # players whose first/last tap leaves [0, frames) need the modulo wrap
+        idx = self._idx[:taps * P * m].reshape(taps, P, m)
+        for k, offset in enumerate(offsets):
+            np.add(base, offset, out=idx[k])
+        tap_buf = self._taps[:taps * P * m * 2].reshape(taps, P, m, 2)
+        gather_idx = self._gather_idx[:taps * m].reshape(taps, m)
+        gather = self._gather[:taps * m * 2].reshape(taps, m, 2)
+        first, last = offsets[0], offsets[-1]
+        for i in range(P):
+            data, frames = self._sources[i], int(length[i])
+            np.copyto(gather_idx, idx[:, i])
+            if loop[i] and (int(base[i, m - 1]) + last >= frames or int(base[i, 0]) + first < 0):
+                np.mod(gather_idx, frames, out=gather_idx)
+            if data.dtype == np.float32:
+                np.take(data, gather_idx, axis=0, out=gather, mode="clip")
+            else:
+                raw = self._raw.get(data.dtype)
+                if raw is None:
+                    raw = self._raw[data.dtype] = np.empty(taps * self.chunk_size * 2, dtype=data.dtype)
+                raw = raw[:taps * m * 2].reshape(taps, m, 2)
+                np.take(data, gather_idx, axis=0, out=raw, mode="clip")
+                # copyto converts in place; a mixed-dtype ufunc would buffer the cast
+                np.copyto(gather, raw, casting="unsafe")
+                gather *= np.float32(sample_scale(data))
+            np.copyto(tap_buf[:, i], gather)
+
+        # Weighted sum over taps, one channel at a time (1-D views, no broadcasting)
+        w = self._w[:taps * P * m].reshape(taps, P, m)
+        _interpolation_weights(t, w, self._tmp[:2 * P * m].reshape(2, P, m), kind)
+        rendered = self._out[:P * m * 2].reshape(P, m, 2)
+        flat = rendered.reshape(-1)
+        tmp = self._tmp[:P * m]
+        for c in (0, 1):
+            out = flat[c::2]
+            np.multiply(w[0].reshape(-1), tap_buf[0].reshape(-1)[c::2], out=out)
+            for k in range(1, taps):
+                np.multiply(w[k].reshape(-1), tap_buf[k].reshape(-1)[c::2], out=tmp)
+                out += tmp
+
+        # Players that don't loop: silence the frames that read beyond the last sample
+        for i in range(P):
+            if not loop[i] and base[i, m - 1] > length[i] - 1:
+                valid = int(np.searchsorted(base[i], length[i] - 1, side="right"))
+                rendered[i, valid:].fill(0.0)
+        return rendered
 
 
 class PythonAudioServer:
@@ -454,6 +1897,28 @@ class PythonAudioServer:
             print("   Using default values")
             return {}
 
+    def _default_variant_bpms(self, step_bpm: float) -> list:
+        """BPM targets plus ``step_bpm`` steps across the continuous high range."""
+        bpms = {self.bpm_very_very_low, self.bpm_very_low, self.bpm_low, self.bpm_medium, self.bpm_high_max}
+        if step_bpm > 0:
+            bpm = self.bpm_medium + step_bpm
+            while bpm < self.bpm_high_max:
+                bpms.add(round(bpm, 2))
+                bpm += step_bpm
+        return sorted(bpms)
+
+    def _get_tempo_variants(self) -> TempoVariantStore:
+        if self._tempo_variants is None:
+            ratios = tempo_variant_ratios(self.base_bpm, self.tempo_variant_bpms)
+            cache_dir = str(self.audio_cache.cache_dir) if self.audio_cache is not None else None
+            self._tempo_variants = TempoVariantStore(
+                ratios, budget_mb=self.tempo_variant_budget_mb, workers=self.tempo_variant_workers,
+                target_sr=ENGINE_SAMPLE_RATE, cache_dir=cache_dir, sample_format=self.sample_format)
+            print(f"🎼 Tempo variants: {len(self._tempo_variants.ratios)} steps "
+                  f"({', '.join(f'{b:g}' for b in sorted(self.tempo_variant_bpms))} BPM), "
+                  f"budget {self.tempo_variant_budget_mb:.0f} MB")
+        return self._tempo_variants
+
     def _print_all_messages(self, address: str, *args: object) -> None:
         """Print every OSC message received (for debugging)."""
         try:
@@ -468,9 +1933,19 @@ class PythonAudioServer:
 
     def __init__(self, osc_port: int = 57120, audio_device: Optional[int] = None, chunk_size: int = 1024,
                  enable_filters: bool = False, use_optimized_filters: bool = False, enable_time_stretch: bool = True,
-                 eq_smoothing_time_ms: float = 50.0, bpm_config_path: Optional[Path] = None):
+                 eq_smoothing_time_ms: float = 50.0, bpm_config_path: Optional[Path] = None,
+                 output_mode: str = "blocking", prefill_chunks: int = 3, debug_alloc: bool = False,
+                 interpolation: str = "linear", audio_cache_dir: Optional[Path] = None,
+                 loader_workers: int = 2, mix_engine: str = "matrix", osc_receiver: str = "threading",
+                 osc_rcvbuf_kb: int = 4096, residency: str = "auto", stream_above_mb: float = 0.0,
+                 buffer_budget_mb: float = 0.0, sample_format: str = "float32",
+                 progressive_head_sec: float = 0.0, shm_store: bool = False,
+                 state_file: Optional[Path] = None, degrade_steps: Tuple[str, ...] = (),
+                 degrade_high: float = 0.8, degrade_low: float = 0.5,
+                 notify: Tuple[Tuple[str, int], ...] = (), realtime: bool = False,
+                 rt_priority: int = DEFAULT_FIFO_PRIORITY, metrics_port: int = 0):
         """Initialize audio server.
-        
+
         Args:
             osc_port: OSC server port
             audio_device: Audio device ID (None for default)
@@ -480,10 +1955,66 @@ class PythonAudioServer:
             enable_time_stretch: Enable real-time time stretching
             eq_smoothing_time_ms: Time in ms for EQ gain changes to smooth (default: 50ms)
             bpm_config_path: Path to BPM configuration JSON file (default: bpm_config.json in audio-mixer directory)
+            output_mode: "blocking" (mixer calls stream.write) or "callback" (mixer renders
+                ahead into a ring buffer, the PortAudio callback only copies from it)
+            prefill_chunks: Ring buffer depth in chunks for callback mode (render-ahead latency)
+            debug_alloc: Count heap allocations per audio loop iteration (tracemalloc; debug only)
+            interpolation: Resampling used by players at non-unity rates: "linear" or "cubic"
+            audio_cache_dir: Directory of the decoded-audio cache (None disables caching)
+            loader_workers: Background threads decoding /cue and /load_buffer requests
+            mix_engine: "matrix" (all players in one batched gather and routing matmul)
+                or "loop" (one get_audio_chunk call per player)
+            osc_receiver: "threading" (a thread per datagram), "blocking" or "asyncio"
+                (one receiver thread draining the socket in batches)
+            osc_rcvbuf_kb: Requested SO_RCVBUF of the OSC socket in KiB
+            residency: Default buffer residency: "resident" (decoded into RAM), "streamed"
+                (read from disk by a read-ahead thread) or "auto" (streamed above stream_above_mb)
+            stream_above_mb: With residency "auto", stream files whose decoded size exceeds
+                this many MB (0 = keep everything resident)
+            buffer_budget_mb: Resident decoded audio budget; least recently used idle
+                buffers are evicted above it and reloaded on next use (0 = unlimited)
+            sample_format: Storage dtype of decoded audio: "float32", "int16" (half the
+                memory, lossless for 16-bit sources) or "float16"
+            progressive_head_sec: Seconds decoded from the cue point before a resident
+                buffer is playable; the rest decodes in the background (0 = whole file first)
+            shm_store: Keep decoded audio in named shared memory that a restarted server
+                re-attaches instead of decoding again
+            state_file: Snapshot deck/player state here every second (None disables);
+                ``restore_state`` resumes from it after a restart
+            degrade_steps: Degradation ladder, in order (rungs of ``_DegradationLadder.STEPS``);
+                empty disables it
+            degrade_high: Step down when the loop's mean exceeds this fraction of the chunk budget
+            degrade_low: Step back up once the mean stays under this fraction
+            notify: (host, port) OSC destinations of server events such as ``/degrade``,
+                in addition to clients registered with ``/subscribe``
+            realtime: From ``start()`` on, freeze the GC heap and collect only from the mixer
+                (full on idle ticks), run the mixer thread at SCHED_FIFO (else high nice)
+                and mlockall the process; each falls back when not permitted (see realtime.py)
+            rt_priority: SCHED_FIFO priority of the mixer thread in real-time mode
+            metrics_port: Serve the metrics registry at ``http://host:port/metrics`` in the
+                Prometheus text format from ``start()`` on (0 disables)
         """
+        if output_mode not in ("blocking", "callback"):
+            raise ValueError(f"Unknown output mode '{output_mode}' (expected 'blocking'|'callback')")
+        if interpolation not in StemPlayer._TAPS:
+            raise ValueError(f"Unknown interpolation '{interpolation}' (expected 'linear'|'cubic')")
+        if osc_receiver not in RECEIVER_MODES:
+            raise ValueError(f"Unknown OSC receiver '{osc_receiver}' (expected {'|'.join(RECEIVER_MODES)})")
+        if mix_engine not in ("matrix", "loop"):
+            raise ValueError(f"Unknown mix engine '{mix_engine}' (expected 'matrix'|'loop')")
+        if residency not in RESIDENCY_POLICIES:
+            raise ValueError(f"Unknown residency '{residency}' (expected {'|'.join(RESIDENCY_POLICIES)})")
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unknown sample format '{sample_format}' (expected {'|'.join(SAMPLE_FORMATS)})")
         # Load BPM configuration from JSON
         bpm_config = self._load_bpm_config(bpm_config_path)
         self.osc_port = osc_port
+        self.osc_receiver = osc_receiver
+        self.osc_rcvbuf_kb = osc_rcvbuf_kb
+        self.residency = residency
+        self.stream_above_mb = float(stream_above_mb)
+        self.sample_format = sample_format
+        self.progressive_head_sec = max(0.0, float(progressive_head_sec))
         self.sample_rate = 44100
         self.chunk_size = chunk_size  # Default 1024 for Raspberry Pi stability
         self.channels = 2
@@ -496,16 +2027,40 @@ class PythonAudioServer:
         # This provides ample headroom for time-stretch processing
         self.stretch_buffer_size = chunk_size * 64  # Process 64 chunks at a time (~1.5s)
         self.stretch_min_process_size = chunk_size * 16  # Minimum size for efficient processing
-        self.stretch_input_buffer = np.zeros((0, 2), dtype=np.float32)
-        self.stretch_output_buffer = np.zeros((0, 2), dtype=np.float32)
         self.stretch_output_target = chunk_size * 86  # Keep ~2 seconds of output ready
+        # Circular input/output buffers: appending a chunk and consuming from the
+        # front are bulk copies, never a reallocation of the whole backlog.
+        self.stretch_input_buffer = _AudioRingBuffer(self.stretch_buffer_size * 2)
+        self.stretch_output_buffer = _AudioRingBuffer(self.stretch_output_target + self.stretch_buffer_size * 2)
+        self._stretch_batch = np.zeros((self.stretch_buffer_size, 2), dtype=np.float32)
+        self._stretch_out = np.zeros((chunk_size, 2), dtype=np.float32)
+        # Streaming stage (audiotsm, phase_vocoder): one persistent TSM fed chunk by
+        # chunk. Its output only needs to cover one chunk, so latency is the TSM frame.
+        self._stretch_stream: Optional[StreamingTimeStretch] = None
+        self._stretch_stream_method: Optional[str] = None
+        self.stretch_stream_max_renders = 8  # cap on mix renders per output chunk
         # Overrun tracking
         self.stretch_underrun_count = 0
         self.stretch_last_underrun_log = 0.0
 
-        self.buffers: Dict[int, AudioBuffer] = {}
+        self.buffers: Dict[int, AudioBuffer] = _BufferRegistry(int(buffer_budget_mb * 1024 * 1024))
         self.active_players: Dict[int, StemPlayer] = {}
 
+        # Decoded PCM cache: reloads become an mmap of a cached .npy instead of a decode
+        self.audio_cache: Optional[DecodedAudioCache] = None
+        if audio_cache_dir is not None:
+            self.audio_cache = DecodedAudioCache(audio_cache_dir, target_sr=self.sample_rate,
+                                                 sample_format=sample_format)
+            print(f"📦 Decoded audio cache: {self.audio_cache.cache_dir}")
+
+        # Shared memory PCM: survives a server restart (see shm_store.py)
+        self.pcm_store: Optional[SharedPCMStore] = None
+        if shm_store:
+            self.pcm_store = SharedPCMStore(target_sr=self.sample_rate, sample_format=sample_format)
+            print(f"🧠 Shared memory PCM store: {self.pcm_store.manifest_path}")
+        self.state_file: Optional[Path] = Path(state_file).expanduser() if state_file is not None else None
+        self.state_interval_s = 1.0
+
         self.deck_a_volume = 1.0
         self.deck_b_volume = 1.0
         self.deck_c_volume = 1.0
@@ -515,19 +2070,25 @@ class PythonAudioServer:
         # Per‑deck 3‑band tone filters (low/mid/high)
         # Use optimized scipy version if requested and available
         filter_class = _ThreeBand  # Default to Python version
+        self._eq: Optional[MultiDeckEQ] = None
         if use_optimized_filters:
             if SCIPY_AVAILABLE:
-                filter_class = _ThreeBandOptimized
-                print("🚀 Using optimized scipy filters (50-100x faster)")
+                # All four decks in one lfilter call per band
+                self._eq = MultiDeckEQ(self.sample_rate, decks=4, smoothing_time_ms=eq_smoothing_time_ms)
+                print("🚀 Using optimized scipy filters (batched multi-deck EQ)")
             else:
                 print("⚠️  scipy not available, falling back to standard filters")
 
-        self._filters: Dict[str, Union[_ThreeBand, _ThreeBandOptimized]] = {
-            'A': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
-            'B': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
-            'C': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
-            'D': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
-        }
+        self._filters: Dict[str, Union[_ThreeBand, _ThreeBandOptimized, _DeckEQView]]
+        if self._eq is not None:
+            self._filters = {d: self._eq.deck(i) for i, d in enumerate("ABCD")}
+        else:
+            self._filters = {
+                'A': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
+                'B': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
+                'C': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
+                'D': filter_class(self.sample_rate, smoothing_time_ms=eq_smoothing_time_ms),
+            }
 
         self.clock = TempoClock()
         self.base_bpm = 120.0
@@ -539,10 +2100,14 @@ class PythonAudioServer:
         # 1. "playback_rate" - Change read speed (like vinyl speed change) - fastest, slight pitch change
         # 2. "pyrubberband" - High quality time-stretch, preserves pitch - more CPU
         # 3. "audiotsm" - Fast WSOLA time-stretch - medium CPU
+        # 4. "phase_vocoder" - In-process NumPy phase vocoder (phase locked) - medium CPU
+        # 5. "prerendered" - Players read tempo variants rendered in the background - unity-rate CPU
         # Default: playback_rate (most efficient, works always)
         self.stretch_method = "playback_rate"  # Default: simple rate change
         self.use_audiotsm = False
         self.enable_time_stretch = enable_time_stretch
+        # Player read-path interpolation for non-unity rates (playback_rate method)
+        self.interpolation = interpolation
         
         # Check available methods and log
         available_methods = ["playback_rate"]
@@ -550,6 +2115,8 @@ class PythonAudioServer:
             available_methods.append("pyrubberband")
         if AUDIOTSM_AVAILABLE:
             available_methods.append("audiotsm")
+        available_methods.append("phase_vocoder")
+        available_methods.append("prerendered")
         
         print(f"🎵 BPM control: using {self.stretch_method} (available: {', '.join(available_methods)})")
         
@@ -599,6 +2166,16 @@ class PythonAudioServer:
         # Higher smoothing factor = slower transition (more gradual)
         self.smoothing_factor_up = smoothing_config.get('smoothing_factor_up', 0.96)    # When BPM is decreasing - slower decrease
         self.smoothing_factor_down = smoothing_config.get('smoothing_factor_down', 0.92)  # When BPM is increasing - faster increase
+
+        # Pre-rendered tempo variants ("prerendered" method): BPM steps to render,
+        # memory budget and render pool size. The store is created on first use,
+        # once base_bpm is final.
+        variants_config = bpm_config.get('tempo_variants', {})
+        self.tempo_variant_bpms = variants_config.get('bpm_steps') or self._default_variant_bpms(
+            variants_config.get('step_bpm', 4.0))
+        self.tempo_variant_budget_mb = float(variants_config.get('memory_budget_mb', 512.0))
+        self.tempo_variant_workers = int(variants_config.get('workers', 1))
+        self._tempo_variants: Optional[TempoVariantStore] = None
         
         # Log if config was loaded
         if bpm_config:
@@ -623,23 +2200,165 @@ class PythonAudioServer:
         # Armed (cued) decks ready to start together
         self._armed: Dict[str, int] = {}
 
+        # Timed starts/fades run inside the audio thread at exact sample offsets
+        self._scheduler = _EventScheduler(self.sample_rate)
+        self._deck_start_frame: Dict[str, int] = {}
+
+        # Per-sample parameter ramps (/ramp, /fade), evaluated by the mixer
+        self._ramps = _ParamRamps(self.chunk_size, self._ramp_get, self._ramp_set)
+        # Direct parameter sets (/deck_levels, /deck_eq, /stem_volume, ...) are
+        # coalesced here and applied by the audio thread at each chunk
+        self._control = _ControlTable(self._apply_control)
+        # Timed OSC bundle being dispatched on this handler thread (see _osc_bundle)
+        self._bundle = threading.local()
+        self._bundles_received = 0
+        self._bundles_late = 0
+
+        # Background loading: OSC handlers submit decode jobs and return immediately.
+        # A deck's ready event is cleared while a /cue for it is in flight; the
+        # generation counter lets a newer /cue supersede a slower, older one.
+        self._loader_pool = ThreadPoolExecutor(max_workers=max(1, int(loader_workers)),
+                                               thread_name_prefix="buffer-loader")
+        self._load_lock = threading.Lock()
+        self._pending_loads: Dict[int, Future] = {}
+        self._load_generation: Dict[int, int] = {}
+        self._deck_ready: Dict[str, threading.Event] = {d: threading.Event() for d in "ABCD"}
+        for ev in self._deck_ready.values():
+            ev.set()
+        self._cue_generation: Dict[str, int] = {d: 0 for d in "ABCD"}
+        self._last_load_ms: Dict[str, float] = {}
+
         # DJ EQ feel: depth of cut at 0% (in dB)
         self._eq_max_cut_db = 24.0
 
+        # Graceful degradation: render-quality rungs stepped by audio loop timing.
+        # Each applied rung is stacked with the value it replaced.
+        self._ladder: Optional[_DegradationLadder] = None
+        self._degraded: list = []
+        self._filters_bypassed = False
+        if degrade_steps:
+            self._ladder = _DegradationLadder(tuple(degrade_steps), high=degrade_high, low=degrade_low)
+            print(f"🪜 Degradation ladder: {' → '.join(self._ladder.steps)} "
+                  f"(down above {degrade_high:.0%}, up below {degrade_low:.0%} of the chunk budget)")
+        self._subscribers: set = set(notify)
+
+        # Real-time mode: applied by enter_realtime() (the mixer thread promotes itself)
+        self.realtime = realtime
+        self.rt_priority = int(rt_priority)
+        self._gc: Optional[GCController] = None
+        self._rt_promote = False
+        self._rt_status: Dict[str, str] = {}
+
+        # Output backend: blocking writes or callback + render-ahead ring buffer
+        self.output_mode = output_mode
+        self.prefill_chunks = max(1, int(prefill_chunks))
+        self._output_ring: Optional[_AudioRingBuffer] = None
+        self._ring_space = threading.Event()   # set by the callback whenever it consumes frames
+        self._callback_out = np.zeros((chunk_size, 2), dtype=np.float32)
+        self.output_underrun_count = 0  # callback had to emit silence (or PortAudio reported underflow)
+        self.output_overrun_count = 0   # rendered chunk dropped because the ring stayed full
+
+        # Preallocated mix bus: one stereo bus per deck (A..D), a player scratch
+        # chunk and the float32 output chunk; audio_loop reuses them every chunk.
+        self._deck_bus = np.zeros((4, chunk_size, 2), dtype=np.float32)
+        self._player_out = np.zeros((chunk_size, 2), dtype=np.float32)
+        self._mix_out = np.zeros((chunk_size, 2), dtype=np.float32)
+        self.mix_engine = mix_engine
+        self._player_matrix = _PlayerMatrix(chunk_size, decks=4)
+        self._players_rendered = 0  # players the last mix segment rendered (read by the GC tick)
+        self._alloc_probe: Optional[_AllocationProbe] = _AllocationProbe() if debug_alloc else None
+
         self.pa = pyaudio.PyAudio()
         self.audio_device = audio_device
         self.stream: Optional[pyaudio.Stream] = None
         self.running = False
 
-        self.osc_server: Optional[ThreadingOSCUDPServer] = None
+        self.osc_server: Optional[Any] = None  # ThreadingOSCUDPServer or an osc_receiver server
+        self._dispatcher: Optional[BundleDispatcher] = None
+
+        # Engine metrics: loop-time histogram recorded by audio_loop, the rest read on demand
+        self.metrics = MetricsRegistry()
+        self.metrics_port = int(metrics_port)
+        self._metrics_http: Optional[Any] = None
+        self._register_metrics()
 
         print("🎛️💾 PYTHON AUDIO SERVER INITIALIZING 💾🎛️")
         self.setup_audio()
         self.setup_osc()
 
+    def _register_metrics(self) -> None:
+        m = self.metrics
+        sched = self._scheduler
+        m.register("device_underruns_total", "counter", "Output device underruns (silence played)",
+                   lambda: self.output_underrun_count)
+        m.register("output_overruns_total", "counter", "Rendered chunks dropped because the output ring stayed full",
+                   lambda: self.output_overrun_count)
+        m.register("stretch_underruns_total", "counter", "Time-stretch stage underruns (silent chunks)",
+                   lambda: self.stretch_underrun_count)
+        m.register("scheduler_events_total", "counter", "Scheduled events applied on the sample clock",
+                   lambda: sched.applied)
+        m.register("scheduler_late_events_total", "counter", "Scheduled events applied after their frame",
+                   lambda: sched.late)
+        m.register("scheduler_max_late_seconds", "gauge", "Largest scheduler lateness",
+                   lambda: sched.stats()["max_late_ms"] / 1000.0)
+        m.register("osc_messages_total", "counter", "OSC messages dispatched per address",
+                   self._osc_message_counts, label="address")
+        m.register_rate("osc_messages_per_second", "OSC messages per second per address since the previous read",
+                        self._osc_message_counts, label="address")
+        m.register("resident_buffer_bytes", "gauge", "Decoded audio held in RAM by loaded buffers",
+                   lambda: self.buffers.stats()["resident_mb"] * 1024 * 1024)
+        m.register("active_players", "gauge", "Players currently playing",
+                   lambda: sum(1 for p in list(self.active_players.values()) if p.playing))
+        if self._ladder is not None:
+            m.register("degrade_level", "gauge", "Degradation ladder rungs currently given up",
+                       lambda: len(self._degraded))
+        if self.realtime:
+            m.register("gc_max_pause_seconds", "gauge", "Longest GC collection run by the mixer (real-time mode)",
+                       lambda: self._gc.stats()["max_pause_ms"] / 1000.0 if self._gc is not None else 0.0)
+
+    def _osc_message_counts(self) -> Dict[str, int]:
+        """Per-address OSC totals; metric readers only (a snapshot from the dispatcher)."""
+        disp = self._dispatcher
+        return disp.message_counts_snapshot() if disp is not None else {}
+
     def _now(self) -> float:
-        """Seconds since server start (perf_counter-based)."""
-        return time.perf_counter() - self._t0
+        """Seconds since server start (perf_counter-based).
+
+        Inside a timed OSC bundle this is the bundle's time, so ``start_at``
+        arguments count from the timetag.
+        """
+        at = getattr(self._bundle, "time", None)
+        return at if at is not None else time.perf_counter() - self._t0
+
+    def _in_bundle(self) -> bool:
+        return getattr(self._bundle, "events", None) is not None
+
+    @contextmanager
+    def _osc_bundle(self, timetag: Optional[float]):
+        """Dispatch scope for one OSC bundle (see ``BundleDispatcher``).
+
+        The timetag (Unix time, from the sender's NTP-synced clock) is mapped onto
+        server time and from there onto the mix sample clock. Handlers schedule as
+        usual, but their events - including direct parameter sets, which are
+        deferred to the bundle time - are collected and pushed to the scheduler in
+        one step once the whole bundle has been dispatched. Everything due at the
+        bundle time therefore applies on the same sample frame, however long the
+        handlers took.
+        """
+        now = time.perf_counter() - self._t0
+        at = now if timetag is None else now + (timetag - time.time())
+        self._bundles_received += 1
+        if at < now:
+            self._bundles_late += 1
+        ctx = self._bundle
+        ctx.time, ctx.events = at, []
+        try:
+            yield
+        finally:
+            events = ctx.events
+            ctx.time = ctx.events = None
+            if events:
+                self._scheduler.schedule_many(events)
 
     def setup_audio(self) -> None:
         """Initialise PyAudio stream."""
@@ -653,11 +2372,20 @@ class PythonAudioServer:
             )
             if self.audio_device is not None:
                 stream_kwargs["output_device_index"] = self.audio_device
+            if self.output_mode == "callback":
+                # Mixer renders ahead into the ring; the stream is started in start()
+                # once the ring is prefilled so the first callbacks don't underrun.
+                self._output_ring = _AudioRingBuffer(self.chunk_size * self.prefill_chunks, self.channels)
+                stream_kwargs["stream_callback"] = self._audio_callback
+                stream_kwargs["start"] = False
 
             self.stream = self.pa.open(**stream_kwargs)
             latency_ms = (self.chunk_size / self.sample_rate) * 1000
             filters_status = "ENABLED" if self.enable_filters else "DISABLED (for performance)"
             print(f"🔊 Audio stream opened: {self.sample_rate}Hz, {self.chunk_size} samples ({latency_ms:.1f}ms latency)")
+            if self.output_mode == "callback":
+                prefill_ms = latency_ms * self.prefill_chunks
+                print(f"🔁 Output mode: callback (ring prefill {self.prefill_chunks} chunks = {prefill_ms:.1f}ms)")
             print(f"🎛️  3-band EQ filters: {filters_status}")
             self.running = True
 
@@ -666,8 +2394,67 @@ class PythonAudioServer:
         except Exception as exc:  # pragma: no cover - runtime diagnostic
             print(f"❌ Failed to open audio stream: {exc}")
 
+    def _audio_callback(self, in_data: Any, frame_count: int, time_info: Any, status: int) -> Tuple[Any, int]:
+        """PortAudio callback: copy frames out of the ring, never mix here."""
+        out = self._callback_out
+        if out.shape[0] < frame_count:
+            out = self._callback_out = np.zeros((frame_count, self.channels), dtype=np.float32)
+        out = out[:frame_count]
+        ring = self._output_ring
+        n = ring.read_into(out) if ring is not None else 0
+        if n < frame_count:
+            out[n:] = 0.0
+            self.output_underrun_count += 1
+        elif status & getattr(pyaudio, "paOutputUnderflow", 0):
+            self.output_underrun_count += 1
+        self._ring_space.set()
+        return out, pyaudio.paContinue
+
+    def _wait_for_prefill(self, timeout: float = 2.0) -> bool:
+        """Block until the output ring holds its full prefill depth (callback mode)."""
+        ring = self._output_ring
+        if ring is None:
+            return True
+        deadline = time.perf_counter() + timeout
+        while ring.free > 0 and self.running:
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.002)
+        return True
+
+    def _emit_chunk(self, final_mix: np.ndarray) -> None:
+        """Hand one rendered chunk to the output backend."""
+        if self.output_mode != "callback":
+            if self.stream and self.stream.is_active():
+                # PyAudio parses frames with "s#", which accepts a contiguous ndarray
+                # directly (memoryview/bytearray are rejected), so no tobytes() copy.
+                frames = np.ascontiguousarray(final_mix, dtype=np.float32)
+                try:
+                    self.stream.write(frames, num_frames=frames.shape[0], exception_on_underflow=True)
+                except IOError:
+                    # PortAudio reports an underflow that happened before this
+                    # write; the frames themselves were written
+                    self.output_underrun_count += 1
+            return
+        ring = self._output_ring
+        if ring is None:
+            return
+        frames = final_mix.shape[0]
+        # Allow the device a few callback periods to make room before declaring an overrun
+        timeout = 4.0 * self.chunk_size / self.sample_rate
+        while ring.free < frames and self.running:
+            self._ring_space.clear()
+            if ring.free >= frames:
+                break
+            if not self._ring_space.wait(timeout) and self.stream and self.stream.is_active():
+                self.output_overrun_count += 1
+                return
+        ring.write(final_mix)
+
     def _apply_time_stretch(self, mix: np.ndarray, ratio: float) -> np.ndarray:
-        """Apply time-stretch with adaptive buffering for smooth real-time playback.
+        """Apply batch time-stretch (pyrubberband) with adaptive buffering.
+
+        Streaming methods (audiotsm, phase_vocoder) go through ``_stretch_stream_chunk``.
         
         Buffer Strategy:
         - Input Buffer: Accumulates audio before processing (32 chunks = ~740ms)
@@ -689,24 +2476,24 @@ class PythonAudioServer:
         # Check if the selected method has its library available
         if self.stretch_method == "pyrubberband" and pyrb is None:
             return mix
-        if self.stretch_method == "audiotsm" and not AUDIOTSM_AVAILABLE:
-            return mix
+        out_ring = self.stretch_output_buffer
+        in_ring = self.stretch_input_buffer
         if abs(ratio - 1.0) < 0.001:
             # No stretch needed, but still need to handle any buffered output
-            if self.stretch_output_buffer.shape[0] >= self.chunk_size:
-                output = self.stretch_output_buffer[:self.chunk_size]
-                self.stretch_output_buffer = self.stretch_output_buffer[self.chunk_size:]
-                return output.astype(np.float32)
+            if out_ring.available >= self.chunk_size:
+                out_ring.read_into(self._stretch_out)
+                return self._stretch_out
             return mix
         
         try:
             # Add incoming audio to input buffer
-            self.stretch_input_buffer = np.vstack((self.stretch_input_buffer, mix)) if self.stretch_input_buffer.shape[0] > 0 else mix
+            in_ring.reserve(mix.shape[0])
+            in_ring.write(mix)
             
             # Determine how much to process based on output buffer level
             # If output is low, process even with less input (emergency mode)
-            output_level = self.stretch_output_buffer.shape[0]
-            input_level = self.stretch_input_buffer.shape[0]
+            output_level = out_ring.available
+            input_level = in_ring.available
             
             # Process loop - keep output buffer filled to ~2 seconds
             while output_level < self.stretch_output_target:
@@ -733,58 +2520,39 @@ class PythonAudioServer:
                         break  # Wait for more input
                 
                 # Take what we need (up to full buffer size)
-                take_size = min(input_level, self.stretch_buffer_size)
-                to_process = self.stretch_input_buffer[:take_size]
-                self.stretch_input_buffer = self.stretch_input_buffer[take_size:]
+                take_size = in_ring.read_into(self._stretch_batch[:min(input_level, self.stretch_buffer_size)])
+                to_process = self._stretch_batch[:take_size]
                 
-                # Apply time-stretch using selected engine
-                if self.stretch_method == "audiotsm":
-                    # audiotsm speed: 0.5 = half speed (slower), 2.0 = double speed (faster)
-                    # ratio = base_bpm / current_bpm (e.g., 120/110 = 1.09)
-                    # For audiotsm we need: speed = current_bpm / base_bpm = 1/ratio
-                    # So if BPM drops from 120 to 110, speed = 0.917 (slower playback)
-                    speed = 1.0 / ratio
-                    # audiotsm expects channels-first format: (channels, samples)
-                    channels_first = to_process.T  # (samples, 2) -> (2, samples)
-                    reader = ArrayReader(channels_first)
-                    writer = ArrayWriter(channels=2)
-                    tsm = wsola(reader.channels, speed=speed)
-                    tsm.run(reader, writer)
-                    # Convert back to (samples, channels) format
-                    stretched = writer.data.T.astype(np.float32)
-                else:
-                    # pyrubberband: ratio > 1 = slower playback
-                    stretched = pyrb.time_stretch(to_process, self.sample_rate, ratio)
+                # pyrubberband: ratio > 1 = slower playback
+                stretched = pyrb.time_stretch(to_process, self.sample_rate, ratio)
                 
                 # Add to output buffer
-                if self.stretch_output_buffer.shape[0] > 0:
-                    self.stretch_output_buffer = np.vstack((self.stretch_output_buffer, stretched))
-                else:
-                    self.stretch_output_buffer = stretched
+                out_ring.reserve(stretched.shape[0])
+                out_ring.write(stretched)
                 
                 # Update levels for next iteration
-                output_level = self.stretch_output_buffer.shape[0]
-                input_level = self.stretch_input_buffer.shape[0]
+                output_level = out_ring.available
+                input_level = in_ring.available
             
             # Return a chunk from output buffer if available
-            if self.stretch_output_buffer.shape[0] >= self.chunk_size:
-                output = self.stretch_output_buffer[:self.chunk_size]
-                self.stretch_output_buffer = self.stretch_output_buffer[self.chunk_size:]
-                return output.astype(np.float32)
+            if out_ring.available >= self.chunk_size:
+                out_ring.read_into(self._stretch_out)
+                return self._stretch_out
             else:
                 # Not enough output yet - this is an underrun
                 self.stretch_underrun_count += 1
                 now = time.time()
                 # Log underruns but not too frequently (max every 2 seconds)
                 if now - self.stretch_last_underrun_log >= 2.0:
-                    in_samples = self.stretch_input_buffer.shape[0]
-                    out_samples = self.stretch_output_buffer.shape[0]
+                    in_samples = in_ring.available
+                    out_samples = out_ring.available
                     print(f"⚠️  Time-stretch UNDERRUN #{self.stretch_underrun_count}: "
                           f"input={in_samples}/{self.stretch_buffer_size}, "
                           f"output={out_samples}/{self.chunk_size} needed")
                     self.stretch_last_underrun_log = now
                 # Return silence (will catch up)
-                return np.zeros((self.chunk_size, 2), dtype=np.float32)
+                self._stretch_out.fill(0.0)
+                return self._stretch_out
                 
         except Exception as exc:  # pragma: no cover - runtime diagnostic
             if not self._time_stretch_warned:
@@ -793,15 +2561,191 @@ class PythonAudioServer:
             self.enable_time_stretch = False
             return mix
 
+    def _stretch_stream_chunk(self, ratio: float) -> np.ndarray:
+        """One output chunk from the streaming stretch stage.
+
+        The stage pulls mix chunks on demand, so players advance at 1/ratio of
+        real time and the backlog stays bounded by the TSM frame (no batching).
+        """
+        out_ring = self.stretch_output_buffer
+        if abs(ratio - 1.0) < 0.001:
+            # Bypass: drain what the stage already produced, then mix directly
+            if out_ring.available >= self.chunk_size:
+                out_ring.read_into(self._stretch_out)
+                return self._stretch_out
+            if self._stretch_stream is not None:
+                out_ring.clear()
+                self._stretch_stream.clear()
+            return self._render_mix()
+
+        try:
+            stage = self._stretch_stream
+            if stage is None or self._stretch_stream_method != self.stretch_method:
+                out_ring.clear()
+                stage = create_streaming_stretch(self.stretch_method, channels=self.channels, ratio=ratio)
+                self._stretch_stream = stage
+                self._stretch_stream_method = self.stretch_method
+            stage.set_ratio(ratio)
+            renders = 0
+            while out_ring.available < self.chunk_size and renders < self.stretch_stream_max_renders:
+                stage.process(self._render_mix(), out_ring)
+                renders += 1
+        except Exception as exc:  # pragma: no cover - runtime diagnostic
+            if not self._time_stretch_warned:
+                print(f"⚠️  Time-stretch failed; disabling. ({exc})")
+                self._time_stretch_warned = True
+            self.enable_time_stretch = False
+            return self._render_mix()
+
+        if out_ring.available >= self.chunk_size:
+            out_ring.read_into(self._stretch_out)
+            return self._stretch_out
+        self.stretch_underrun_count += 1
+        now = time.time()
+        if now - self.stretch_last_underrun_log >= 2.0:
+            print(f"⚠️  Time-stretch UNDERRUN #{self.stretch_underrun_count}: "
+                  f"output={out_ring.available}/{self.chunk_size} needed after {renders} renders")
+            self.stretch_last_underrun_log = now
+        self._stretch_out.fill(0.0)
+        return self._stretch_out
+
+    def _render_mix(self) -> np.ndarray:
+        """Render one chunk of the master mix into the preallocated ``_mix_out``.
+
+        Scheduled events due inside the chunk split it: the frames before an
+        event are rendered, the event runs, and rendering resumes at its offset.
+        """
+        self._control.drain()
+        sched = self._scheduler
+        start = sched.frame
+        n = self.chunk_size
+        cut = sched.next_offset(start, n)
+        if cut is None:
+            self._render_segment(0, n)
+        else:
+            done = 0
+            while cut is not None:
+                if cut > done:
+                    self._render_segment(done, cut)
+                    done = cut
+                sched.run_due(start + done)
+                cut = sched.next_offset(start, n)
+            if done < n:
+                self._render_segment(done, n)
+        sched.frame = start + n
+        return self._mix_out
+
+    def _render_segment(self, a: int, b: int) -> None:
+        """Render frames ``[a, b)`` of the current chunk into ``_mix_out``."""
+        full = a == 0 and b == self.chunk_size
+        bus = self._deck_bus if full else self._deck_bus[:, a:b]
+        bus.fill(0.0)
+        player_out = self._player_out if full else self._player_out[a:b]
+        frames = b - a
+        ramps = self._ramps
+        ramps.advance(frames)
+        ramping = ramps.has_envelopes
+
+        # Players rendered together by the matrix engine: (player, deck, gain_env)
+        batch = []
+        batched = self.mix_engine == "matrix"
+        rendered = 0
+        for buffer_id, player in list(self.active_players.items()):
+            if player.playing:
+                rendered += 1
+                try:
+                    # Apply BPM ratio via playback rate if using that method
+                    if self.stretch_method == "prerendered" and self.enable_time_stretch:
+                        # Nearest pre-rendered variant, residual ratio as playback rate
+                        player.follow_tempo_variants(self._get_tempo_variants(), self.time_stretch_ratio)
+                    elif self.stretch_method == "playback_rate" and self.time_stretch_ratio != 1.0:
+                        # rate > 1 = read faster = higher pitch/faster playback
+                        # rate < 1 = read slower = lower pitch/slower playback
+                        # time_stretch_ratio = base_bpm / current_bpm
+                        # If current_bpm < base_bpm, ratio > 1, we need to slow down
+                        # So rate = 1/ratio = current_bpm / base_bpm
+                        player.rate = 1.0 / self.time_stretch_ratio
+                    else:
+                        player.rate = 1.0
+                    player.interpolation = self.interpolation
+
+                    gain_env = ramps.env((buffer_id, "volume")) if ramping else None
+                    if (batched and player._fade is None and player.buffer.loaded and player.source is not None
+                            and not player.decoding):
+                        batch.append((player, self._deck_index(buffer_id), gain_env))
+                        continue
+                    if gain_env is None:
+                        player.get_audio_chunk(frames, out=player_out)
+                    else:
+                        # Ramped stem volume: render at unity, apply the envelope
+                        volume = player.volume
+                        player.volume = 1.0
+                        try:
+                            player.get_audio_chunk(frames, out=player_out)
+                        finally:
+                            player.volume = volume
+                        player_out *= gain_env
+                    bus[self._deck_index(buffer_id)] += player_out
+                except Exception as exc:  # pragma: no cover - runtime diagnostic
+                    print(f"⚠️  Error in player {buffer_id}: {exc}")
+                    player.playing = False
+        self._players_rendered = rendered
+        if batch:
+            try:
+                self._player_matrix.render(batch, bus, frames, self.interpolation)
+            except Exception as exc:  # pragma: no cover - runtime diagnostic
+                print(f"⚠️  Error in batched mix ({len(batch)} players): {exc}")
+        # Apply per‑deck 3‑band filters before deck volume and master (if enabled)
+        if self.enable_filters and not self._filters_bypassed:
+            try:
+                if self._eq is not None:
+                    self._eq.process(bus, [self._eq_ramp_gains(d) for d in "ABCD"] if ramping else None)
+                else:
+                    eq = self._eq_ramp_gains if ramping else lambda deck: None
+                    bus[0] = self._filters['A'].process(bus[0], eq('A'))
+                    bus[1] = self._filters['B'].process(bus[1], eq('B'))
+                    bus[2] = self._filters['C'].process(bus[2], eq('C'))
+                    bus[3] = self._filters['D'].process(bus[3], eq('D'))
+            except Exception as _fexc:
+                print(f"⚠️  Filter process error: {_fexc}")
+
+        # Deck volumes, master and soft clip, all in place on preallocated buffers
+        # (scalars, or (n, 1) envelopes while a /ramp is running)
+        final_mix = self._mix_out if full else self._mix_out[a:b]
+        vol_a, vol_b, vol_c, vol_d = self.deck_a_volume, self.deck_b_volume, self.deck_c_volume, self.deck_d_volume
+        master = self.master_volume
+        if ramping:
+            vol_a = ramps.env(("A", "volume"), vol_a)
+            vol_b = ramps.env(("B", "volume"), vol_b)
+            vol_c = ramps.env(("C", "volume"), vol_c)
+            vol_d = ramps.env(("D", "volume"), vol_d)
+            master = ramps.env(("master", "volume"), master)
+        np.multiply(bus[0], vol_a, out=final_mix)
+        bus[1] *= vol_b
+        final_mix += bus[1]
+        bus[2] *= vol_c
+        final_mix += bus[2]
+        bus[3] *= vol_d
+        final_mix += bus[3]
+        final_mix *= master * 0.9
+        np.tanh(final_mix, out=final_mix)
+        final_mix *= 0.9
+
     def audio_loop(self) -> None:
         """Audio processing loop that mixes all active players."""
         # Performance monitoring
         loop_count = 0
         total_time = 0.0
         max_time = 0.0
+        late_events = 0
 
         while self.running:
             loop_start = time.perf_counter()
+            if self._rt_promote:
+                self._rt_promote = False
+                self._rt_status["thread"] = promote_thread(self.rt_priority)
+                print(f"🧵 Mixer thread: {self._rt_status['thread']}")
+            self._scheduler.publish(loop_start, self._mix_frames_per_second())
 
             # --- Beat-based watch printing (reference unit for control) ---
             try:
@@ -834,64 +2778,32 @@ class PythonAudioServer:
                     pass
             
             try:
-                deck_a_mix = np.zeros((self.chunk_size, 2), dtype=np.float32)
-                deck_b_mix = np.zeros((self.chunk_size, 2), dtype=np.float32)
-                deck_c_mix = np.zeros((self.chunk_size, 2), dtype=np.float32)
-                deck_d_mix = np.zeros((self.chunk_size, 2), dtype=np.float32)
-
-                for buffer_id, player in list(self.active_players.items()):
-                    if player.playing:
-                        try:
-                            # Apply BPM ratio via playback rate if using that method
-                            if self.stretch_method == "playback_rate" and self.time_stretch_ratio != 1.0:
-                                # rate > 1 = read faster = higher pitch/faster playback
-                                # rate < 1 = read slower = lower pitch/slower playback
-                                # time_stretch_ratio = base_bpm / current_bpm
-                                # If current_bpm < base_bpm, ratio > 1, we need to slow down
-                                # So rate = 1/ratio = current_bpm / base_bpm
-                                player.rate = 1.0 / self.time_stretch_ratio
-                            else:
-                                player.rate = 1.0
-                            
-                            chunk = player.get_audio_chunk(self.chunk_size)
-                            if 100 <= buffer_id < 1100:
-                                deck_a_mix += chunk
-                            elif 1100 <= buffer_id < 2100:
-                                deck_b_mix += chunk
-                            elif 2100 <= buffer_id < 3100:
-                                deck_c_mix += chunk
-                            else:
-                                deck_d_mix += chunk
-                        except Exception as exc:  # pragma: no cover - runtime diagnostic
-                            print(f"⚠️  Error in player {buffer_id}: {exc}")
-                            player.playing = False
-                # Apply per‑deck 3‑band filters before deck volume and master (if enabled)
-                if self.enable_filters:
-                    try:
-                        deck_a_mix = self._filters['A'].process(deck_a_mix)
-                        deck_b_mix = self._filters['B'].process(deck_b_mix)
-                        deck_c_mix = self._filters['C'].process(deck_c_mix)
-                        deck_d_mix = self._filters['D'].process(deck_d_mix)
-                    except Exception as _fexc:
-                        print(f"⚠️  Filter process error: {_fexc}")
-
-                final_mix = (
-                    deck_a_mix * self.deck_a_volume +
-                    deck_b_mix * self.deck_b_volume +
-                    deck_c_mix * self.deck_c_volume +
-                    deck_d_mix * self.deck_d_volume
-                ) * self.master_volume
-                final_mix = np.tanh(final_mix * 0.9) * 0.9
-                
-                # Apply time-stretch only if using DSP methods (not playback_rate)
-                if self.stretch_method in ("pyrubberband", "audiotsm") and self.enable_time_stretch:
-                    final_mix = self._apply_time_stretch(final_mix, self.time_stretch_ratio)
+                probe = self._alloc_probe
+                if probe is not None:
+                    probe.begin()
 
-                if self.stream and self.stream.is_active():
-                    self.stream.write(final_mix.astype(np.float32).tobytes())
+                if self.enable_time_stretch and self.stretch_method in STREAMING_METHODS:
+                    # Streaming WSOLA pulls as many mix chunks as it needs per output chunk
+                    final_mix = self._stretch_stream_chunk(self.time_stretch_ratio)
+                else:
+                    final_mix = self._render_mix()
+                    # Apply time-stretch only if using DSP methods (not playback_rate)
+                    if self.stretch_method == "pyrubberband" and self.enable_time_stretch:
+                        final_mix = self._apply_time_stretch(final_mix, self.time_stretch_ratio)
 
-                # Performance monitoring
+                # Performance monitoring (render time only; excludes waiting on the device)
                 loop_time = time.perf_counter() - loop_start
+                if probe is not None:
+                    probe.end()
+                self.metrics.record_loop(loop_time)
+
+                self._emit_chunk(final_mix)
+                if self._ladder is not None:
+                    self._degrade_tick(loop_start, loop_time)
+                if self._gc is not None:
+                    self._gc.tick(loop_start, self._players_rendered > 0,
+                                  self.chunk_size / self.sample_rate - loop_time)
+
                 loop_count += 1
                 total_time += loop_time
                 max_time = max(max_time, loop_time)
@@ -906,19 +2818,141 @@ class PythonAudioServer:
                         print(f"🔍 Audio loop stats: avg={avg_ms:.2f}ms, max={max_ms:.2f}ms, budget={budget_ms:.1f}ms")
                         if max_ms > budget_ms:
                             print(f"⚠️  Loop exceeded budget by {max_ms - budget_ms:.2f}ms (this causes stuttering)")
+                        if self.output_mode == "callback":
+                            print(f"   Output ring: underruns={self.output_underrun_count}, overruns={self.output_overrun_count}")
+                    if self._scheduler.late != late_events:
+                        late_events = self._scheduler.late
+                        print(f"🗓️  Scheduler: {late_events} late events so far "
+                              f"(max {self._scheduler.stats()['max_late_ms']:.2f} ms late)")
+                    if probe is not None:
+                        print(f"🧮 Audio loop allocations: {probe.report()}")
+                        probe.reset()
                     # Reset for next interval
                     loop_count = 0
                     total_time = 0.0
                     max_time = 0.0
 
-                # No sleep needed - stream.write() blocks until buffer space available
+                # No sleep needed - stream.write() (or the full ring in callback mode) paces the loop
             except Exception as exc:  # pragma: no cover - runtime diagnostic
                 print(f"❌ Audio loop error: {exc}")
                 time.sleep(0.1)
 
+    def _degrade_tick(self, now: float, loop_time: float) -> None:
+        """Audio thread: feed the ladder one loop time and apply its decision."""
+        ladder = self._ladder
+        step = ladder.observe(now, loop_time, self.chunk_size / self.sample_rate, bool(self._degraded))
+        if step == 0:
+            return
+        avg_ms, max_ms = ladder.last_window
+        budget_ms = self.chunk_size / self.sample_rate * 1000
+        if step < 0:
+            applied = [name for name, _ in self._degraded]
+            for name in ladder.steps:
+                if name in applied:
+                    continue
+                previous = self._degrade_step(name)
+                if previous is None:
+                    continue  # nothing to give up on this rung (e.g. already linear)
+                self._degraded.append((name, previous))
+                ladder.transitions += 1
+                print(f"📉 Degraded to level {len(self._degraded)}: {name} {previous} → {self._rung_value(name)} "
+                      f"(avg {avg_ms:.2f} ms, max {max_ms:.2f} ms, budget {budget_ms:.1f} ms)")
+                self._publish("/degrade", len(self._degraded), name, "down", str(previous),
+                              str(self._rung_value(name)), avg_ms, max_ms, budget_ms)
+                return
+            return
+        name, previous = self._degraded.pop()
+        degraded_value = self._rung_value(name)
+        self._restore_step(name, previous)
+        ladder.transitions += 1
+        if not self._degraded:
+            ladder.settled()
+        print(f"📈 Restored to level {len(self._degraded)}: {name} {degraded_value} → {previous} "
+              f"(avg {avg_ms:.2f} ms, max {max_ms:.2f} ms, budget {budget_ms:.1f} ms)")
+        self._publish("/degrade", len(self._degraded), name, "up", str(degraded_value), str(previous),
+                      avg_ms, max_ms, budget_ms)
+
+    def _rung_value(self, name: str) -> Any:
+        if name == "interpolation":
+            return self.interpolation
+        if name == "filters":
+            return "bypassed" if self._filters_bypassed else ("optimized" if self._eq is not None else "on")
+        if name == "stretch":
+            return self.stretch_method
+        return self.chunk_size
+
+    def _degrade_step(self, name: str) -> Any:
+        """Audio thread: give up one rung; returns the value it replaced, or None if it doesn't apply."""
+        previous = self._rung_value(name)
+        if name == "interpolation":
+            if self.interpolation == "linear":
+                return None
+            self.interpolation = "linear"
+        elif name == "filters":
+            if not self.enable_filters or self._filters_bypassed:
+                return None
+            self._filters_bypassed = True
+        elif name == "stretch":
+            if not self.enable_time_stretch or self.stretch_method not in STREAMING_METHODS + ("pyrubberband",):
+                return None
+            self._set_stretch_method("playback_rate")
+        elif name == "chunk":
+            if self.output_mode != "blocking":
+                return None  # the callback ring is sized for the device period
+            self._resize_render_chunk(self.chunk_size * 2)
+        return previous
+
+    def _restore_step(self, name: str, previous: Any) -> None:
+        """Audio thread: undo ``_degrade_step(name)``."""
+        if name == "interpolation":
+            self.interpolation = previous
+        elif name == "filters":
+            self._filters_bypassed = False
+        elif name == "stretch":
+            self._set_stretch_method(previous)
+        elif name == "chunk":
+            self._resize_render_chunk(int(previous))
+
+    def _set_stretch_method(self, method: str) -> None:
+        """Audio thread: switch BPM method, dropping the old stage's buffered audio."""
+        self.stretch_method = method
+        self._stretch_stream = None
+        self._stretch_stream_method = None
+        self.stretch_output_buffer.clear()
+        self.stretch_input_buffer.clear()
+
+    def _resize_render_chunk(self, chunk_size: int) -> None:
+        """Audio thread: render ``chunk_size`` frames per loop (blocking output writes any length)."""
+        self.chunk_size = chunk_size
+        self._deck_bus = np.zeros((4, chunk_size, 2), dtype=np.float32)
+        self._player_out = np.zeros((chunk_size, 2), dtype=np.float32)
+        self._mix_out = np.zeros((chunk_size, 2), dtype=np.float32)
+        self._stretch_out = np.zeros((chunk_size, 2), dtype=np.float32)
+        self._player_matrix.resize(chunk_size)
+        self._ramps.resize(chunk_size)
+
+    def _publish(self, address: str, *args: object) -> None:
+        """Send a server event to every ``/subscribe``d client and ``notify`` destination."""
+        for client_address in list(self._subscribers):
+            self._send_reply(client_address, address, *args)
+
+    def osc_subscribe(self, client_address: Tuple[str, int], address: str, *args: object) -> None:
+        """Receive server events (``/degrade``) - /subscribe [port] (default: the sender's port)."""
+        try:
+            target = (client_address[0], int(args[0]) if args else client_address[1])
+            if address == "/unsubscribe":
+                self._subscribers.discard(target)
+                print(f"🔕 {target[0]}:{target[1]} unsubscribed")
+            else:
+                self._subscribers.add(target)
+                print(f"🔔 {target[0]}:{target[1]} subscribed to server events")
+        except Exception as exc:  # pragma: no cover - runtime diagnostic
+            print(f"❌ Error in {address}: {exc}")
+
     def setup_osc(self) -> None:
         """Setup OSC server mirroring the SuperCollider API."""
-        disp = dispatcher.Dispatcher()
+        disp = BundleDispatcher(self._osc_bundle)
+        self._dispatcher = disp
         # Uncomment for debugging: disp.set_default_handler(self._print_all_messages)
 
         disp.map("/load_buffer", self.osc_load_buffer)
@@ -930,7 +2964,7 @@ class PythonAudioServer:
         disp.map("/deck_filter", self.osc_deck_filter)   # /deck_filter deck band value
         disp.map("/deck_eq", self.osc_deck_eq)           # /deck_eq deck band percent(0..100)
         disp.map("/deck_eq_all", self.osc_deck_eq_all)   # /deck_eq_all deck low mid high (percents)
-        disp.map("/get_status", self.osc_get_status)
+        disp.map("/get_status", self.osc_get_status, needs_reply_address=True)  # → /status name value ...
         disp.map("/test_tone", self.osc_test_tone)
         disp.map("/mixer_cleanup", self.osc_mixer_cleanup)
         disp.map("/set_tempo", self.osc_set_tempo)
@@ -943,14 +2977,18 @@ class PythonAudioServer:
         disp.map("/reset", self.osc_reset)               # /reset -> set t0 = now
         disp.map("/play", self.osc_play)                 # /play deck path start_at
         disp.map("/fade", self.osc_fade)                 # /fade deck start_at [duration]
+        disp.map("/ramp", self.osc_ramp)                 # /ramp target param from to duration [curve] [start_at]
 
-        disp.map("/cue", self.osc_cue)                   # /cue deck path [start_pos]
+        disp.map("/cue", self.osc_cue, needs_reply_address=True)  # /cue deck path [start_pos] → /cue_ready
+        disp.map("/subscribe", self.osc_subscribe, needs_reply_address=True)    # /subscribe [port] → /degrade ...
+        disp.map("/unsubscribe", self.osc_subscribe, needs_reply_address=True)
         disp.map("/start_group", self.osc_start_group)   # /start_group start_at deck1 deck2 ...
 
         # Start OSC server - try IPv6 first, then IPv4
         # self.osc_server = ThreadingOSCUDPServer(("127.0.0.1", self.osc_port), disp)
-        self.osc_server = ThreadingOSCUDPServer(("0.0.0.0", self.osc_port), disp)
-        print(f"🔌 OSC server listening on port {self.osc_port}")
+        self.osc_server = make_osc_server(self.osc_receiver, ("0.0.0.0", self.osc_port), disp,
+                                          rcvbuf_bytes=self.osc_rcvbuf_kb * 1024)
+        print(f"🔌 OSC server listening on port {self.osc_port} ({self.osc_receiver} receiver)")
 
     def _deck_to_range(self, deck: str) -> Tuple[int, int]:
         deck = (deck or "").strip().upper()
@@ -964,6 +3002,17 @@ class PythonAudioServer:
             return (3100, 4100)
         raise ValueError(f"Unknown deck '{deck}'")
 
+    @staticmethod
+    def _deck_index(buffer_id: int) -> int:
+        """Deck bus (0..3 = A..D) a buffer id mixes into; ids outside A..C go to D."""
+        if 100 <= buffer_id < 1100:
+            return 0
+        if 1100 <= buffer_id < 2100:
+            return 1
+        if 2100 <= buffer_id < 3100:
+            return 2
+        return 3
+
     def _deck_label_from_buffer_id(self, buffer_id: int) -> Optional[str]:
         if 100 <= buffer_id < 1100:
             return "A"
@@ -995,27 +3044,231 @@ class PythonAudioServer:
             return self.deck_d_volume
         raise ValueError(f"Unknown deck '{deck}'")
 
+    def _send_reply(self, client_address: Optional[Tuple[str, int]], address: str, *args: object) -> None:
+        """Send an OSC message back to the client that sent a request (best effort)."""
+        if client_address is None or self.osc_server is None:
+            return
+        try:
+            builder = OscMessageBuilder(address=address)
+            for arg in args:
+                builder.add_arg(arg)
+            self.osc_server.socket.sendto(builder.build().dgram, client_address)
+        except Exception as exc:
+            print(f"⚠️  Could not send {address} to {client_address}: {exc}")
+
+    def _decode_buffer(self, buffer_id: int, path: Union[str, Path], name: str,
+                       residency: Optional[str] = None, start_pos: float = 0.0) -> Optional[AudioBuffer]:
+        """Decode ``path`` into a new AudioBuffer without touching server state.
+
+        ``residency`` (auto|resident|streamed) overrides the server's policy.
+        With progressive loading only the head from ``start_pos`` is decoded here.
+        """
+        file_path = Path(path)
+        if not file_path.exists():
+            print(f"❌ Cannot load buffer {buffer_id}: file does not exist")
+            print(f"   Requested path: {file_path}")
+            print(f"   Absolute path: {file_path.resolve()}")
+            return None
+        mode = choose_residency(file_path, residency or self.residency, self.stream_above_mb)
+        buf = AudioBuffer(file_path, buffer_id, name, cache=self.audio_cache, residency=mode,
+                          sample_format=self.sample_format, start_pos=start_pos,
+                          head_seconds=self.progressive_head_sec, pcm_store=self.pcm_store)
+        return buf if buf.loaded else None
+
+    def _install_buffer(self, buffer_id: int, buf: AudioBuffer) -> None:
+        """Replace buffer ``buffer_id`` and stop its player. Caller holds ``_load_lock``."""
+        replaced = None
+        if buffer_id in self.buffers:
+            print(f"Freed buffer {buffer_id}")
+            replaced = self.buffers.pop(buffer_id)
+            replaced.cancel_decode()
+            replaced.discard_shared()  # the segment stays while ``buf`` (same file) maps it
+        old = self.active_players.pop(buffer_id, None)
+        if old is not None:
+            old.playing = False
+        self.buffers[buffer_id] = buf
+        if replaced is not None:
+            self._discard_tempo_variants(replaced)
+        self._enforce_buffer_budget(buffer_id)
+        self._ensure_tempo_variants(buf)
+
+    def _ensure_tempo_variants(self, buf: AudioBuffer) -> None:
+        """Queue the tempo variants of ``buf`` that aren't rendered (``prerendered`` method).
+
+        Called on load and whenever a player is created, so variants the LRU
+        budget dropped are rendered again once the track is used.
+        """
+        if self.stretch_method == "prerendered" and self.enable_time_stretch and buf.loaded and not buf.streamed:
+            self._get_tempo_variants().ensure(buf.variant_key, self.time_stretch_ratio)
+
+    def _discard_tempo_variants(self, buf: AudioBuffer) -> None:
+        """Drop the tempo variants and queued renders of ``buf``'s audio.
+
+        Kept while another resident buffer holds the same audio (same file).
+        """
+        if self._tempo_variants is None:
+            return
+        key = buf.variant_key
+        if any(other is not buf and other.resident_bytes and other.variant_key == key
+               for other in list(self.buffers.values())):
+            return
+        self._tempo_variants.discard(key)
+
+    def _enforce_buffer_budget(self, *keep: int) -> None:
+        """Evict idle buffers (LRU) while resident audio exceeds the budget.
+
+        Buffers with a player (playing or armed), cued decks and ``keep`` stay.
+        Evicted buffers lose their tempo variants too.
+        """
+        in_use = set(list(self.active_players)) | set(self._armed.values())
+        for buffer_id in self.buffers.enforce(in_use, keep):
+            buf = self.buffers.get(buffer_id)
+            if buf is not None:
+                self._discard_tempo_variants(buf)
+
+    def _submit_load(self, buffer_id: int, path: Union[str, Path], name: str,
+                     on_done: Optional[Any] = None, residency: Optional[str] = None,
+                     start_pos: float = 0.0) -> Future:
+        """Queue a decode on the loader pool; the newest request per buffer id wins.
+
+        ``on_done(buf, current)`` runs on the worker under ``_load_lock`` once the
+        decode finishes; ``buf`` is None on failure and ``current`` is False when a
+        newer load for the same buffer id superseded this one (nothing installed).
+        """
+        with self._load_lock:
+            generation = self._load_generation.get(buffer_id, 0) + 1
+            self._load_generation[buffer_id] = generation
+            future = self._loader_pool.submit(self._load_job, buffer_id, path, name, generation, on_done,
+                                              residency, start_pos)
+            self._pending_loads[buffer_id] = future
+        return future
+
+    def _load_job(self, buffer_id: int, path: Union[str, Path], name: str, generation: int,
+                  on_done: Optional[Any], residency: Optional[str] = None,
+                  start_pos: float = 0.0) -> Optional[AudioBuffer]:
+        """Loader pool worker: decode, then install unless superseded."""
+        buf: Optional[AudioBuffer] = None
+        try:
+            buf = self._decode_buffer(buffer_id, path, name, residency, start_pos)
+        except Exception as exc:  # pragma: no cover - runtime diagnostic
+            print(f"❌ Error loading buffer {buffer_id}: {exc}")
+            import traceback
+            traceback.print_exc()
+        with self._load_lock:
+            current = self._load_generation.get(buffer_id) == generation
+            if current:
+                self._pending_loads.pop(buffer_id, None)
+                if buf is not None:
+                    self._install_buffer(buffer_id, buf)
+            else:
+                print(f"↩️  Load of buffer {buffer_id} ({Path(path).name}) superseded by a newer request")
+                if buf is not None:
+                    buf.cancel_decode()
+            if on_done is not None:
+                try:
+                    on_done(buf if current else None, current)
+                except Exception as exc:  # pragma: no cover - runtime diagnostic
+                    print(f"❌ Error finishing load of buffer {buffer_id}: {exc}")
+        return buf if current else None
+
+    def _wait_for_pending_load(self, buffer_id: int, timeout: float = 5.0) -> None:
+        """Block until an in-flight background load of ``buffer_id`` finishes."""
+        future = self._pending_loads.get(buffer_id)
+        if future is None:
+            return
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            print(f"⚠️  Buffer {buffer_id} still loading after {timeout:.1f}s")
+
     def _load_if_needed(self, buffer_id: int, path: str, name: str) -> bool:
-        """Load buffer if needed. Returns True if buffer ready, False if load failed."""
-        # Load (or reload) buffer if not present or pointing to a different file
+        """Load buffer synchronously if needed. Returns True if buffer ready, False if load failed."""
+        self._wait_for_pending_load(buffer_id)
         buf = self.buffers.get(buffer_id)
-        if buf is None or Path(getattr(buf, "file_path", "")) != Path(path):
-            if buf is not None and buffer_id in self.active_players:
-                try:
-                    self.active_players[buffer_id].playing = False
-                    del self.active_players[buffer_id]
-                except Exception:
-                    pass
-            self.osc_load_buffer("/load_buffer", buffer_id, path, name)
-            # Check if load succeeded
-            buf = self.buffers.get(buffer_id)
-            if buf is None or not buf.loaded:
-                return False
+        if buf is not None and buf.loaded and Path(getattr(buf, "file_path", "")) == Path(path):
+            return True
+        buf = self._decode_buffer(buffer_id, path, name)
+        if buf is None:
+            return False
+        with self._load_lock:
+            self._load_generation[buffer_id] = self._load_generation.get(buffer_id, 0) + 1
+            self._pending_loads.pop(buffer_id, None)
+            self._install_buffer(buffer_id, buf)
         return True
 
-    def _schedule_at(self, abs_time: float, fn: Any) -> None:
-        delay = max(0.0, abs_time - self._now())
-        threading.Timer(delay, fn).start()
+    def _mix_frames_per_second(self) -> float:
+        """Mix (scheduler) frames rendered per second of output."""
+        if self.enable_time_stretch and self.stretch_method in STREAMING_METHODS and self.time_stretch_ratio > 0:
+            return self.sample_rate / self.time_stretch_ratio
+        return float(self.sample_rate)
+
+    def _schedule_at(self, abs_time: float, fn: Any) -> int:
+        """Run ``fn`` in the audio thread at server time ``abs_time``; returns the target frame.
+
+        ``fn`` must be quick and non-blocking: it runs between two samples of the
+        chunk being rendered.
+        """
+        frame = self._scheduler.frame_for_time(self._t0 + abs_time)
+        events = getattr(self._bundle, "events", None)
+        if events is not None:
+            events.append((frame, fn))
+            return frame
+        return self._scheduler.schedule(frame, fn)
+
+    def _set_param(self, key: Tuple[Any, str], value: float) -> None:
+        """Direct parameter set from an OSC handler; overrides any ramp on ``key``.
+
+        Applied by the mixer at the next chunk, or at the bundle's frame when
+        sent inside a timed bundle.
+        """
+        if self._in_bundle():
+            def _apply() -> None:
+                self._ramps.cancel(key)
+                self._apply_control(key, value)
+            self._schedule_at(self._now(), _apply)
+            return
+        self._ramps.cancel(key)
+        self._control.post(key, value)
+
+    def _start_player(self, buffer_id: int, player: "StemPlayer") -> None:
+        """Audio thread: replace the player for ``buffer_id`` and start it at the current frame."""
+        old = self.active_players.get(buffer_id)
+        if old is not None and old is not player:
+            old.playing = False
+        player.playing = True
+        self.active_players[buffer_id] = player
+        deck = self._deck_label_from_buffer_id(buffer_id)
+        if deck:
+            self._deck_actual_start[deck] = self._now()
+            self._deck_start_frame[deck] = self._scheduler.current_frame
+
+    def _schedule_play(self, abs_time: float, buffer_id: int, rate: float = 1.0, volume: float = 0.8,
+                       loop: bool = True, start_pos: float = 0.0, label: str = "") -> Optional[int]:
+        """Build the player now and start it sample-accurately at ``abs_time``."""
+        self._wait_for_pending_load(buffer_id)
+        buf = self.buffers.get(buffer_id)
+        if buf is None or not buf.loaded:
+            print(f"❌ Buffer {buffer_id} not loaded")
+            return None
+        player = StemPlayer(buf, rate, volume, start_pos, loop)
+        player.interpolation = self.interpolation
+        self._enforce_buffer_budget(buffer_id)
+        self._ensure_tempo_variants(buf)
+
+        def _start() -> None:
+            self._start_player(buffer_id, player)
+            late_ms = (self._scheduler.current_frame - frame) * 1000.0 / self.sample_rate
+            print(f"▶️  {label or buffer_id} started @ frame {self._scheduler.current_frame} "
+                  f"(t={self._now():.3f}s, late {late_ms:.2f} ms)")
+
+        frame = self._schedule_at(abs_time, _start)
+        return frame
+
+    def _log_start_delta(self) -> None:
+        """Print the A↔B start delta from the sample clock (B - A)."""
+        if 'A' in self._deck_start_frame and 'B' in self._deck_start_frame:
+            d = self._deck_start_frame['B'] - self._deck_start_frame['A']
+            print(f"⏱️  A↔B start delta: {d:+d} samples ({d * 1000.0 / self.sample_rate:+.2f} ms, B - A)")
 
     def osc_reset(self, address: str, *args: object) -> None:
         """Set server time-zero to 'now' for relative scheduling."""
@@ -1034,18 +3287,29 @@ class PythonAudioServer:
             name = f"Deck{deck.upper()}"
             self._load_if_needed(buffer_id, path, name)
             # Convert relative to absolute using internal t0 reference
-            abs_time = (time.perf_counter() - self._t0) + start_at
-            def _start():
-                self.osc_play_stem("/play_stem", buffer_id, 1.0, 0.8, 1, 0.0)
-                print(f"▶️  /play {deck.upper()} TRIGGER @ rel={start_at:.3f}s (abs={self._now():.6f}s) → {Path(path).name}")
-            self._schedule_at(abs_time, _start)
-            print(f"🗓️  queued /play {deck} @ {start_at:.3f}s (abs={abs_time:.3f}s) — tip: use /cue + /start_group for sample-tight starts")
+            abs_time = self._now() + start_at
+            frame = self._schedule_play(abs_time, buffer_id, label=f"/play {deck.upper()} → {Path(path).name}")
+            if frame is not None:
+                print(f"🗓️  queued /play {deck} @ {start_at:.3f}s (abs={abs_time:.3f}s, frame {frame})")
         except Exception as exc:
             print(f"❌ Error in /play: {exc}")
 
-    def osc_cue(self, address: str, *args: object) -> None:
+    def _arm_deck(self, deck: str, buf: AudioBuffer, start_pos: float) -> None:
+        """Create/replace a non-playing player for ``buf`` at ``start_pos``."""
+        player = StemPlayer(buf, rate=1.0, volume=0.8, start_pos=start_pos, loop=True)
+        player.playing = False
+        self.active_players[buf.buffer_id] = player
+        self._armed[deck] = buf.buffer_id
+        self._enforce_buffer_budget()
+        self._ensure_tempo_variants(buf)
+
+    def osc_cue(self, client_address: Tuple[str, int], address: str, *args: object) -> None:
         """Cue (load + arm) a deck without starting playback.
         Usage: /cue deck path [start_pos]
+
+        Decoding runs on the loader pool and the handler returns immediately. Once
+        the deck is armed the sender receives ``/cue_ready deck buffer_id load_ms``
+        (time from request to armed, including queueing).
         """
         try:
             deck = str(args[0]).strip().upper()
@@ -1054,6 +3318,7 @@ class PythonAudioServer:
             lo, hi = self._deck_to_range(deck)
             buffer_id = lo
             name = f"Deck{deck}"
+            t_request = time.perf_counter()
             print(f"🔍 /cue {deck} → loading buffer_id={buffer_id}, path={path}")
 
             # Check if path exists before trying to load
@@ -1064,26 +3329,34 @@ class PythonAudioServer:
                 print(f"   Absolute: {path_obj.resolve()}")
                 return
 
-            load_ok = self._load_if_needed(buffer_id, path, name)
-            if not load_ok:
-                print(f"❌ /cue {deck} FAILED: Load returned False (see errors above)")
-                return
+            ready = self._deck_ready[deck]
+
+            def _finish(buf: Optional[AudioBuffer], current: bool) -> None:
+                if not current:
+                    return  # a newer /cue owns this deck now
+                if buf is None:
+                    print(f"❌ /cue {deck} FAILED: load failed (see errors above)")
+                    ready.set()  # don't hold /start_group for a load that will never arrive
+                    return
+                self._arm_deck(deck, buf, start_pos)
+                ready.set()
+                load_ms = (time.perf_counter() - t_request) * 1000.0
+                self._last_load_ms[deck] = load_ms
+                print(f"🧷 Cued {deck} → {path_obj.name} @pos {start_pos:.3f} (buffer {buffer_id}, {load_ms:.0f} ms)")
+                self._send_reply(client_address, "/cue_ready", deck, buffer_id, float(load_ms))
 
-            # Create/replace a non‑playing player at desired start_pos
             buf = self.buffers.get(buffer_id)
-            if buf is None:
-                print(f"❌ /cue {deck} FAILED: buffer {buffer_id} not in self.buffers after load")
-                return
-            if not buf.loaded:
-                print(f"❌ /cue {deck} FAILED: buffer {buffer_id} loaded=False")
+            if (buf is not None and buf.loaded and buffer_id not in self._pending_loads
+                    and Path(getattr(buf, "file_path", "")) == path_obj):
+                # Same file already resident: re-arm at the new position right away
+                if buf.decoding:
+                    buf.decode.prioritize(int(start_pos * buf.frames) - 1)
+                with self._load_lock:
+                    _finish(buf, True)
                 return
-            player = StemPlayer(buf, rate=1.0, volume=0.8, start_pos=start_pos, loop=True)
-            player.playing = False
-            self.active_players[buffer_id] = player
-            self._armed[deck] = buffer_id
-            print(f"🧷 Cued {deck} → {Path(path).name} @pos {start_pos:.3f} (buffer {buffer_id})")
-            print(f"   📋 self._armed now: {self._armed}")
-            print(f"   📋 self.active_players keys: {list(self.active_players.keys())}")
+
+            ready.clear()
+            self._submit_load(buffer_id, path, name, _finish, start_pos=start_pos)
         except Exception as exc:
             print(f"❌ Error in /cue: {exc}")
             import traceback
@@ -1110,62 +3383,39 @@ class PythonAudioServer:
                 raise ValueError("missing start_at")
             if not decks:
                 raise ValueError("no decks provided")
-            abs_time = (time.perf_counter() - self._t0) + float(start_at)
+            abs_time = self._now() + float(start_at)
+
+            # Wait here (OSC handler thread) for in-flight /cue loads of these decks:
+            # until the start time plus at most 5s, so a late load delays the start
+            # instead of being skipped
+            max_wait = 5.0
+            wait_start = time.perf_counter()
+            deadline = self._t0 + abs_time + max_wait
+            pending = [d for d in decks if d in self._deck_ready and not self._deck_ready[d].is_set()]
+            for d in pending:
+                self._deck_ready[d].wait(max(0.0, deadline - time.perf_counter()))
+            if pending:
+                waited = time.perf_counter() - wait_start
+                late = [d for d in pending if not self._deck_ready[d].is_set()]
+                if late:
+                    print(f"⚠️  Timeout waiting for decks {late} ({waited:.3f}s), starting anyway...")
+                else:
+                    print(f"✅ All buffers ready after {waited:.3f}s wait")
 
             def _start_all():
                 t_call = self._now()
-                print(f"🔍 _start_all callback firing at t={t_call:.6f}s")
-                print(f"   📋 self._armed: {self._armed}")
-                print(f"   📋 self.active_players: {list(self.active_players.keys())}")
-
-                # Wait for buffers to be ready (max 5s)
-                max_wait = 5.0
-                wait_start = time.perf_counter()
-                while time.perf_counter() - wait_start < max_wait:
-                    all_ready = True
-                    for d in decks:
-                        if d not in ("A","B","C","D"):
-                            continue
-                        bid = self._armed.get(d)
-                        if bid is None:
-                            lo, hi = self._deck_to_range(d)
-                            for cand in range(lo, hi):
-                                if cand in self.active_players:
-                                    bid = cand
-                                    break
-                        if bid is None or bid not in self.active_players:
-                            all_ready = False
-                            break
-                        # Check if buffer is loaded
-                        pl = self.active_players.get(bid)
-                        if pl is None or not pl.buffer.loaded:
-                            all_ready = False
-                            break
-
-                    if all_ready:
-                        waited = time.perf_counter() - wait_start
-                        print(f"✅ All buffers ready after {waited:.3f}s wait")
-                        break
-                    time.sleep(0.05)  # Poll every 50ms
-                else:
-                    waited = time.perf_counter() - wait_start
-                    print(f"⚠️  Timeout waiting for buffers ({waited:.3f}s), starting anyway...")
-
                 for d in decks:
                     if d not in ("A","B","C","D"):
                         print(f"⚠️  Unknown deck '{d}' in /start_group")
                         continue
                     # Resolve buffer id: prefer armed, else base deck id with existing player
                     bid = self._armed.get(d)
-                    print(f"🔍 Deck {d}: bid from _armed = {bid}")
                     if bid is None:
                         lo, hi = self._deck_to_range(d)
-                        print(f"🔍 Deck {d}: searching active_players in range [{lo}, {hi})")
                         # pick existing active player in range if present
                         for cand in range(lo, hi):
                             if cand in self.active_players:
                                 bid = cand
-                                print(f"🔍 Deck {d}: found active player at buffer {bid}")
                                 break
                     if bid is None:
                         print(f"❌ Deck {d} not armed and no active player")
@@ -1177,18 +3427,14 @@ class PythonAudioServer:
                         print(f"❌ No player for deck {d} (buffer {bid})")
                         print(f"   📋 active_players: {list(self.active_players.keys())}")
                         continue
-                    # Reset to cued position and flip playing on
-                    # (avoid race if already playing)
-                    pl.playing = True
-                    self._deck_actual_start[d] = t_call
-                    print(f"🎬 Group START Deck {d} @ t={t_call:.6f}s (buffer {bid})")
-                # If A & B are in the set, print their delta
-                if 'A' in self._deck_actual_start and 'B' in self._deck_actual_start:
-                    d_ms = (self._deck_actual_start['B'] - self._deck_actual_start['A']) * 1000.0
-                    print(f"⏱️  Group A↔B start delta: {d_ms:+.2f} ms (B - A)")
-
-            self._schedule_at(abs_time, _start_all)
-            print(f"🗓️  queued /start_group {decks} @ {float(start_at):.3f}s (abs={abs_time:.3f}s)")
+                    # All decks flip on at the same sample frame
+                    self._start_player(bid, pl)
+                    print(f"🎬 Group START Deck {d} @ frame {self._scheduler.current_frame} "
+                          f"(t={t_call:.6f}s, buffer {bid})")
+                self._log_start_delta()
+
+            frame = self._schedule_at(abs_time, _start_all)
+            print(f"🗓️  queued /start_group {decks} @ {float(start_at):.3f}s (abs={abs_time:.3f}s, frame {frame})")
         except Exception as exc:
             print(f"❌ Error in /start_group: {exc}")
             import traceback
@@ -1197,34 +3443,148 @@ class PythonAudioServer:
     def osc_fade(self, address: str, *args: object) -> None:
         """/fade deck start_at [duration] — linear ramp deck volume to 0 over duration."""
         try:
-            deck = str(args[0])
+            deck = str(args[0]).strip().upper()
             start_at = float(args[1])
             duration = float(args[2]) if len(args) > 2 else 2.0
-            start_abs = (time.perf_counter() - self._t0) + start_at
-
-            def _ramp():
-                try:
-                    v0 = self._deck_volume_get_set(deck)
-                    steps = max(1, int(duration * 20))  # 20 Hz ramp
-                    if duration <= 0:
-                        self._deck_volume_get_set(deck, 0.0)
-                        print(f"🎚️  /fade {deck} immediate -> 0.00")
-                        return
-                    for i in range(steps):
-                        t = (i + 1) / steps
-                        v = (1.0 - t) * v0
-                        self._deck_volume_get_set(deck, v)
-                        time.sleep(duration / steps)
-                    self._deck_volume_get_set(deck, 0.0)
-                    print(f"🎚️  /fade {deck} done (dur {duration:.2f}s)")
-                except Exception as e:
-                    print(f"❌ fade ramp error: {e}")
-
-            self._schedule_at(start_abs, _ramp)
+            self._deck_volume_get_set(deck)  # validate deck
+            start_abs = self._now() + start_at
+            self._queue_ramp(_Ramp((deck, "volume"), None, 0.0, int(duration * self.sample_rate), "linear",
+                                   self.chunk_size), start_abs)
             print(f"🗓️  queued /fade {deck} @ {start_at:.3f}s (dur {duration:.2f}s)")
         except Exception as exc:
             print(f"❌ Error in /fade: {exc}")
 
+    def _queue_ramp(self, ramp: _Ramp, start_abs: Optional[float] = None) -> None:
+        """Start ``ramp`` with the next chunk, or at server time ``start_abs`` (sample-accurate)."""
+        if start_abs is None and not self._in_bundle():
+            self._ramps.submit(ramp)
+        elif start_abs is None:
+            self._schedule_at(self._now(), lambda: self._ramps.start(ramp))
+        else:
+            self._schedule_at(start_abs, lambda: self._ramps.start(ramp))
+
+    def _ramp_get(self, key: Tuple[Any, str]) -> float:
+        """Current value of a ramp target (EQ bands in percent, like /deck_eq)."""
+        target, param = key
+        if target == "master":
+            return self.master_volume
+        if isinstance(target, int):
+            player = self.active_players.get(target)
+            return player.volume if player is not None else 0.0
+        if param == "volume":
+            return self._deck_volume_get_set(target)
+        return self._percent_from_cut_only_gain(getattr(self._filters[target], f"{param}_gain"), self._eq_max_cut_db)
+
+    def _ramp_set(self, key: Tuple[Any, str], value: float) -> None:
+        """Store a finished ramp's final value in the scalar parameter."""
+        target, param = key
+        if target == "master":
+            self.master_volume = value
+        elif isinstance(target, int):
+            player = self.active_players.get(target)
+            if player is not None:
+                player.volume = value
+        elif param == "volume":
+            self._deck_volume_get_set(target, value)
+        # EQ bands: the filter already holds the envelope's last gain
+
+    def _apply_control(self, key: Tuple[Any, str], value: float) -> None:
+        """Audio thread: apply one coalesced control slot.
+
+        Keys match the ramp keys: (deck, "volume"), (buffer_id, "volume") and
+        (deck, band), where EQ bands carry a linear gain.
+        """
+        target, param = key
+        if isinstance(target, int):
+            player = self.active_players.get(target)
+            if player is not None:
+                player.volume = value
+        elif param == "volume":
+            self._deck_volume_get_set(target, value)
+        else:
+            self._filters[target].set_gain(param, value)
+
+    @staticmethod
+    def _band_name(band: str) -> str:
+        """Canonical EQ band name (``lo``/``Low`` → ``low``) for control keys."""
+        return MultiDeckEQ.BANDS[MultiDeckEQ._band_index(band)]
+
+    def _eq_ramp_gains(self, deck: str) -> Optional[Tuple[Optional[np.ndarray], ...]]:
+        env = self._ramps.env
+        gains = (env((deck, "low")), env((deck, "mid")), env((deck, "high")))
+        return gains if any(g is not None for g in gains) else None
+
+    def _cut_only_gains(self, percent: np.ndarray) -> None:
+        """Vectorized ``_cut_only_gain_from_percent``, in place (ramp transform for EQ bands)."""
+        np.clip(percent, 0.0, 50.0, out=percent)
+        hard_kill = percent <= 0.0
+        percent *= self._eq_max_cut_db / 50.0 / 20.0
+        percent -= self._eq_max_cut_db / 20.0
+        np.power(10.0, percent, out=percent)
+        percent[hard_kill] = 0.0
+
+    @staticmethod
+    def _percent_from_cut_only_gain(gain: float, max_cut_db: float = 24.0) -> float:
+        """Inverse of ``_cut_only_gain_from_percent`` (gain → 0..50%)."""
+        if gain <= 0.0:
+            return 0.0
+        if gain >= 1.0:
+            return 50.0
+        db = 20.0 * np.log10(gain)
+        return float(max(0.0, 50.0 * (1.0 + db / max_cut_db)))
+
+    def osc_ramp(self, address: str, *args: object) -> None:
+        """Per-sample parameter ramp evaluated in the audio thread.
+
+        Usage: /ramp target param from to duration [curve] [start_at]
+        - target: deck A|B|C|D, ``master``, or a stem buffer id
+        - param: ``volume`` (all targets); ``low``|``mid``|``high``|``eq`` EQ percent
+          (0..100, 50 = flat, like /deck_eq) for decks, ``eq`` ramps all three bands
+        - from: start value, or ``current`` to continue from the present value
+        - curve: linear (default), exp (linear in dB), equal_power, scurve
+        - start_at: delay in seconds, sample-accurate (like /fade); default is the next chunk
+        """
+        try:
+            if len(args) < 5:
+                raise ValueError("usage: /ramp target param from to duration [curve] [start_at]")
+            target_arg = str(args[0]).strip()
+            param = str(args[1]).strip().lower()
+            from_arg = str(args[2]).strip().lower()
+            v0 = None if from_arg in ("current", "*", "-") else float(args[2])
+            v1 = float(args[3])
+            duration = max(0.0, float(args[4]))
+            curve = str(args[5]).strip().lower() if len(args) > 5 else "linear"
+            start_at = float(args[6]) if len(args) > 6 else None
+            if curve not in _ParamRamps.CURVES:
+                raise ValueError(f"Unknown curve '{curve}' (expected {'|'.join(_ParamRamps.CURVES)})")
+
+            target: Any
+            if target_arg.lower() == "master":
+                target = "master"
+            elif target_arg.upper() in ("A", "B", "C", "D"):
+                target = target_arg.upper()
+            else:
+                target = int(float(target_arg))
+            if param in ("low", "mid", "high", "eq"):
+                if not isinstance(target, str) or target == "master":
+                    raise ValueError("EQ ramps need a deck target (A|B|C|D)")
+                if not self.enable_filters:
+                    return  # Silently ignore when filters disabled (performance)
+                params = ["low", "mid", "high"] if param == "eq" else [param]
+                transform = self._cut_only_gains
+            elif param == "volume":
+                params = [param]
+                transform = None
+            else:
+                raise ValueError(f"Unknown param '{param}' (expected volume|low|mid|high|eq)")
+
+            frames = int(round(duration * self.sample_rate))
+            start_abs = self._now() + start_at if start_at is not None else None
+            for p in params:
+                self._queue_ramp(_Ramp((target, p), v0, v1, frames, curve, self.chunk_size, transform), start_abs)
+        except Exception as exc:
+            print(f"❌ Error in /ramp: {exc}")
+
     def osc_deck_levels(self, address: str, *args: object) -> None:
         """Set per-deck levels independently - /deck_levels [volA, volB, volC, volD]."""
         try:
@@ -1232,7 +3592,8 @@ class PythonAudioServer:
             b = float(args[1]) if len(args) > 1 else self.deck_b_volume
             c = float(args[2]) if len(args) > 2 else self.deck_c_volume
             d = float(args[3]) if len(args) > 3 else self.deck_d_volume
-            self.deck_a_volume, self.deck_b_volume, self.deck_c_volume, self.deck_d_volume = a, b, c, d
+            for deck, value in zip("ABCD", (a, b, c, d)):
+                self._set_param((deck, "volume"), value)
             print(f"🎚️  Deck levels → A:{a:.2f} B:{b:.2f} C:{c:.2f} D:{d:.2f}")
         except Exception as exc:
             print(f"❌ Error setting deck levels: {exc}")
@@ -1253,7 +3614,8 @@ class PythonAudioServer:
             if not np.isfinite(value):
                 value = 0.0
             value = max(0.0, float(value))
-            self._filters[deck].set_gain(band, value)
+            band = self._band_name(band)
+            self._set_param((deck, band), value)
             # No logging for performance
         except Exception as exc:
             print(f"❌ Error in /deck_filter: {exc}")
@@ -1295,7 +3657,8 @@ class PythonAudioServer:
             if deck not in self._filters:
                 raise ValueError(f"Unknown deck '{deck}'")
             gain = self._cut_only_gain_from_percent(percent, self._eq_max_cut_db)
-            self._filters[deck].set_gain(band, gain)
+            band = self._band_name(band)
+            self._set_param((deck, band), gain)
             # No logging for performance (hundreds of commands per second)
         except Exception as exc:
             print(f"❌ Error in /deck_eq: {exc}")
@@ -1316,9 +3679,9 @@ class PythonAudioServer:
             lg = self._cut_only_gain_from_percent(low_p, self._eq_max_cut_db)
             mg = self._cut_only_gain_from_percent(mid_p, self._eq_max_cut_db)
             hg = self._cut_only_gain_from_percent(high_p, self._eq_max_cut_db)
-            self._filters[deck].set_gain('low', lg)
-            self._filters[deck].set_gain('mid', mg)
-            self._filters[deck].set_gain('high', hg)
+            self._set_param((deck, "low"), lg)
+            self._set_param((deck, "mid"), mg)
+            self._set_param((deck, "high"), hg)
             # No logging for performance
         except Exception as exc:
             print(f"❌ Error in /deck_eq_all: {exc}")
@@ -1348,14 +3711,9 @@ class PythonAudioServer:
             if 2100 not in self.buffers:
                 print("❌ Deck C (buffer 2100) not loaded; load it first.")
                 return
-            def _play():
-                try:
-                    self.osc_play_stem("", 2100, 1.0, 0.8, 1, 0.0)
-                    print(f"⏩ Deck C started at t={self._now():.3f}s (scheduled for {abs_x:.3f}s)")
-                except Exception as exc:
-                    print(f"❌ Scheduled Deck C failed: {exc}")
-            print(f"🗓️  Deck C will start at X={abs_x:.3f}s (now={now:.3f}s, delay={delay:.3f}s)")
-            threading.Timer(delay, _play).start()
+            frame = self._schedule_play(abs_x, 2100, label="Deck C")
+            if frame is not None:
+                print(f"🗓️  Deck C will start at X={abs_x:.3f}s (now={now:.3f}s, delay={delay:.3f}s, frame {frame})")
         except Exception as exc:
             print(f"❌ Error in /schedule_c_at: {exc}")
     def osc_set_meter(self, address: str, *args: object) -> None:
@@ -1380,31 +3738,30 @@ class PythonAudioServer:
             print(f"❌ Error toggling clock printing: {exc}")
 
     def osc_load_buffer(self, address: str, *args: object) -> None:
-        """Load audio buffer - /load_buffer [buffer_id, file_path, stem_name]."""
+        """Load audio buffer - /load_buffer [buffer_id, file_path, stem_name, residency].
+
+        The decode runs on the loader pool; the previous buffer under the same id
+        keeps playing until the new one is ready. /play_stem waits for it.
+        ``residency`` (auto|resident|streamed) overrides ``--residency`` for this buffer.
+        """
         try:
             buffer_id = int(args[0])
             file_path = Path(str(args[1]))
             stem_name = str(args[2]) if len(args) > 2 else file_path.stem
-
-            if buffer_id in self.buffers:
-                print(f"Freed buffer {buffer_id}")
-                del self.buffers[buffer_id]
-
-            if buffer_id in self.active_players:
-                self.active_players[buffer_id].playing = False
-                del self.active_players[buffer_id]
+            residency = str(args[3]).strip().lower() if len(args) > 3 else None
+            if residency is not None and residency not in RESIDENCY_POLICIES:
+                raise ValueError(f"Unknown residency '{residency}' (expected {'|'.join(RESIDENCY_POLICIES)})")
 
             if not file_path.exists():
                 print(f"❌ Cannot load buffer {buffer_id}: file does not exist")
                 print(f"   Requested path: {file_path}")
                 print(f"   Absolute path: {file_path.resolve()}")
-                raise FileNotFoundError(file_path)
+                return
 
-            self.buffers[buffer_id] = AudioBuffer(file_path, buffer_id, stem_name)
-        except FileNotFoundError as exc:
-            print(f"❌ File not found for buffer {buffer_id}: {exc}")
+            self._submit_load(buffer_id, file_path, stem_name, residency=residency)
+            print(f"⏳ Loading buffer {buffer_id} in background ({file_path.name})")
         except Exception as exc:  # pragma: no cover - runtime diagnostic
-            print(f"❌ Error loading buffer {buffer_id}: {exc}")
+            print(f"❌ Error loading buffer: {exc}")
             import traceback
             traceback.print_exc()
 
@@ -1417,6 +3774,13 @@ class PythonAudioServer:
             loop = bool(int(args[3])) if len(args) > 3 else True
             start_pos = float(args[4]) if len(args) > 4 else 0.0
 
+            if self._in_bundle():
+                # Start together with the rest of the bundle, at its frame
+                self._schedule_play(self._now(), buffer_id, rate, volume, loop, start_pos,
+                                    label=f"/play_stem {buffer_id}")
+                return
+
+            self._wait_for_pending_load(buffer_id)
             if buffer_id not in self.buffers:
                 print(f"❌ Buffer {buffer_id} not loaded")
                 return
@@ -1432,6 +3796,8 @@ class PythonAudioServer:
             player = StemPlayer(buffer, rate, volume, start_pos, loop)
             player.playing = True
             self.active_players[buffer_id] = player
+            self._enforce_buffer_budget()
+            self._ensure_tempo_variants(buffer)
 
             # Log actual deck start time and A↔B delta
             deck_lbl = self._deck_label_from_buffer_id(buffer_id)
@@ -1453,43 +3819,114 @@ class PythonAudioServer:
         """Stop stem playback."""
         try:
             buffer_id = int(args[0])
-            if buffer_id in self.active_players:
-                self.active_players[buffer_id].playing = False
-                del self.active_players[buffer_id]
-                print(f"⏹️  Stopped {buffer_id}")
+            if self._in_bundle():
+                self._schedule_at(self._now(), lambda: self._stop_player(buffer_id))
+            else:
+                self._stop_player(buffer_id)
         except Exception as exc:  # pragma: no cover - runtime diagnostic
             print(f"❌ Error stopping stem: {exc}")
 
+    def _stop_player(self, buffer_id: int) -> None:
+        player = self.active_players.pop(buffer_id, None)
+        if player is not None:
+            player.playing = False
+            print(f"⏹️  Stopped {buffer_id}")
+
     def osc_stem_volume(self, address: str, *args: object) -> None:
         """Set stem volume."""
         try:
             buffer_id = int(args[0])
             volume = float(args[1])
-            if buffer_id in self.active_players:
-                self.active_players[buffer_id].volume = volume
+            # In a bundle the player may be started by an earlier message of the same bundle
+            if buffer_id in self.active_players or self._in_bundle():
+                self._set_param((buffer_id, "volume"), volume)
         except Exception as exc:  # pragma: no cover - runtime diagnostic
             print(f"❌ Error setting volume: {exc}")
 
     def osc_crossfade_levels(self, address: str, *args: object) -> None:
         """Set crossfade levels - /crossfade_levels [deck_a_vol, deck_b_vol]."""
         try:
-            self.deck_a_volume = float(args[0])
-            self.deck_b_volume = float(args[1])
-            print(f"🎚️  A:{self.deck_a_volume:.2f} B:{self.deck_b_volume:.2f}")
+            a, b = float(args[0]), float(args[1])
+            self._set_param(("A", "volume"), a)
+            self._set_param(("B", "volume"), b)
+            print(f"🎚️  A:{a:.2f} B:{b:.2f}")
         except Exception as exc:  # pragma: no cover - runtime diagnostic
             print(f"❌ Error setting crossfade: {exc}")
 
-    def osc_get_status(self, address: str, *args: object) -> None:
-        """Log server status to stdout."""
+    def osc_get_status(self, client_address: Optional[Tuple[str, int]], address: str, *args: object) -> None:
+        """Log server status to stdout and reply ``/status name value ...`` (metrics) to the sender."""
         try:
             print("=== PYTHON AUDIO SERVER ===")
             print(f"Sample Rate: {self.sample_rate} Hz")
             print(f"Tempo: {self.clock.bpm:.1f} BPM")
             print(f"Beat Position: {self.clock.beat_position():.2f}")
             print(f"Buffers loaded: {len(self.buffers)}")
+            mem = self.buffers.stats()
+            budget = f"{mem['budget_mb']:.0f} MB" if mem['budget_mb'] else "unlimited"
+            print(f"Buffer memory: {mem['resident_mb']:.1f} MB resident as {self.sample_format} (budget {budget}), "
+                  f"{mem['resident']} resident / {mem['evicted']} evicted / {mem['streamed']} streamed, "
+                  f"{mem['evictions']} evictions, {mem['reloads']} reloads")
             active = len([p for p in self.active_players.values() if p.playing])
             print(f"Active players: {active}")
             print(f"Decks → A:{self.deck_a_volume:.2f} B:{self.deck_b_volume:.2f} C:{self.deck_c_volume:.2f} D:{self.deck_d_volume:.2f}")
+            print(f"Output: {self.output_mode} (underruns={self.output_underrun_count}, overruns={self.output_overrun_count})")
+            if self.audio_cache is not None:
+                print(f"Audio cache: {self.audio_cache.hits} hits, {self.audio_cache.misses} misses")
+            if self._pending_loads:
+                print(f"Loading: buffers {sorted(self._pending_loads)}")
+            if self._last_load_ms:
+                print("Last cue load: " + " ".join(f"{d}:{ms:.0f}ms" for d, ms in sorted(self._last_load_ms.items())))
+            sched = self._scheduler.stats()
+            print(f"Scheduler: {sched['applied']} events, {sched['pending']} pending, "
+                  f"{sched['late']} late (mean {sched['mean_late_ms']:.2f} ms, max {sched['max_late_ms']:.2f} ms)")
+            streamed = [b for b in self.buffers.values() if b.streamed]
+            if streamed:
+                rd = get_reader().stats()
+                print(f"Streaming: {len(streamed)} buffers, {rd['streams']} open streams, "
+                      f"{rd['underruns']} underruns, min read-ahead {rd['min_buffered_ms']:.0f} ms")
+            if self._gc is not None:
+                rt = self._gc.stats()
+                print(f"Real-time: mixer thread {self._rt_status.get('thread', 'pending')}, memory "
+                      f"{self._rt_status.get('memory', '?')}, {rt['frozen']} objects frozen, "
+                      f"{rt['full_collections']} idle / {rt['young_collections']} young collections "
+                      f"(max pause {rt['max_pause_ms']:.2f} ms)")
+            if self._ladder is not None:
+                rungs = ", ".join(f"{name} {prev}→{self._rung_value(name)}" for name, prev in self._degraded) or "full quality"
+                print(f"Degradation: level {len(self._degraded)}/{len(self._ladder.steps)} ({rungs}), "
+                      f"{self._ladder.transitions} transitions")
+            if self.pcm_store is not None:
+                shm = self.pcm_store.stats()
+                print(f"Shared memory: {shm['segments']} segments ({shm['mb']:.1f} MB), "
+                      f"{shm['attached']} attached, {shm['published']} published")
+            if self.progressive_head_sec > 0:
+                rd = get_reader().stats()
+                print(f"Progressive loads: {rd['decoding']} decoding, {rd['decodes_finished']} finished, "
+                      f"{rd['decode_starved']} chunks played silent ahead of the decoder")
+            print(f"OSC bundles: {self._bundles_received} timed, {self._bundles_late} arrived after their timetag")
+            if hasattr(self.osc_server, "stats"):
+                rx = self.osc_server.stats()
+                print(f"OSC receiver: {rx['mode']}, {rx['received']} datagrams in {rx['wakeups']} wakeups "
+                      f"(mean batch {rx['mean_batch']:.1f}, max {rx['max_batch']}), "
+                      f"SO_RCVBUF {rx['rcvbuf_bytes'] // 1024} KiB")
+            ctl = self._control.stats()
+            print(f"Control: {ctl['received']} received, {ctl['applied']} applied "
+                  f"({ctl['coalesced']} coalesced, {ctl['pending']} pending)")
+            if self._tempo_variants is not None:
+                tv = self._tempo_variants.stats()
+                print(f"Tempo variants: {tv['variants']} ({tv['resident_mb']:.0f}/{tv['budget_mb']:.0f} MB), "
+                      f"{tv['pending']} rendering, {tv['evicted']} evicted")
+            snap = self.metrics.snapshot()
+            print(f"Loop time (recent): p50 {snap['loop_recent_p50_ms']:.2f} ms, p95 {snap['loop_recent_p95_ms']:.2f} ms, "
+                  f"p99 {snap['loop_recent_p99_ms']:.2f} ms, max {snap['loop_recent_max_ms']:.2f} ms "
+                  f"(since start: p99 {snap['loop_p99_ms']:.2f} ms, max {snap['loop_max_ms']:.2f} ms)")
+            rates = sorted(((k.split(":", 1)[1], v) for k, v in snap.items()
+                            if k.startswith("osc_messages_per_second:") and v > 0), key=lambda kv: -kv[1])
+            if rates:
+                print("OSC msg/s: " + ", ".join(f"{addr} {rate:.0f}" for addr, rate in rates[:8]))
+            reply = []
+            for name, value in snap.items():
+                reply += [name, value]
+            self._send_reply(client_address, "/status", *reply)
         except Exception as exc:  # pragma: no cover - runtime diagnostic
             print(f"❌ Error getting status: {exc}")
 
@@ -1504,6 +3941,11 @@ class PythonAudioServer:
             for player in self.active_players.values():
                 player.playing = False
             self.active_players.clear()
+            for buf in self.buffers.values():
+                buf.cancel_decode()
+                buf.discard_shared()
+                if self._tempo_variants is not None:
+                    self._tempo_variants.discard(buf.variant_key)
             self.buffers.clear()
             print("🧹 Cleaned")
         except Exception as exc:  # pragma: no cover - runtime diagnostic
@@ -1513,6 +3955,16 @@ class PythonAudioServer:
         """Adjust tempo of the internal clock - /set_tempo [bpm]."""
         try:
             bpm = float(args[0])
+            if self._in_bundle():
+                self._schedule_at(self._now(), lambda: self._set_tempo(bpm))
+            else:
+                self._set_tempo(bpm)
+        except Exception as exc:  # pragma: no cover - runtime diagnostic
+            print(f"❌ Error setting tempo: {exc}")
+
+    def _set_tempo(self, bpm: float) -> None:
+        """Apply a tempo change (on the audio thread when sent in a timed bundle)."""
+        try:
             self.clock.bpm = bpm
             self.current_bpm = bpm
             self.target_bpm = bpm
@@ -1614,6 +4066,8 @@ class PythonAudioServer:
     def start(self) -> Optional[threading.Thread]:
         """Start the audio and OSC servers."""
         if self.stream and self.osc_server:
+            if self.output_mode == "callback" and not self._wait_for_prefill():
+                print("⚠️  Output ring not prefilled in time; starting stream anyway")
             self.stream.start_stream()
             latency_ms = (self.chunk_size / self.sample_rate) * 1000
             print("🎛️💾 PYTHON AUDIO SERVER READY 💾🎛️")
@@ -1629,14 +4083,163 @@ class PythonAudioServer:
                 target=self.osc_server.serve_forever, daemon=True
             )
             server_thread.start()
+            if self.realtime:
+                self.enter_realtime()
+            if self.metrics_port:
+                try:
+                    self._metrics_http = serve_metrics(self.metrics, self.metrics_port)
+                    print(f"📈 Metrics: http://0.0.0.0:{self.metrics_port}/metrics")
+                except OSError as exc:
+                    print(f"⚠️  Could not serve metrics on port {self.metrics_port}: {exc}")
+            if self.state_file is not None:
+                threading.Thread(target=self._state_saver, daemon=True, name="state-saver").start()
+                print(f"💾 Snapshotting state to {self.state_file} every {self.state_interval_s:.0f}s")
             return server_thread
 
         print("❌ Failed to initialize audio server")
         return None
 
+    def enter_realtime(self) -> None:
+        """Freeze the heap, hand GC to the mixer, lock memory and promote the mixer thread.
+
+        Call once startup loads are done; ``start()`` does it when ``realtime`` is set.
+        """
+        if self._gc is None:
+            self._gc = GCController()
+        frozen = self._gc.freeze()
+        self._gc.start()
+        self._rt_status["memory"] = lock_memory()
+        self._rt_promote = True
+        print(f"🧊 Real-time mode: {frozen} objects frozen, automatic GC off (collected on idle mixer ticks)")
+        print(f"🔒 Memory: {self._rt_status['memory']}")
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Deck/player state as a JSON-serializable dict (positions in buffer frames)."""
+        buffers = [
+            {"buffer_id": bid, "path": buf.file_path, "name": buf.name, "residency": buf.residency,
+             "frames": buf.frames}
+            for bid, buf in list(self.buffers.items())
+        ]
+        players = []
+        for bid, player in list(self.active_players.items()):
+            ratio = player.variant_ratio or 1.0
+            players.append({
+                "buffer_id": bid,
+                "position": (player.position + player._frac) / ratio,
+                "rate": player.rate,
+                "volume": player.volume,
+                "loop": player.loop,
+                "playing": player.playing,
+                "interpolation": player.interpolation,
+            })
+        return {
+            "saved_at": time.time(),
+            "bpm": self.clock.bpm,
+            "master_volume": self.master_volume,
+            "deck_volumes": {d: self._deck_volume_get_set(d) for d in "ABCD"},
+            "eq": {d: {band: float(getattr(self._filters[d], f"{band}_gain")) for band in MultiDeckEQ.BANDS}
+                   for d in "ABCD"},
+            "buffers": buffers,
+            "players": players,
+            "armed": dict(self._armed),
+        }
+
+    def save_state(self) -> None:
+        """Write ``snapshot_state()`` to ``state_file`` atomically."""
+        if self.state_file is None:
+            return
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.snapshot_state(), indent=1))
+            os.replace(tmp, self.state_file)
+        except Exception as exc:  # pragma: no cover - runtime diagnostic
+            print(f"⚠️  Could not save state to {self.state_file}: {exc}")
+
+    def _state_saver(self) -> None:
+        while self.running:
+            self.save_state()
+            time.sleep(self.state_interval_s)
+
+    def restore_state(self, max_age_s: float = 600.0) -> bool:
+        """Reload the buffers and players of ``state_file`` (call before ``start()``).
+
+        Buffers still in shared memory are attached rather than decoded. Players
+        that were playing resume where they would be now, as if the set had kept
+        running through the restart. Snapshots older than ``max_age_s`` are ignored.
+        """
+        if self.state_file is None:
+            return False
+        t_start = time.perf_counter()
+        try:
+            state = json.loads(self.state_file.read_text())
+        except (OSError, ValueError) as exc:
+            print(f"ℹ️  No state to resume from {self.state_file}: {exc}")
+            return False
+        age = time.time() - float(state.get("saved_at", 0.0))
+        if age > max_age_s:
+            print(f"ℹ️  State in {self.state_file} is {age:.0f}s old; not resuming")
+            return False
+
+        # Positions advance by the time since the snapshot (including the restart)
+        elapsed = time.time() - float(state.get("saved_at", time.time()))
+        players = {int(p["buffer_id"]): p for p in state.get("players", [])}
+        positions: Dict[int, float] = {}
+        for bid, p in players.items():
+            position = float(p.get("position", 0.0))
+            if p.get("playing"):
+                position += elapsed * self.sample_rate * float(p.get("rate", 1.0))
+            positions[bid] = position
+        futures = []
+        for entry in state.get("buffers", []):
+            bid = int(entry["buffer_id"])
+            frames = int(entry.get("frames") or 0)
+            # Progressive loads decode from where the player resumes
+            start_pos = (positions.get(bid, 0.0) % frames) / frames if frames else 0.0
+            futures.append(self._submit_load(bid, entry["path"], entry.get("name", ""),
+                                             residency=entry.get("residency"), start_pos=start_pos))
+        for future in futures:
+            try:
+                future.result(timeout=30.0)
+            except Exception as exc:  # pragma: no cover - runtime diagnostic
+                print(f"❌ Error restoring buffer: {exc}")
+
+        if state.get("bpm"):
+            self._set_tempo(float(state["bpm"]))
+        self.master_volume = float(state.get("master_volume", self.master_volume))
+        for deck, vol in state.get("deck_volumes", {}).items():
+            self._control.post((deck, "volume"), float(vol))
+        for deck, gains in state.get("eq", {}).items():
+            for band, gain in gains.items():
+                self._control.post((deck, band), float(gain))
+
+        restored = 0
+        for bid, p in players.items():
+            buf = self.buffers.get(bid)
+            if buf is None or not buf.loaded:
+                continue
+            player = StemPlayer(buf, float(p.get("rate", 1.0)), float(p.get("volume", 0.8)),
+                                0.0, bool(p.get("loop", True)), p.get("interpolation", self.interpolation))
+            player.seek(int(positions[bid]))
+            player.playing = bool(p.get("playing"))
+            self.active_players[bid] = player
+            restored += 1
+        self._armed.update({d: int(b) for d, b in state.get("armed", {}).items() if int(b) in self.buffers})
+        self._enforce_buffer_budget()
+
+        if self.pcm_store is not None:
+            keep = [ident[2] for ident in (self.pcm_store.identify(b.file_path) for b in self.buffers.values())
+                    if ident is not None]
+            self.pcm_store.prune(keep)
+        print(f"♻️  Resumed {len(self.buffers)} buffers, {restored} players from {self.state_file} "
+              f"in {(time.perf_counter() - t_start) * 1000:.0f} ms (snapshot {age:.1f}s old)")
+        return True
+
     def stop(self) -> None:
         """Stop the audio server and release resources."""
+        self.save_state()
         self.running = False
+        self._ring_space.set()  # wake a mixer waiting for ring space
 
         if self.stream:
             try:
@@ -1647,6 +4250,15 @@ class PythonAudioServer:
 
         if self.osc_server:
             self.osc_server.shutdown()
+        if self._metrics_http is not None:
+            self._metrics_http.shutdown()
+            self._metrics_http.server_close()
+
+        self._loader_pool.shutdown(wait=False, cancel_futures=True)
+        if self._gc is not None:
+            self._gc.stop()
+        if self._tempo_variants is not None:
+            self._tempo_variants.shutdown()
 
         if self.pa:
             self.pa.terminate()
@@ -1662,6 +4274,74 @@ def main() -> None:
     parser.add_argument("--port", type=int, default=57120, help="OSC port (default: 57120)")
     parser.add_argument("--device", type=int, help="Audio device ID")
     parser.add_argument("--buffer-size", type=int, default=1024, help="Audio buffer size in frames (default: 1024 for Raspberry Pi). Lower=less latency, higher=more stable. Try 512/1024/2048.")
+    parser.add_argument("--output-mode", type=str, default="blocking", choices=["blocking", "callback"],
+                        help="Audio output backend: blocking (mixer writes to the device) or callback "
+                             "(mixer renders ahead into a ring buffer, device callback only copies)")
+    parser.add_argument("--prefill-chunks", type=int, default=3,
+                        help="Callback mode: chunks rendered ahead in the output ring (default: 3). "
+                             "Higher=more tolerant of mixer hiccups, more latency.")
+    parser.add_argument("--interpolation", type=str, default="linear", choices=["linear", "cubic"],
+                        help="Player resampling at non-unity rates (playback_rate method): linear (cheaper) "
+                             "or cubic (4-point, less aliasing)")
+    parser.add_argument("--audio-cache", action="store_true",
+                        help=f"Cache decoded audio on disk and memory-map it on reload (default dir: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--audio-cache-dir", type=Path,
+                        help="Decoded audio cache directory (implies --audio-cache). "
+                             "Pre-warm with: python audio_cache.py warm track_data_*.csv")
+    parser.add_argument("--loader-workers", type=int, default=2,
+                        help="Background threads decoding /cue and /load_buffer requests (default: 2)")
+    parser.add_argument("--mix-engine", type=str, default="matrix", choices=["matrix", "loop"],
+                        help="Player mixing: matrix (all players in one batched gather + routing matrix, "
+                             "default) or loop (one render call per player)")
+    parser.add_argument("--osc-receiver", type=str, default="threading", choices=list(RECEIVER_MODES),
+                        help="OSC receive loop: threading (thread per message, default), blocking or asyncio "
+                             "(one thread draining the socket in batches)")
+    parser.add_argument("--osc-rcvbuf-kb", type=int, default=4096,
+                        help="Requested OSC socket receive buffer in KiB (default: 4096; capped by net.core.rmem_max)")
+    parser.add_argument("--residency", type=str, default="auto", choices=list(RESIDENCY_POLICIES),
+                        help="Buffer residency: resident (decode into RAM), streamed (read from disk with "
+                             "read-ahead) or auto (stream files above --stream-above-mb; default)")
+    parser.add_argument("--stream-above-mb", type=float, default=0.0,
+                        help="With --residency auto, stream files whose decoded size exceeds this many MB "
+                             "(default: 0 = all resident)")
+    parser.add_argument("--sample-format", type=str, default="float32", choices=list(SAMPLE_FORMATS),
+                        help="Storage of decoded audio: float32 (default), int16 (half the memory, lossless for "
+                             "16-bit sources) or float16")
+    parser.add_argument("--progressive-head-sec", type=float, default=0.0,
+                        help="Make resident buffers playable after decoding this many seconds from the cue point; "
+                             "the rest decodes in the background (default: 0 = decode whole files first)")
+    parser.add_argument("--shm-store", action="store_true",
+                        help="Keep decoded audio in shared memory so a restarted server attaches it instead of "
+                             "decoding (clear with: python shm_store.py clear)")
+    parser.add_argument("--state-file", type=Path, default=None,
+                        help=f"Snapshot deck/player state every second (with --resume, default: {DEFAULT_STATE_FILE})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reload buffers and players from --state-file at startup, positions advanced by the "
+                             "time since the snapshot")
+    parser.add_argument("--degrade-ladder", type=str, default="",
+                        help="Comma-separated rungs to give up, in order, while the audio loop runs over budget "
+                             f"(from: {','.join(_DegradationLadder.STEPS)}; default: off). "
+                             "Example: --degrade-ladder interpolation,filters,stretch,chunk")
+    parser.add_argument("--degrade-high", type=float, default=0.8,
+                        help="Step down when mean loop time exceeds this fraction of the chunk budget (default: 0.8)")
+    parser.add_argument("--degrade-low", type=float, default=0.5,
+                        help="Step back up once mean loop time stays under this fraction (default: 0.5)")
+    parser.add_argument("--notify", type=str, action="append", default=[], metavar="HOST:PORT",
+                        help="Send server events (/degrade) to this OSC address; repeatable. "
+                             "Clients can also register with /subscribe")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Real-time mode: freeze the GC heap after startup, collect only on idle mixer ticks, "
+                             "SCHED_FIFO (or high nice) mixer thread and mlockall, each when permitted")
+    parser.add_argument("--rt-priority", type=int, default=DEFAULT_FIFO_PRIORITY,
+                        help=f"SCHED_FIFO priority of the mixer thread with --realtime (default: {DEFAULT_FIFO_PRIORITY})")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="Serve engine metrics in Prometheus text format at http://0.0.0.0:PORT/metrics "
+                             "(default: 0 = off; /get_status always replies with /status)")
+    parser.add_argument("--buffer-budget-mb", type=float, default=0.0,
+                        help="Resident decoded audio budget in MB; idle buffers are evicted LRU-first above it "
+                             "and reloaded on next use (default: 0 = unlimited)")
+    parser.add_argument("--debug-alloc", action="store_true",
+                        help="Debug: count heap bytes allocated per audio loop iteration (tracemalloc, adds overhead)")
     def _detect_mac_model() -> Optional[str]:  # type: ignore
         """Detect Mac model (M1, M2, M2 Pro, etc.)"""
         if platform.system() != 'Darwin':  # macOS
@@ -1761,10 +4441,15 @@ def main() -> None:
     parser.add_argument("--bpm", type=float, default=120.0, help="Initial tempo in BPM")
     parser.add_argument("--disable-time-stretch", action="store_true", help="Disable BPM control entirely")
     parser.add_argument("--stretch-method", type=str, default="playback_rate",
-                       choices=["playback_rate", "pyrubberband", "audiotsm"],
+                       choices=["playback_rate", "pyrubberband", "audiotsm", "phase_vocoder", "prerendered"],
                        help="BPM control method: playback_rate (fast, pitch changes), "
                             "pyrubberband (quality, preserves pitch), "
-                            "audiotsm (fast WSOLA)")
+                            "audiotsm (fast WSOLA), "
+                            "phase_vocoder (in-process NumPy, preserves pitch), "
+                            "prerendered (background-rendered tempo variants at the bpm_config steps)")
+    parser.add_argument("--variant-budget-mb", type=float, default=None,
+                       help="Memory budget for pre-rendered tempo variants (default: bpm_config "
+                            "tempo_variants.memory_budget_mb or 512)")
     parser.add_argument("--a", type=str, help="Path to audio file for Deck A (buffer 100)")
     parser.add_argument("--b", type=str, help="Path to audio file for Deck B (buffer 1100)")
     parser.add_argument("--rate", type=float, default=1.0, help="Playback rate for autoplay")
@@ -1806,6 +4491,29 @@ def main() -> None:
         use_optimized_filters=args.optimized_filters,
         enable_time_stretch=not args.disable_time_stretch,
         bpm_config_path=args.bpm_config,
+        output_mode=args.output_mode,
+        prefill_chunks=args.prefill_chunks,
+        debug_alloc=args.debug_alloc,
+        interpolation=args.interpolation,
+        audio_cache_dir=args.audio_cache_dir or (DEFAULT_CACHE_DIR if args.audio_cache else None),
+        loader_workers=args.loader_workers,
+        mix_engine=args.mix_engine,
+        osc_receiver=args.osc_receiver,
+        osc_rcvbuf_kb=args.osc_rcvbuf_kb,
+        residency=args.residency,
+        stream_above_mb=args.stream_above_mb,
+        buffer_budget_mb=args.buffer_budget_mb,
+        sample_format=args.sample_format,
+        progressive_head_sec=args.progressive_head_sec,
+        shm_store=args.shm_store,
+        state_file=args.state_file or (DEFAULT_STATE_FILE if args.resume else None),
+        degrade_steps=tuple(st.strip() for st in args.degrade_ladder.split(",") if st.strip()),
+        degrade_high=args.degrade_high,
+        degrade_low=args.degrade_low,
+        notify=tuple((host, int(port)) for host, port in (n.rsplit(":", 1) for n in args.notify)),
+        realtime=args.realtime,
+        rt_priority=args.rt_priority,
+        metrics_port=args.metrics_port,
     )
     server.clock.bpm = args.bpm
     server.base_bpm = args.bpm
@@ -1823,9 +4531,18 @@ def main() -> None:
         print("⚠️  audiotsm not available, falling back to playback_rate")
         stretch_method = "playback_rate"
     server.stretch_method = stretch_method
+    if args.variant_budget_mb is not None:
+        server.tempo_variant_budget_mb = args.variant_budget_mb
     print(f"🎛️  BPM control method: {server.stretch_method}")
     server.print_clock = bool(args.watch)
     server.meter_beats = int(args.meter) if args.meter and args.meter > 0 else 4
+    if args.resume:
+        server.restore_state()
+    elif server.pcm_store is not None:
+        # Segments left by an earlier run that isn't being resumed
+        removed = server.pcm_store.prune([])
+        if removed:
+            print(f"🧹 Unlinked {removed} stale shared memory segments")
     server_thread = server.start()
 
     # Optionally simulate an incoming OSC message after a delay
@@ -1880,11 +4597,9 @@ def main() -> None:
                 if args.c_at is not None:
                     # Start after N seconds from now
                     start_after = float(args.c_at)
-                    def _start_c():
-                        server.osc_play_stem("", 2100, args.rate, args.vol, 1, 0.0)
-                        print("▶️  DeckC autoplay now")
                     print(f"🗓️  DeckC scheduled in +{start_after:.3f}s (relative)")
-                    threading.Timer(start_after, _start_c).start()
+                    server._schedule_play(server._now() + start_after, 2100, args.rate, args.vol,
+                                          label="DeckC autoplay")
                 else:
                     print("ℹ️  DeckC loaded (not started); use /schedule_c_at X to start at absolute time.")
             except Exception as exc:
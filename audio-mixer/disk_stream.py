@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""Streaming playback from disk for long tracks.
+
+A resident :class:`AudioBuffer` holds the whole decoded track as float32 stereo
+(about 10 MB per minute at 44.1 kHz). A *streamed* buffer only keeps the file's
+metadata; every player reading it owns a :class:`DiskStream`, a ring of a few
+seconds of decoded frames that one shared read-ahead thread keeps filled from
+``soundfile`` in blocks.
+
+The ring is single producer / single consumer like ``_AudioRingBuffer``: the
+read-ahead thread only advances the write counter, the audio thread only the
+read counter. Seeks (cue points, loop changes) and frames skipped after an
+underrun are requested through monotonic counters the reader catches up with,
+so the audio thread never waits for the disk: a chunk that is not buffered
+yet plays as silence and is counted as an underrun.
+
+Streaming reads the file at its native rate, so only files already at the
+engine rate (44.1 kHz) can be streamed; others stay resident.
+
+The same thread also runs :class:`ProgressiveDecode`: a resident buffer whose
+first seconds (from the cue point) were decoded up front, with the rest decoded
+block by block into its preallocated array while it already plays.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from audio_cache import ENGINE_SAMPLE_RATE, to_sample_format
+
+RESIDENCY_POLICIES = ("auto", "resident", "streamed")
+RING_SECONDS = 3.0
+BLOCK_FRAMES = 8192
+PRIME_FRAMES = 16384
+
+
+def stream_info(path: str | Path) -> Tuple[int, int]:
+    """``(frames, sample_rate)`` of ``path`` without decoding it."""
+    info = sf.info(str(path))
+    return info.frames, info.samplerate
+
+
+def decoded_size_mb(path: str | Path) -> float:
+    """Size of ``path`` decoded to engine-format PCM (float32 stereo @ 44.1 kHz)."""
+    info = sf.info(str(path))
+    frames = info.frames * ENGINE_SAMPLE_RATE / max(1, info.samplerate)
+    return frames * 2 * 4 / (1024 * 1024)
+
+
+def choose_residency(path: str | Path, policy: str = "auto", stream_above_mb: float = 0.0) -> str:
+    """``resident`` or ``streamed`` for ``path`` under ``policy``.
+
+    ``auto`` streams files whose decoded size exceeds ``stream_above_mb``
+    (0 = never). Files that can't be streamed (not 44.1 kHz, unreadable
+    metadata) are always resident.
+    """
+    if policy not in RESIDENCY_POLICIES:
+        raise ValueError(f"Unknown residency '{policy}' (expected {'|'.join(RESIDENCY_POLICIES)})")
+    if policy == "resident" or (policy == "auto" and stream_above_mb <= 0):
+        return "resident"
+    try:
+        with sf.SoundFile(str(path)) as f:
+            if f.samplerate != ENGINE_SAMPLE_RATE or not f.seekable():
+                return "resident"
+        if policy == "auto" and decoded_size_mb(path) <= stream_above_mb:
+            return "resident"
+    except Exception:
+        return "resident"
+    return "streamed"
+
+
+class DiskStream:
+    """Per-player ring of decoded frames, filled from disk by the read-ahead thread.
+
+    Consumer side (audio thread): :meth:`peek` copies buffered frames starting
+    one frame before :attr:`position` (history for cubic interpolation),
+    :meth:`consume` advances, :meth:`seek` and :meth:`set_loop` reposition.
+    :attr:`position` is the file frame of the next frame to play.
+    """
+
+    HISTORY = 1
+
+    def __init__(self, path: str | Path, start_frame: int = 0, loop: bool = True,
+                 ring_seconds: float = RING_SECONDS, block_frames: int = BLOCK_FRAMES,
+                 reader: Optional["ReadAheadThread"] = None):
+        self.path = str(path)
+        self._file = sf.SoundFile(self.path)
+        self.frames = self._file.frames
+        self._file_channels = self._file.channels
+        self.block_frames = max(256, int(block_frames))
+        self.capacity = max(2 * self.block_frames, int(ring_seconds * ENGINE_SAMPLE_RATE))
+        self._data = np.zeros((self.capacity, 2), dtype=np.float32)
+        self._block = np.zeros((self.block_frames, self._file_channels), dtype=np.float32)
+        self._write = 0   # ring frames written (reader)
+        self._read = 0    # ring frames consumed (audio thread)
+        self._has_history = False
+
+        # Play region; the reader wraps at loop_end when looping
+        self.loop = bool(loop)
+        self.loop_start = 0
+        self.loop_end = self.frames
+        self.position = self._wrap(max(0, int(start_frame)))
+
+        # Requests from the audio thread, caught up with by the reader; the
+        # initial fill is a seek to the start frame
+        self._seek_to = self.position
+        self._seek_requested = 1
+        self._seek_done = 0
+        self._seek_skip_base = 0
+        self._skip_requested = 0
+        self._skip_done = 0
+        self._file_pos = self.position  # reader: next file frame to read
+
+        self.underruns = 0
+        self.frames_read = 0
+        self._closed = False
+
+        # Have the first chunks buffered before the player starts
+        self.service(PRIME_FRAMES)
+        self._reader = reader or get_reader()
+        self._reader.register(self)
+
+    # --- shared helpers -------------------------------------------------
+    def _wrap(self, pos: int) -> int:
+        """Map an advanced frame position back into the loop region."""
+        if self.loop and pos >= self.loop_end:
+            span = max(1, self.loop_end - self.loop_start)
+            pos = self.loop_start + (pos - self.loop_start) % span
+        return pos
+
+    @property
+    def seeking(self) -> bool:
+        return self._seek_done != self._seek_requested
+
+    @property
+    def available(self) -> int:
+        """Frames buffered ahead of :attr:`position`."""
+        return 0 if self.seeking else self._write - self._read
+
+    # --- consumer (audio thread) -----------------------------------------
+    def peek(self, out: np.ndarray) -> int:
+        """Copy frames ``position - 1 ..`` into ``out``; returns how many are valid.
+
+        ``out[0]`` is the history frame (the first buffered frame again right
+        after a seek). Returns 0 while a seek is pending.
+        """
+        if self.seeking:
+            return 0
+        r = self._read
+        n = min(out.shape[0] - self.HISTORY, self._write - r)
+        if n <= 0:
+            return 0
+        cap = self._data.shape[0]
+        start = r % cap
+        first = min(n, cap - start)
+        out[1:1 + first] = self._data[start:start + first]
+        if n > first:
+            out[1 + first:1 + n] = self._data[:n - first]
+        out[0] = self._data[(r - 1) % cap] if self._has_history else out[1]
+        return n + self.HISTORY
+
+    def consume(self, frames: int) -> None:
+        """Advance :attr:`position` by ``frames``; frames not buffered yet are skipped."""
+        frames = int(frames)
+        if frames <= 0:
+            return
+        have = self.available
+        if frames > have:
+            # Playback outran the reader: keep the timeline, drop what is missing
+            self.underruns += 1
+            if not self.seeking:
+                self._read += have
+            self._skip_requested += frames - have
+            self._has_history = False
+        else:
+            self._read += frames
+            self._has_history = True
+        self.position = self._wrap(self.position + frames)
+        if self._write - self._read < self.capacity // 2:
+            self._reader.wake()
+
+    def seek(self, frame: int) -> None:
+        """Continue playback from file frame ``frame`` (cue point)."""
+        self.position = self._wrap(max(0, int(frame)))
+        self._has_history = False
+        self._seek_to = self.position
+        self._seek_skip_base = self._skip_requested
+        self._seek_requested += 1
+        self._reader.wake()
+
+    def set_loop(self, loop: bool, start: Optional[int] = None, end: Optional[int] = None) -> None:
+        """Loop the whole file, or the region ``[start, end)`` frames; re-reads from the current position."""
+        self.loop = bool(loop)
+        self.loop_start = max(0, min(int(start or 0), self.frames - 1))
+        self.loop_end = self.frames if end is None else max(self.loop_start + 1, min(int(end), self.frames))
+        self.seek(self.position)
+
+    # --- producer (read-ahead thread) ------------------------------------
+    def service(self, limit: Optional[int] = None) -> int:
+        """Read blocks into the ring until it is full (or ``limit`` frames); returns frames read."""
+        if self._closed:
+            return 0
+        if self.seeking:
+            requested = self._seek_requested
+            target = self._seek_to
+            # Frames played (as silence) while the seek was pending
+            skipped = self._skip_requested
+            self._restart_at(self._advance_file(target, skipped - self._seek_skip_base))
+            self._skip_done = skipped
+            self._seek_done = requested
+        total = 0
+        limit = self.capacity if limit is None else int(limit)
+        while total < limit and not self.seeking and not self._closed:
+            skip = self._skip_requested - self._skip_done
+            if skip > 0:
+                self._file_pos = self._advance_file(self._file_pos, skip)
+                self._skip_done += skip
+                self._has_history = False
+            free = self.capacity - self.HISTORY - (self._write - self._read)
+            n = min(free, self.block_frames)
+            if n < min(self.block_frames, 256):
+                break
+            n = self._read_block(n)
+            self._push(n)
+            total += n
+        self.frames_read += total
+        return total
+
+    def _restart_at(self, target: int) -> None:
+        """Empty the ring and continue reading at ``target`` (only while a seek is pending)."""
+        if target > 0 or self.loop:
+            # Re-read the frame before the target as interpolation history
+            # (the end of the loop when starting at its beginning)
+            before = target - self.HISTORY
+            self._file_pos = self.loop_end - self.HISTORY if self.loop and before < self.loop_start else before
+            self._write = self._read - self.HISTORY
+            self._push(self._read_block(self.HISTORY))
+            self._has_history = True
+        else:
+            self._file_pos = target
+            self._write = self._read
+            self._has_history = False
+
+    def _advance_file(self, pos: int, frames: int) -> int:
+        if self.loop:
+            return self._wrap(pos + frames)
+        return pos + frames
+
+    def _read_block(self, n: int) -> int:
+        """Decode up to ``n`` frames at ``_file_pos`` into ``_block``; returns frames produced."""
+        pos = self._file_pos
+        end = self.loop_end if self.loop else self.frames
+        block = self._block[:n]
+        if pos >= end:
+            if not self.loop:
+                block.fill(0.0)  # past the end of a one-shot: silence
+                self._file_pos = pos + n
+                return n
+            pos = self.loop_start
+        n = min(n, end - pos)
+        block = self._block[:n]
+        if self._file.tell() != pos:
+            self._file.seek(pos)
+        got = self._file.read(n, dtype="float32", always_2d=True, out=block)
+        n = got.shape[0]
+        if n == 0:
+            # Short file read (truncated file): treat the rest as silence
+            self._block[:1].fill(0.0)
+            n = 1
+        self._file_pos = self._advance_file(pos, n)
+        return n
+
+    def _push(self, n: int) -> None:
+        """Copy ``_block[:n]`` (any channel count) into the ring and publish it."""
+        src = self._block[:n]
+        cap = self._data.shape[0]
+        start = self._write % cap
+        first = min(n, cap - start)
+        for dst, part in ((self._data[start:start + first], src[:first]),
+                          (self._data[:n - first], src[first:n])):
+            if not len(part):
+                continue
+            if self._file_channels == 1:
+                dst[:, 0] = part[:, 0]
+                dst[:, 1] = part[:, 0]
+            else:
+                dst[:] = part[:, :2]
+        self._write += n
+
+    def close(self) -> None:
+        self._closed = True
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "buffered_ms": self.available * 1000.0 / ENGINE_SAMPLE_RATE,
+            "underruns": self.underruns,
+            "frames_read": self.frames_read,
+        }
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class ProgressiveDecode:
+    """Block-by-block decode of a whole file into a preallocated array.
+
+    ``data`` is the buffer's ``(frames, 2)`` array (float32, int16 or float16),
+    zero until decoded. :meth:`decode_range` decodes the blocks around the cue
+    point synchronously; the read-ahead thread then calls :meth:`service`, which
+    continues from there to the end of the file and wraps to the start.
+    :meth:`ready` tells the audio thread whether a frame range is decoded yet
+    and :meth:`prioritize` moves the cursor (a re-cue while still decoding).
+    """
+
+    def __init__(self, path: str | Path, data: np.ndarray, block_frames: int = BLOCK_FRAMES):
+        self.path = str(path)
+        self.data = data
+        self.frames = data.shape[0]
+        self.block_frames = max(256, int(block_frames))
+        self._file = sf.SoundFile(self.path)
+        self._file_channels = self._file.channels
+        # Read straight into the array when the file's samples are already the storage format
+        self._direct = self._file_channels == 2 and (
+            data.dtype == np.float32 or (data.dtype == np.int16 and self._file.subtype == "PCM_16"))
+        self._read_dtype = "int16" if data.dtype == np.int16 and self._file.subtype == "PCM_16" else "float32"
+        blocks = max(1, -(-self.frames // self.block_frames))
+        self._ready = np.zeros(blocks, dtype=bool)
+        self._remaining = blocks
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self.done = False
+        self.cancelled = False
+        self.starved = 0
+        self.t_start = time.perf_counter()
+        self.on_done: Optional[object] = None
+
+    def ready(self, lo: int, hi: int, loop: bool = True) -> bool:
+        """True when frames ``[lo, hi)`` are decoded (wrapping past the end when looping)."""
+        if self.done:
+            return True
+        lo = max(0, int(lo))
+        hi = int(hi)
+        if loop and hi > self.frames:
+            return self.ready(lo, self.frames, False) and self.ready(0, min(hi - self.frames, self.frames), False)
+        hi = min(hi, self.frames)
+        if hi <= lo:
+            return True
+        return bool(self._ready[lo // self.block_frames:(hi - 1) // self.block_frames + 1].all())
+
+    def prioritize(self, frame: int) -> None:
+        """Continue decoding from the block holding ``frame``."""
+        self._cursor = min(max(0, int(frame)), self.frames - 1) // self.block_frames
+
+    def decode_range(self, lo: int, hi: int) -> None:
+        """Decode every block overlapping frames ``[lo, hi)`` now; the cursor continues after them."""
+        lo = max(0, int(lo))
+        hi = min(self.frames, max(lo + 1, int(hi)))
+        first, last = lo // self.block_frames, (hi - 1) // self.block_frames
+        with self._lock:
+            for b in range(first, last + 1):
+                self._decode_block(b)
+            self._cursor = (last + 1) % len(self._ready)
+        self._check_done()
+
+    def service(self, limit: int = 4) -> bool:
+        """Decode up to ``limit`` pending blocks from the cursor; returns True while work remains."""
+        if self.done or self.cancelled:
+            return False
+        with self._lock:
+            blocks = len(self._ready)
+            b = self._cursor
+            for _ in range(blocks):
+                if limit <= 0 or not self._remaining:
+                    break
+                if not self._ready[b]:
+                    self._decode_block(b)
+                    limit -= 1
+                b = (b + 1) % blocks
+            self._cursor = b
+        return not self._check_done()
+
+    def _decode_block(self, b: int) -> None:
+        start = b * self.block_frames
+        n = min(self.block_frames, self.frames - start)
+        if self._ready[b] or n <= 0:
+            return
+        dst = self.data[start:start + n]
+        if self._file.tell() != start:
+            self._file.seek(start)
+        if self._direct:
+            got = self._file.read(n, dtype=self._read_dtype, always_2d=True, out=dst)
+        else:
+            block = self._file.read(n, dtype=self._read_dtype, always_2d=True)
+            if block.dtype != self.data.dtype:
+                block = to_sample_format(block, self.data.dtype.name)
+            got = block
+            if self._file_channels == 1:
+                dst[:len(block), 0] = block[:, 0]
+                dst[:len(block), 1] = block[:, 0]
+            else:
+                dst[:len(block)] = block[:, :2]
+        if got.shape[0] < n:
+            dst[got.shape[0]:].fill(0)  # truncated file: the rest stays silent
+        self._ready[b] = True
+        self._remaining -= 1
+
+    def _check_done(self) -> bool:
+        if self.done or self._remaining:
+            return self.done
+        self.done = True
+        self.close()
+        if self.on_done is not None:
+            self.on_done()
+        return True
+
+    def cancel(self) -> None:
+        """Stop decoding (the buffer was replaced); undecoded blocks stay silent."""
+        self.cancelled = True
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        blocks = len(self._ready)
+        return {
+            "decoded_pct": 100.0 * (blocks - self._remaining) / blocks,
+            "starved": self.starved,
+        }
+
+
+class ReadAheadThread:
+    """One daemon thread keeping every open :class:`DiskStream` ring filled.
+
+    Streams are held weakly: when a player (and its stream) is dropped the
+    reader forgets it. ``wake()`` is called by consumers whose ring dropped
+    below half; otherwise the thread polls every ``interval`` seconds.
+    Progressive decodes are held until finished; while any are pending the
+    thread decodes a few blocks of each between passes over the streams.
+    """
+
+    def __init__(self, interval: float = 0.01, decode_blocks: int = 4):
+        self.interval = interval
+        self.decode_blocks = decode_blocks
+        self._streams: "weakref.WeakSet[DiskStream]" = weakref.WeakSet()
+        self._decodes: list = []
+        self.decodes_finished = 0
+        self.decodes_starved = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="disk-read-ahead", daemon=True)
+        self._thread.start()
+
+    def register(self, stream: DiskStream) -> None:
+        with self._lock:
+            self._streams.add(stream)
+        self._wake.set()
+
+    def add_decode(self, decode: ProgressiveDecode) -> None:
+        with self._lock:
+            self._decodes.append(decode)
+        self._wake.set()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def streams(self) -> list:
+        with self._lock:
+            return list(self._streams)
+
+    def _run(self) -> None:
+        while True:
+            # Pending decodes keep the thread busy, yielding briefly between passes
+            self._wake.wait(0.0005 if self._decodes else self.interval)
+            self._wake.clear()
+            for stream in self.streams():
+                try:
+                    stream.service()
+                except Exception as exc:  # pragma: no cover - runtime diagnostic
+                    print(f"⚠️  Read-ahead failed for {Path(stream.path).name}: {exc}")
+                    stream.close()
+            for decode in list(self._decodes):
+                try:
+                    pending = decode.service(self.decode_blocks)
+                except Exception as exc:  # pragma: no cover - runtime diagnostic
+                    print(f"⚠️  Progressive decode failed for {Path(decode.path).name}: {exc}")
+                    decode.cancel()
+                    pending = False
+                if not pending:
+                    with self._lock:
+                        self._decodes.remove(decode)
+                        self.decodes_finished += 1
+                        self.decodes_starved += decode.starved
+
+    def stats(self) -> Dict[str, float]:
+        streams = self.streams()
+        with self._lock:
+            decodes = list(self._decodes)
+        return {
+            "streams": len(streams),
+            "underruns": sum(s.underruns for s in streams),
+            "min_buffered_ms": min((s.stats()["buffered_ms"] for s in streams), default=0.0),
+            "decoding": len(decodes),
+            "decodes_finished": self.decodes_finished,
+            "decode_starved": self.decodes_starved + sum(d.starved for d in decodes),
+        }
+
+
+_reader: Optional[ReadAheadThread] = None
+_reader_lock = threading.Lock()
+
+
+def get_reader() -> ReadAheadThread:
+    """The process-wide read-ahead thread (started on first use)."""
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            _reader = ReadAheadThread()
+        return _reader
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""Audio engine metrics: loop-time histogram, counters and gauges over OSC and HTTP.
+
+``MetricsRegistry`` holds the audio loop's render-time histogram and a set of
+named counters/gauges read through callbacks (underruns, scheduler lateness,
+resident buffer memory, ...), plus per-second rates of counters such as OSC
+messages per address. The audio thread only records loop times; windows and
+rates are computed when the registry is read. The server exposes it two ways:
+
+- ``/get_status`` replies to the sender with ``/status`` followed by flat
+  ``name, value`` pairs
+- ``--metrics-port`` serves ``GET /metrics`` in the Prometheus text format
+
+``LoopHistogram`` is HDR-style: log-linear buckets of 64 sub-buckets per power
+of two of microseconds, so any recorded value is reported within ~1.6%, with
+O(1) recording on the audio thread, no allocation and no lock.
+
+Usage:
+    python metrics.py --port 57120          # send /get_status and print the /status reply
+    curl -s localhost:9464/metrics          # with audio_server.py --metrics-port 9464
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SUB_BUCKETS = 64          # per power of two: 1/64 relative precision
+MAX_EXPONENT = 26         # up to ~2^33 µs (hours) before clamping
+PREFIX = "crowdstream_"
+
+
+class LoopHistogram:
+    """Log-linear histogram of durations (recorded in seconds, bucketed in µs)."""
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (2 * SUB_BUCKETS + MAX_EXPONENT * SUB_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _index(us: int) -> int:
+        if us < 2 * SUB_BUCKETS:
+            return us
+        shift = min(us.bit_length() - 7, MAX_EXPONENT)
+        return 2 * SUB_BUCKETS + (shift - 1) * SUB_BUCKETS + min((us >> shift) - SUB_BUCKETS, SUB_BUCKETS - 1)
+
+    @staticmethod
+    def _value(index: int) -> float:
+        """Midpoint of bucket ``index`` in µs."""
+        if index < 2 * SUB_BUCKETS:
+            return float(index)
+        shift, sub = divmod(index - 2 * SUB_BUCKETS, SUB_BUCKETS)
+        shift += 1
+        return ((SUB_BUCKETS + sub) << shift) + (1 << shift) / 2.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[self._index(max(0, int(seconds * 1e6)))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def copy(self) -> "LoopHistogram":
+        """Snapshot (any thread: the audio thread may keep recording)."""
+        hist = LoopHistogram()
+        hist.counts = list(self.counts)
+        hist.count = sum(hist.counts)
+        hist.total = self.total
+        hist.max = self.max
+        return hist
+
+    def since(self, earlier: "LoopHistogram") -> "LoopHistogram":
+        """Values recorded after the snapshot ``earlier``; the max is to bucket precision."""
+        hist = LoopHistogram()
+        hist.counts = [a - b for a, b in zip(self.counts, earlier.counts)]
+        hist.count = sum(hist.counts)
+        hist.total = self.total - earlier.total
+        top = max((i for i, c in enumerate(hist.counts) if c), default=None)
+        hist.max = 0.0 if top is None else min(self._value(top) / 1e6, self.max)
+        return hist
+
+    def quantile(self, q: float) -> float:
+        """Value (seconds) at quantile ``q`` in [0, 1]; the exact max for q=1."""
+        counts = list(self.counts)  # the audio thread keeps recording
+        n = sum(counts)
+        if n == 0:
+            return 0.0
+        if q >= 1.0:
+            return self.max
+        rank = q * n
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if c and seen >= rank:
+                return min(self._value(i) / 1e6, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    """Loop-time histogram plus named counters, gauges and rates read via callbacks.
+
+    ``loop`` accumulates since start and is the only state the audio thread
+    touches (``record_loop``). Everything else happens on the reading thread:
+    ``recent()`` subtracts a snapshot of ``loop`` taken one to two ``window_s``
+    windows earlier (while the registry is read regularly), and rates are the
+    counter deltas since the previous read at least a second ago.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, window_s: float = 10.0):
+        self.loop = LoopHistogram()
+        self.window_s = float(window_s)
+        # Snapshots of ``loop`` taken by readers, oldest first: (perf time, histogram)
+        self._marks: List[Tuple[float, LoopHistogram]] = [(time.perf_counter(), LoopHistogram())]
+        # name -> (kind, help, fn, label); fn returns a number or {label value: number}
+        self._metrics: Dict[str, Tuple[str, str, Callable[[], Any], Optional[str]]] = {}
+        self._rates: Dict[str, Tuple[str, Callable[[], Dict[str, int]], str]] = {}
+        self._rate_values: Dict[str, Dict[str, float]] = {}
+        self._rate_last: Dict[str, Tuple[float, Dict[str, int]]] = {}  # name -> (perf time, totals)
+        self._read_lock = threading.Lock()
+
+    def register(self, name: str, kind: str, help_text: str, fn: Callable[[], Any],
+                 label: Optional[str] = None) -> None:
+        """Add a ``counter`` or ``gauge`` whose value ``fn()`` returns when read."""
+        if kind not in ("counter", "gauge"):
+            raise ValueError(f"Unknown metric kind '{kind}' (expected 'counter'|'gauge')")
+        self._metrics[name] = (kind, help_text, fn, label)
+
+    def register_rate(self, name: str, help_text: str, fn: Callable[[], Dict[str, int]], label: str) -> None:
+        """Add a per-second rate gauge of the labelled counters ``fn()`` returns (read off the audio thread)."""
+        self._rates[name] = (help_text, fn, label)
+        self._rate_last[name] = (time.perf_counter(), dict(fn()))
+
+    def record_loop(self, seconds: float) -> None:
+        """Audio thread: add one loop's render time."""
+        self.loop.record(seconds)
+
+    def recent(self) -> LoopHistogram:
+        """Loop times since a snapshot one to two windows old (the first window: since start)."""
+        now = time.perf_counter()
+        with self._read_lock:
+            current = self.loop.copy()
+            if now - self._marks[-1][0] >= self.window_s:
+                self._marks = [self._marks[-1], (now, current)]
+            return current.since(self._marks[0][1])
+
+    def _rate(self, name: str, fn: Callable[[], Dict[str, int]]) -> Dict[str, float]:
+        """Per-second deltas of ``fn()`` since the last computation, redone at most once a second."""
+        now = time.perf_counter()
+        with self._read_lock:
+            t, last = self._rate_last[name]
+            if now - t >= 1.0:
+                totals = dict(fn())
+                self._rate_values[name] = {k: (v - last.get(k, 0)) / (now - t) for k, v in totals.items()}
+                self._rate_last[name] = (now, totals)
+            return dict(self._rate_values.get(name, {}))
+
+    def _values(self) -> List[Tuple[str, str, str, Any, Optional[str]]]:
+        rows = []
+        for name, (kind, help_text, fn, label) in self._metrics.items():
+            try:
+                rows.append((name, kind, help_text, fn(), label))
+            except Exception as exc:  # pragma: no cover - runtime diagnostic
+                print(f"⚠️  Metric {name} failed: {exc}")
+        for name, (help_text, fn, label) in self._rates.items():
+            try:
+                rows.append((name, "gauge", help_text, self._rate(name, fn), label))
+            except Exception as exc:  # pragma: no cover - runtime diagnostic
+                print(f"⚠️  Metric {name} failed: {exc}")
+        return rows
+
+    def snapshot(self) -> Dict[str, float]:
+        """Flat ``name → value`` view (loop times in ms; labelled values as ``name:label``)."""
+        out: Dict[str, float] = {}
+        for prefix, hist in (("loop", self.loop), ("loop_recent", self.recent())):
+            for q in self.QUANTILES:
+                out[f"{prefix}_p{int(q * 100)}_ms"] = hist.quantile(q) * 1000.0
+            out[f"{prefix}_max_ms"] = hist.max * 1000.0
+        out["loops"] = float(self.loop.count)
+        for name, _, _, value, _ in self._values():
+            if isinstance(value, dict):
+                for key, v in sorted(value.items()):
+                    out[f"{name}:{key}"] = float(v)
+            else:
+                out[name] = float(value)
+        return out
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition (version 0.0.4)."""
+        lines = []
+        for metric, help_text, hist in (
+            ("audio_loop_seconds", "Audio loop render time per chunk since start", self.loop),
+            ("audio_loop_recent_seconds", f"Audio loop render time over the last {self.window_s:.0f}-"
+                                          f"{2 * self.window_s:.0f}s", self.recent()),
+        ):
+            name = PREFIX + metric
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+            for q in self.QUANTILES:
+                lines.append(f'{name}{{quantile="{q}"}} {hist.quantile(q):.6f}')
+            lines.append(f'{name}{{quantile="1"}} {hist.max:.6f}')
+            lines.append(f"{name}_sum {hist.total:.6f}")
+            lines.append(f"{name}_count {hist.count}")
+        for metric, kind, help_text, value, label in self._values():
+            name = PREFIX + metric
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            if isinstance(value, dict):
+                for key, v in sorted(value.items()):
+                    escaped = str(key).replace("\\", "\\\\").replace('"', '\\"')
+                    lines.append(f'{name}{{{label}="{escaped}"}} {float(v):g}')
+            else:
+                lines.append(f"{name} {float(value):g}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(registry: MetricsRegistry, port: int, host: str = "0.0.0.0") -> HTTPServer:
+    """Serve ``GET /metrics`` on a daemon thread; returns the server (``shutdown()`` to stop)."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # scrapes every few seconds: stay quiet
+            pass
+
+    server = HTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
+
+
+def main() -> int:
+    from pythonosc.osc_message import OscMessage
+    from pythonosc.osc_message_builder import OscMessageBuilder
+
+    parser = argparse.ArgumentParser(description="Print the audio server's /status metrics")
+    parser.add_argument("--host", default="127.0.0.1", help="Audio server host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=57120, help="Audio server OSC port (default: 57120)")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Seconds to wait for the reply (default: 2)")
+    args = parser.parse_args()
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(args.timeout)
+        sock.sendto(OscMessageBuilder(address="/get_status").build().dgram, (args.host, args.port))
+        try:
+            while True:
+                msg = OscMessage(sock.recvfrom(65535)[0])
+                if msg.address == "/status":
+                    break
+        except socket.timeout:
+            print(f"❌ No /status reply from {args.host}:{args.port}")
+            return 1
+    params = msg.params
+    for name, value in zip(params[::2], params[1::2]):
+        print(f"{name:<40} {value:g}" if isinstance(value, float) else f"{name:<40} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,8 @@
 from pythonosc.udp_client import SimpleUDPClient
 from pythonosc.dispatcher import Dispatcher
 from pythonosc.osc_server import ThreadingOSCUDPServer
+from pythonosc.osc_message import OscMessage
+from pythonosc.osc_message_builder import OscMessageBuilder
 import argparse, time, csv, random, wave, threading, socket
 from collections import deque
 from pathlib import Path
@@ -23,6 +25,7 @@ from pathlib import Path
 BPM_REF = 122.5  # Reference only; not used for playback timing.
 
 # Single timing offset used everywhere: gives the engine time to preload before playback.
+# With an engine started with --progressive-head-sec, a fraction of a second is enough.
 PRELOAD_OFFSET_SEC = 1.0
 
 def _read_selected_csv(csv_path: str | Path) -> list[dict]:
@@ -36,6 +39,89 @@ def _read_selected_csv(csv_path: str | Path) -> list[dict]:
     return rows
 
 
+class PreloadTuner:
+    """Preload offset derived from the load times the engine reports in /cue_ready.
+
+    Keeps the last ``window`` load times and proposes ``margin * p95 + headroom``
+    seconds, clamped to [min_offset, max_offset]. Until the first reply arrives
+    the configured offset is used.
+    """
+
+    def __init__(self, initial: float, min_offset: float = 0.1, max_offset: float = 8.0,
+                 margin: float = 1.5, headroom: float = 0.1, window: int = 16):
+        self.initial = float(initial)
+        self.min_offset = float(min_offset)
+        self.max_offset = float(max_offset)
+        self.margin = float(margin)
+        self.headroom = float(headroom)
+        self._load_s: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, load_ms: float) -> None:
+        with self._lock:
+            self._load_s.append(max(0.0, float(load_ms)) / 1000.0)
+
+    @property
+    def offset(self) -> float:
+        with self._lock:
+            samples = list(self._load_s)
+        p95 = _percentile(samples, 0.95)
+        if p95 is None:
+            return self.initial
+        return min(self.max_offset, max(self.min_offset, self.margin * p95 + self.headroom))
+
+
+class EngineClient:
+    """OSC client for the audio engine that owns its UDP socket.
+
+    The engine answers /cue with /cue_ready to the address a message came
+    from, so replies arrive on ``sock``; ``_cue_ready_listener`` reads them there.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.address = (host, int(port))
+        family = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM)[0][0]
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+
+    def send_message(self, address: str, value) -> None:
+        builder = OscMessageBuilder(address=address)
+        if value is None:
+            pass
+        elif isinstance(value, (list, tuple)):
+            for val in value:
+                builder.add_arg(val)
+        else:
+            builder.add_arg(value)
+        self.sock.sendto(builder.build().dgram, self.address)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def _cue_ready_listener(sock: socket.socket, tuner: PreloadTuner, adaptive: bool, stop_evt: threading.Event) -> None:
+    """Read /cue_ready replies the engine sends back to the mixer's client socket."""
+    sock.settimeout(0.2)
+    while not stop_evt.is_set():
+        try:
+            data = sock.recv(4096)
+        except socket.timeout:
+            continue
+        except OSError:
+            return
+        try:
+            msg = OscMessage(data)
+        except Exception:
+            continue
+        if msg.address != "/cue_ready" or len(msg.params) < 3:
+            continue
+        deck, buffer_id, load_ms = msg.params[0], msg.params[1], float(msg.params[2])
+        if adaptive:
+            tuner.observe(load_ms)
+            print(f"📥 /cue_ready {deck} (buffer {buffer_id}) in {load_ms:.0f} ms → preload offset {tuner.offset:.2f}s", flush=True)
+        else:
+            print(f"📥 /cue_ready {deck} (buffer {buffer_id}) in {load_ms:.0f} ms", flush=True)
+
+
 def _pick_three_rows(rows: list[dict], seed: int | None = None) -> tuple[dict, dict, dict]:
     if len(rows) < 3:
         raise ValueError("CSV must contain at least 3 rows with part_file")
@@ -340,7 +426,14 @@ def main():
         "--preload-offset",
         type=float,
         default=PRELOAD_OFFSET_SEC,
-        help="Seconds between /cue and expected playback start (default: 1.0).",
+        help="Seconds between /cue and expected playback start (default: 1.0; e.g. 0.3 when the engine "
+             "loads progressively with --progressive-head-sec).",
+    )
+    parser.add_argument(
+        "--adaptive-preload",
+        action="store_true",
+        help="Tune the preload offset from the /cue_ready load times reported by the engine "
+             "(starts at --preload-offset).",
     )
     parser.add_argument("--seed", type=int, default=None, help="Optional RNG seed for reproducible random selection.")
     parser.add_argument(
@@ -412,6 +505,12 @@ def main():
         default=0.02,
         help="Average movement delta needed to trigger high/low mode (default: 0.02)",
     )
+    parser.add_argument(
+        "--server-ramps",
+        action="store_true",
+        help="Crossfade with one /ramp per deck parameter (evaluated per sample by audio_server.py) "
+             "instead of stepping /deck_levels and /deck_eq_all from this script",
+    )
     args = parser.parse_args()
 
     rows = _read_selected_csv(args.csv)
@@ -497,7 +596,14 @@ def main():
     client_host = args.host
     if client_host in ("0.0.0.0", "::"):
         client_host = "127.0.0.1"
-    client = SimpleUDPClient(client_host, args.port)
+    client = EngineClient(client_host, args.port)
+    preload = PreloadTuner(float(args.preload_offset))
+    cue_listener_stop = threading.Event()
+    threading.Thread(
+        target=_cue_ready_listener,
+        args=(client.sock, preload, bool(args.adaptive_preload), cue_listener_stop),
+        daemon=True,
+    ).start()
     
     # Dashboard client for sending BPM updates (port 5005)
     dashboard_client = SimpleUDPClient("127.0.0.1", 5005)
@@ -638,7 +744,7 @@ def main():
         print(f"🕺 Movement OSC listener running on {host}:{port}")
         return server
 
-    def movement_updater_thread(client: SimpleUDPClient, interval: float, stop_evt: threading.Event):
+    def movement_updater_thread(client: EngineClient, interval: float, stop_evt: threading.Event):
         nonlocal last_sent
         # Map movements -> EQ bands: legs -> low, arms -> mid, head -> high
         while not stop_evt.is_set():
@@ -945,7 +1051,7 @@ def main():
 
         next_deck = _deck_for_index(cur_index + 1)
         next_start = cur_cue
-        next_load = max(0.0, next_start - float(args.preload_offset))
+        next_load = max(0.0, next_start - preload.offset)
         next_begin = float(_safe_float_from_row(next_row, "begin_cue_adj", default=0.0) or 0.0)
         next_end = float(_safe_float_from_row(next_row, "end_cue_adj", default=0.0) or 0.0)
         next_cue = next_start + next_begin
@@ -957,26 +1063,36 @@ def main():
 
         fade_dur = max(0.001, cur_end_at - cur_cue)
         started = False
-        for s in range(FADE_STEPS + 1):
-            a = s / FADE_STEPS
-            t = cur_cue + a * fade_dur
-            _sleep_until(t, t0)
-
-            if not started and t >= cur_cue + 0.0005:
-                send("/start_group", 0.0, next_deck)
-                started = True
-
-            out_v = 1.0 - a
-            in_v = a
-            lv = {**vols}
-            lv[cur_deck] = out_v
-            lv[next_deck] = in_v
-            send("/deck_levels", levels_for(["A", "B", "C", "D"], lv))
-
-            out_band = int(round(50 * (1.0 - a)))
-            in_band = int(round(50 * a))
-            send("/deck_eq_all", cur_deck, out_band, out_band, out_band)
-            send("/deck_eq_all", next_deck, in_band, in_band, in_band)
+        if args.server_ramps:
+            # One message per parameter; the server renders the envelopes per sample
+            _sleep_until(cur_cue, t0)
+            send("/start_group", 0.0, next_deck)
+            send("/ramp", cur_deck, "volume", "current", 0.0, fade_dur, "linear")
+            send("/ramp", next_deck, "volume", 0.0, 1.0, fade_dur, "linear")
+            send("/ramp", cur_deck, "eq", 50, 0, fade_dur, "linear")
+            send("/ramp", next_deck, "eq", 0, 50, fade_dur, "linear")
+            _sleep_until(cur_end_at, t0)
+        else:
+            for s in range(FADE_STEPS + 1):
+                a = s / FADE_STEPS
+                t = cur_cue + a * fade_dur
+                _sleep_until(t, t0)
+
+                if not started and t >= cur_cue + 0.0005:
+                    send("/start_group", 0.0, next_deck)
+                    started = True
+
+                out_v = 1.0 - a
+                in_v = a
+                lv = {**vols}
+                lv[cur_deck] = out_v
+                lv[next_deck] = in_v
+                send("/deck_levels", levels_for(["A", "B", "C", "D"], lv))
+
+                out_band = int(round(50 * (1.0 - a)))
+                in_band = int(round(50 * a))
+                send("/deck_eq_all", cur_deck, out_band, out_band, out_band)
+                send("/deck_eq_all", next_deck, in_band, in_band, in_band)
 
         vols[cur_deck] = 0.0
         vols[next_deck] = 1.0
@@ -996,6 +1112,8 @@ def main():
 
     # Finished scheduling; give movement updater a moment then stop it
     stop_event.set()
+    cue_listener_stop.set()
+    client.close()
     try:
         if server is not None:
             server.shutdown()
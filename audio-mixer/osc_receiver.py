@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""OSC receivers for the audio server.
+
+``ThreadingOSCUDPServer`` (python-osc's default) starts a thread for every
+datagram. Under EQ automation bursts that means hundreds of short-lived threads
+per second competing with the mixer for the GIL. The receivers here run on one
+thread instead:
+
+- ``blocking``  ``BatchOSCUDPServer``: a ``BlockingOSCUDPServer`` whose serve
+  loop waits for the socket to become readable, then drains every queued
+  datagram (up to ``batch`` per wakeup) with non-blocking ``recvfrom`` calls
+- ``asyncio``   ``AsyncioOSCUDPServer``: the same batch drain registered as a
+  reader on a private asyncio event loop
+
+Both enlarge ``SO_RCVBUF`` so a burst queues in the kernel while the receiver
+thread waits for the GIL, instead of being dropped. Handlers run sequentially,
+so a handler that blocks (``/start_group`` waiting for an in-flight ``/cue``)
+delays the messages behind it.
+
+``BundleDispatcher`` runs each OSC bundle inside a caller-supplied scope so the
+server can apply the bundle's messages together at its timetag (python-osc
+dispatches bundled messages one by one as they arrive). It also counts the
+messages it dispatches per address (``message_counts``) for the server metrics.
+
+Usage:
+    server = make_osc_server("blocking", ("0.0.0.0", 57120), dispatcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ...
+    server.shutdown()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import select
+import socket
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from pythonosc import osc_bundle, osc_message
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_message_builder import build_msg
+from pythonosc.osc_server import BlockingOSCUDPServer, ThreadingOSCUDPServer
+from pythonosc.parsing.osc_types import IMMEDIATELY
+
+RECEIVER_MODES = ("threading", "blocking", "asyncio")
+DEFAULT_RCVBUF_BYTES = 4 * 1024 * 1024
+MAX_DATAGRAM = 65535
+
+
+def set_receive_buffer(sock: socket.socket, size_bytes: int) -> int:
+    """Request ``SO_RCVBUF`` of ``size_bytes``; returns what the kernel granted.
+
+    Linux caps the request at ``net.core.rmem_max`` (and reports double the
+    granted size for bookkeeping); raise that sysctl for bigger buffers.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, int(size_bytes))
+    except OSError as exc:
+        print(f"⚠️  Could not set SO_RCVBUF={size_bytes}: {exc}")
+    return sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+
+class BundleDispatcher(Dispatcher):
+    """Dispatcher that invokes each bundle's handlers inside ``bundle_scope(timetag)``.
+
+    ``bundle_scope`` returns a context manager; ``timetag`` is the bundle's time
+    in Unix seconds, or None for "immediately". Nested bundles get their own
+    scope after the enclosing bundle's messages. Plain messages are dispatched
+    as usual.
+
+    Dispatched messages are counted per address in ``message_counts``; beyond
+    ``max_addresses`` distinct addresses the rest count under ``"other"``, so
+    arbitrary senders can't grow the table without bound. Other threads read
+    the counts through ``message_counts_snapshot()``.
+    """
+
+    def __init__(self, bundle_scope: Any, max_addresses: int = 64):
+        super().__init__()
+        self._bundle_scope = bundle_scope
+        self.message_counts: Dict[str, int] = {}
+        self.max_addresses = max_addresses
+        self._count_lock = threading.Lock()
+
+    def handlers_for_address(self, address_pattern: str) -> Any:
+        counts = self.message_counts
+        with self._count_lock:
+            if address_pattern not in counts and len(counts) >= self.max_addresses:
+                key = "other"
+            else:
+                key = address_pattern
+            counts[key] = counts.get(key, 0) + 1
+        return super().handlers_for_address(address_pattern)
+
+    def message_counts_snapshot(self) -> Dict[str, int]:
+        """Copy of ``message_counts`` taken under the counter lock (safe from any thread)."""
+        with self._count_lock:
+            return dict(self.message_counts)
+
+    def call_handlers_for_packet(self, data: bytes, client_address: Tuple[str, int]) -> List:
+        if not osc_bundle.OscBundle.dgram_is_bundle(data):
+            return super().call_handlers_for_packet(data, client_address)
+        try:
+            bundle = osc_bundle.OscBundle(data)
+        except osc_bundle.ParseError:
+            return []
+        results: List = []
+        self._dispatch_bundle(bundle, client_address, results)
+        return results
+
+    def _dispatch_bundle(self, bundle: osc_bundle.OscBundle, client_address: Tuple[str, int],
+                         results: List) -> None:
+        timetag: Optional[float] = None if bundle.timestamp == IMMEDIATELY else float(bundle.timestamp)
+        nested = []
+        with self._bundle_scope(timetag):
+            for content in bundle:
+                if isinstance(content, osc_bundle.OscBundle):
+                    nested.append(content)
+                    continue
+                for handler in self.handlers_for_address(content.address):
+                    result = handler.invoke(client_address, content)
+                    if result is not None:
+                        results.append(result)
+        for inner in nested:
+            self._dispatch_bundle(inner, client_address, results)
+
+
+class _BatchDrain:
+    """Non-blocking drain of a UDP socket into a python-osc dispatcher."""
+
+    socket: socket.socket
+    dispatcher: Dispatcher
+    batch: int
+
+    def _init_stats(self) -> None:
+        self.received = 0
+        self.wakeups = 0
+        self.max_batch = 0
+
+    def _drain(self) -> int:
+        """Dispatch every datagram already queued (at most ``batch``); returns the count."""
+        sock = self.socket
+        n = 0
+        while n < self.batch:
+            try:
+                data, client_address = sock.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                # Socket closed by shutdown
+                break
+            n += 1
+            if not (osc_bundle.OscBundle.dgram_is_bundle(data) or osc_message.OscMessage.dgram_is_message(data)):
+                continue
+            try:
+                # python-osc < 1.9 returns None here instead of the handler replies
+                for resp in self.dispatcher.call_handlers_for_packet(data, client_address) or ():
+                    if not isinstance(resp, tuple):
+                        resp = (resp,)
+                    sock.sendto(build_msg(resp[0], resp[1:]).dgram, client_address)
+            except Exception as exc:  # pragma: no cover - runtime diagnostic
+                print(f"⚠️  OSC dispatch error: {exc}")
+        if n:
+            self.received += n
+            self.wakeups += 1
+            self.max_batch = max(self.max_batch, n)
+        return n
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "received": self.received,
+            "wakeups": self.wakeups,
+            "mean_batch": self.received / self.wakeups if self.wakeups else 0.0,
+            "max_batch": self.max_batch,
+            "rcvbuf_bytes": self.rcvbuf_bytes,
+        }
+
+
+class BatchOSCUDPServer(_BatchDrain, BlockingOSCUDPServer):
+    """Single-threaded OSC server that drains the socket in batches."""
+
+    mode = "blocking"
+
+    def __init__(self, server_address: Tuple[str, int], dispatcher: Dispatcher,
+                 rcvbuf_bytes: int = DEFAULT_RCVBUF_BYTES, batch: int = 256):
+        super().__init__(server_address, dispatcher)
+        self.socket.setblocking(False)
+        self.rcvbuf_bytes = set_receive_buffer(self.socket, rcvbuf_bytes)
+        self.batch = max(1, int(batch))
+        self._init_stats()
+        self._stop = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self._stop.clear()
+        self._stopped.clear()
+        try:
+            while not self._stop.is_set():
+                try:
+                    ready, _, _ = select.select([self.socket], [], [], poll_interval)
+                except (OSError, ValueError):
+                    break
+                if ready:
+                    self._drain()
+        finally:
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._stopped.wait(timeout=2.0)
+        self.server_close()
+
+
+class AsyncioOSCUDPServer(_BatchDrain):
+    """Batch drain registered as a reader on a private asyncio loop (one thread)."""
+
+    mode = "asyncio"
+
+    def __init__(self, server_address: Tuple[str, int], dispatcher: Dispatcher,
+                 rcvbuf_bytes: int = DEFAULT_RCVBUF_BYTES, batch: int = 256):
+        family = socket.getaddrinfo(server_address[0], server_address[1], type=socket.SOCK_DGRAM)[0][0]
+        self.socket = socket.socket(family, socket.SOCK_DGRAM)
+        self.socket.bind(server_address)
+        self.socket.setblocking(False)
+        self.rcvbuf_bytes = set_receive_buffer(self.socket, rcvbuf_bytes)
+        self.dispatcher = dispatcher
+        self.batch = max(1, int(batch))
+        self._init_stats()
+        self._loop = asyncio.new_event_loop()
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+    def serve_forever(self) -> None:
+        loop = self._loop
+        self._stopped.clear()
+        asyncio.set_event_loop(loop)
+        fd = self.socket.fileno()
+        loop.add_reader(fd, self._drain)
+        try:
+            loop.run_forever()
+        finally:
+            loop.remove_reader(fd)
+            loop.close()
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._stopped.wait(timeout=2.0)
+        self.socket.close()
+
+
+def make_osc_server(mode: str, server_address: Tuple[str, int], dispatcher: Dispatcher,
+                    rcvbuf_bytes: int = DEFAULT_RCVBUF_BYTES, batch: int = 256) -> Any:
+    """OSC server for ``mode`` (see ``RECEIVER_MODES``); all expose ``socket``,
+    ``serve_forever()`` and ``shutdown()``."""
+    if mode == "threading":
+        server = ThreadingOSCUDPServer(server_address, dispatcher)
+        set_receive_buffer(server.socket, rcvbuf_bytes)
+        return server
+    if mode == "blocking":
+        return BatchOSCUDPServer(server_address, dispatcher, rcvbuf_bytes=rcvbuf_bytes, batch=batch)
+    if mode == "asyncio":
+        return AsyncioOSCUDPServer(server_address, dispatcher, rcvbuf_bytes=rcvbuf_bytes, batch=batch)
+    raise ValueError(f"Unknown OSC receiver '{mode}' (expected {'|'.join(RECEIVER_MODES)})")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Real-time hygiene for the mixer thread: GC control, scheduling priority, memory locking.
+
+CPython's cyclic garbage collector runs in whichever thread crosses the
+allocation threshold, so the mixer can stop for a full-heap scan in the middle
+of a chunk. On a Pi shared with the detector and visualizers, the mixer thread
+also competes at normal priority, and its pages can be swapped out under memory
+pressure. With ``--realtime`` the server:
+
+- ``gc.freeze()``s the heap after startup (imports, buffers loaded so far), so
+  later collections skip those objects
+- disables automatic collection and runs it from the mixer instead: a full
+  collection on idle ticks (nothing playing), and only a young-generation
+  collection while playing, when the tick has headroom left in its budget
+- moves the mixer thread to ``SCHED_FIFO``, or failing that to a negative nice value
+- ``mlockall``s the process so decoded audio and the interpreter are never paged out
+
+Each step that isn't permitted falls back with a message instead of failing:
+SCHED_FIFO needs root or ``CAP_SYS_NICE`` (or an ``rtprio`` limit), and locking
+memory needs ``CAP_IPC_LOCK`` or a large enough ``ulimit -l``.
+
+Usage:
+    python realtime.py          # report what this process may do
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import gc
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_FIFO_PRIORITY = 70
+DEFAULT_NICE = -10
+# mlockall flags (Linux)
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+MCL_ONFAULT = 4  # Linux 4.4+: lock pages as they are touched instead of pre-faulting them
+
+
+def promote_thread(priority: int = DEFAULT_FIFO_PRIORITY, nice: int = DEFAULT_NICE) -> str:
+    """Raise the calling thread to SCHED_FIFO ``priority``, else to ``nice``; returns what was applied."""
+    if hasattr(os, "sched_setscheduler"):
+        try:
+            prio = max(os.sched_get_priority_min(os.SCHED_FIFO),
+                       min(int(priority), os.sched_get_priority_max(os.SCHED_FIFO)))
+            # pid 0 = the calling thread on Linux
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(prio))
+            return f"SCHED_FIFO priority {prio}"
+        except OSError as exc:
+            fifo_error = exc.strerror or str(exc)
+    else:
+        fifo_error = "not supported on this platform"
+    if sys.platform.startswith("linux"):
+        try:
+            # Linux applies PRIO_PROCESS with a thread id to that thread only
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), int(nice))
+            return f"nice {int(nice)} (SCHED_FIFO: {fifo_error})"
+        except OSError as exc:
+            return f"normal priority (SCHED_FIFO: {fifo_error}; nice {int(nice)}: {exc.strerror or exc})"
+    return f"normal priority (SCHED_FIFO: {fifo_error})"
+
+
+def lock_memory() -> str:
+    """``mlockall`` the process; returns what was applied.
+
+    Future mappings are only locked when ``RLIMIT_MEMLOCK`` is unlimited (or as
+    root): with a finite limit, MCL_FUTURE would make later allocations fail once
+    the limit is reached, instead of just leaving them unlocked. ``MCL_ONFAULT``
+    keeps untouched reservations (8 MB thread stacks, sparse mappings) out of RAM;
+    kernels without it get a plain ``mlockall``.
+    """
+    if not sys.platform.startswith("linux"):
+        return "not locked (mlockall is only used on Linux)"
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_MEMLOCK)
+        unlimited = soft == resource.RLIM_INFINITY or os.geteuid() == 0
+    except (ImportError, OSError, ValueError):
+        unlimited = False
+    flags = MCL_CURRENT | MCL_FUTURE if unlimited else MCL_CURRENT
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if libc.mlockall(flags | MCL_ONFAULT) != 0 and libc.mlockall(flags) != 0:
+            err = ctypes.get_errno()
+            return f"not locked ({os.strerror(err)}; raise 'ulimit -l' or grant CAP_IPC_LOCK)"
+    except (OSError, AttributeError) as exc:
+        return f"not locked ({exc})"
+    return "locked (current and future pages)" if flags & MCL_FUTURE else "locked (current pages)"
+
+
+class GCController:
+    """Cyclic GC driven by the mixer instead of the allocation threshold.
+
+    ``tick`` is called once per mixer loop. When nothing plays it runs a full
+    collection every ``idle_interval_s``. While playing, it only collects the
+    young generation, once it has grown past the interpreter's own threshold and
+    only if ``headroom_s`` of the chunk budget is left (``min_headroom_s``).
+    Generation 1 is collected instead when its count passes its threshold.
+    """
+
+    def __init__(self, idle_interval_s: float = 2.0, min_headroom_s: float = 0.005):
+        self.idle_interval_s = float(idle_interval_s)
+        self.min_headroom_s = float(min_headroom_s)
+        self._thresholds = gc.get_threshold()
+        self._was_enabled = gc.isenabled()
+        self._last_full = 0.0
+        self.active = False
+        self.frozen = 0
+        self.full_collections = 0
+        self.young_collections = 0
+        self.max_pause_ms = 0.0
+
+    def freeze(self) -> int:
+        """Collect, then move every surviving object to the permanent generation."""
+        gc.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        return self.frozen
+
+    def start(self) -> None:
+        """Disable automatic collection (``tick`` collects from now on)."""
+        gc.disable()
+        self.active = True
+
+    def stop(self) -> None:
+        """Restore automatic collection."""
+        if self._was_enabled:
+            gc.enable()
+        self.active = False
+
+    def tick(self, now: float, playing: bool, headroom_s: float) -> None:
+        if not self.active:
+            return
+        if not playing:
+            if now - self._last_full < self.idle_interval_s:
+                return
+            self._last_full = now
+            self._collect(2)
+            self.full_collections += 1
+            return
+        count0, count1, _ = gc.get_count()
+        if count0 < self._thresholds[0] or headroom_s < self.min_headroom_s:
+            return
+        self._collect(1 if count1 >= self._thresholds[1] else 0)
+        self.young_collections += 1
+
+    def _collect(self, generation: int) -> None:
+        t0 = time.perf_counter()
+        gc.collect(generation)
+        self.max_pause_ms = max(self.max_pause_ms, (time.perf_counter() - t0) * 1000.0)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "frozen": self.frozen,
+            "full_collections": self.full_collections,
+            "young_collections": self.young_collections,
+            "max_pause_ms": self.max_pause_ms,
+            "pending": gc.get_count()[0],
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report the real-time settings this process may apply")
+    parser.add_argument("--priority", type=int, default=DEFAULT_FIFO_PRIORITY,
+                        help=f"SCHED_FIFO priority to try (default: {DEFAULT_FIFO_PRIORITY})")
+    parser.add_argument("--nice", type=int, default=DEFAULT_NICE,
+                        help=f"Nice value if SCHED_FIFO is refused (default: {DEFAULT_NICE})")
+    args = parser.parse_args()
+
+    result: Dict[str, Optional[str]] = {}
+    worker = threading.Thread(target=lambda: result.update(thread=promote_thread(args.priority, args.nice)))
+    worker.start()
+    worker.join()
+    print(f"🧵 Mixer thread: {result['thread']}")
+    print(f"🔒 Memory: {lock_memory()}")
+    gcc = GCController()
+    print(f"🧊 gc.freeze(): {gcc.freeze()} objects frozen (thresholds {gc.get_threshold()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
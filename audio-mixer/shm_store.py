@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Decoded PCM in named shared memory that outlives the audio server process.
+
+A restarted ``audio_server.py`` normally decodes every track again before the
+set can resume. With ``--shm-store`` each resident buffer's PCM lives in a
+POSIX shared memory segment (``multiprocessing.shared_memory``, ``/dev/shm``
+on Linux) and a small JSON manifest records what each segment holds. A new
+server process re-attaches to the segment of a file instead of decoding it:
+the segment name is derived from the file's identity (path, mtime, size,
+engine rate and sample format) and the manifest's ``pcm_crc`` (a CRC over a
+sparse sample of frames) is checked on attach.
+
+Segments are created without the ``multiprocessing`` resource tracker, which
+would otherwise unlink them when the process exits (including crashes). Several
+buffers of the same file share its segment; the server unlinks it when the
+last of them is replaced, evicted or cleaned up. Segments of buffers still
+loaded at exit stay for the next start. They use
+RAM until removed, so clear them when the server is not coming back:
+
+Usage:
+    python shm_store.py list
+    python shm_store.py clear   # unlink every segment in the manifest
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_cache import DEFAULT_CACHE_DIR, ENGINE_SAMPLE_RATE, SAMPLE_FORMATS
+
+DEFAULT_MANIFEST = DEFAULT_CACHE_DIR.parent / "shm-manifest.json"
+# macOS limits POSIX shm names to 31 characters
+SEGMENT_PREFIX = "cs_"
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """Open (or create) segment ``name`` without resource tracking, so it survives this process."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:  # Python < 3.13: no track argument
+        shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        except Exception:
+            pass
+        return shm
+
+
+def _close_quietly(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except Exception:
+        pass
+
+
+def pcm_checksum(data: np.ndarray) -> int:
+    """CRC32 of the first and last 4096 frames plus ~1024 strided frames (cheap, not exhaustive)."""
+    frames = data.shape[0]
+    if frames == 0:
+        return 0
+    stride = max(1, frames // 1024)
+    crc = zlib.crc32(np.ascontiguousarray(data[:4096]).tobytes())
+    crc = zlib.crc32(np.ascontiguousarray(data[::stride]).tobytes(), crc)
+    return zlib.crc32(np.ascontiguousarray(data[-4096:]).tobytes(), crc)
+
+
+class SharedPCMStore:
+    """Shared memory segments of decoded PCM, indexed by a JSON manifest.
+
+    Arrays returned by :meth:`attach`, :meth:`create` and :meth:`publish` map
+    the segment; the mapping is closed when the array (and every view of it)
+    is garbage collected. Each successful call takes a reference on the
+    segment for the caller and :meth:`discard` drops it: the segment is
+    unlinked with the last reference (processes that still map it keep their
+    mapping until they drop it). While a segment is referenced, :meth:`create`
+    for the same file returns None instead of replacing it.
+    """
+
+    def __init__(self, manifest_path: str | Path = DEFAULT_MANIFEST, target_sr: int = ENGINE_SAMPLE_RATE,
+                 sample_format: str = "float32"):
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unknown sample format '{sample_format}' (expected {'|'.join(SAMPLE_FORMATS)})")
+        self.manifest_path = Path(manifest_path).expanduser()
+        self.target_sr = int(target_sr)
+        self.sample_format = sample_format
+        self.attached = 0
+        self.published = 0
+        self._lock = threading.Lock()
+        self._refs: Dict[str, int] = {}  # segment name → holders in this process
+        self._refs_lock = threading.Lock()
+
+    # --- manifest ---------------------------------------------------------
+    def _read_manifest(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.manifest_path.read_text()).get("segments", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, segments: Dict[str, dict]) -> None:
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"segments": segments}, indent=1))
+            os.replace(tmp, self.manifest_path)
+        except OSError as exc:
+            print(f"⚠️  Could not write shared memory manifest {self.manifest_path}: {exc}")
+
+    def _update(self, name: str, entry: Optional[dict]) -> None:
+        with self._lock:
+            segments = self._read_manifest()
+            if entry is None:
+                segments.pop(name, None)
+            else:
+                segments[name] = entry
+            self._write_manifest(segments)
+
+    def entries(self) -> Dict[str, dict]:
+        with self._lock:
+            return self._read_manifest()
+
+    # --- identity ---------------------------------------------------------
+    def identify(self, file_path: str | Path) -> Optional[Tuple[str, str, str]]:
+        """``(source, checksum, segment name)`` for ``file_path`` as it is on disk now."""
+        source = Path(file_path).expanduser().resolve()
+        try:
+            st = source.stat()
+        except OSError:
+            return None
+        ident = f"{source}|{st.st_mtime_ns}|{st.st_size}|{self.target_sr}|{self.sample_format}"
+        checksum = hashlib.sha1(ident.encode("utf-8")).hexdigest()
+        return str(source), checksum, f"{SEGMENT_PREFIX}{checksum[:24]}"
+
+    @staticmethod
+    def _view(shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str) -> np.ndarray:
+        data = np.ndarray(tuple(shape), dtype=dtype, buffer=shm.buf)
+        weakref.finalize(data, _close_quietly, shm)
+        return data
+
+    def _acquire(self, name: str) -> None:
+        with self._refs_lock:
+            self._refs[name] = self._refs.get(name, 0) + 1
+
+    def _release(self, name: str) -> bool:
+        """Drop one reference on ``name``; True when none is left."""
+        with self._refs_lock:
+            refs = self._refs.get(name, 0) - 1
+            if refs > 0:
+                self._refs[name] = refs
+                return False
+            self._refs.pop(name, None)
+            return True
+
+    def references(self, file_path: str | Path) -> int:
+        """Holders of ``file_path``'s segment in this process."""
+        ident = self.identify(file_path)
+        if ident is None:
+            return 0
+        with self._refs_lock:
+            return self._refs.get(ident[2], 0)
+
+    # --- segments ---------------------------------------------------------
+    def attach(self, file_path: str | Path) -> Optional[np.ndarray]:
+        """Map the complete segment holding ``file_path``'s PCM, or None."""
+        ident = self.identify(file_path)
+        if ident is None:
+            return None
+        _, checksum, name = ident
+        entry = self.entries().get(name)
+        if entry is None or not entry.get("complete") or entry.get("checksum") != checksum:
+            return None
+        try:
+            shm = _open_segment(name)
+        except FileNotFoundError:
+            self._update(name, None)  # gone (reboot or cleared)
+            return None
+        data = self._view(shm, entry["shape"], entry["dtype"])
+        if pcm_checksum(data) != entry.get("pcm_crc"):
+            print(f"⚠️  Shared memory segment {name} failed its checksum; decoding again")
+            del data
+            self._unlink(name)
+            self._update(name, None)
+            return None
+        self._acquire(name)
+        self.attached += 1
+        return data
+
+    def create(self, file_path: str | Path, shape: Tuple[int, ...], dtype: str) -> Optional[np.ndarray]:
+        """New zeroed segment for ``file_path`` (incomplete until :meth:`commit`), or None."""
+        ident = self.identify(file_path)
+        if ident is None:
+            return None
+        source, checksum, name = ident
+        with self._refs_lock:
+            if self._refs.get(name):
+                # Another buffer of this file holds the segment (possibly still filling it)
+                return None
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        try:
+            shm = _open_segment(name, create=True, size=max(1, size))
+        except FileExistsError:
+            # Stale or incomplete segment from an earlier process: replace it
+            self._unlink(name)
+            try:
+                shm = _open_segment(name, create=True, size=max(1, size))
+            except OSError as exc:
+                print(f"⚠️  Could not create shared memory for {Path(source).name}: {exc}")
+                return None
+        except OSError as exc:
+            print(f"⚠️  Could not create shared memory for {Path(source).name}: {exc}")
+            return None
+        self._update(name, {
+            "source": source,
+            "checksum": checksum,
+            "shape": list(shape),
+            "dtype": np.dtype(dtype).name,
+            "complete": False,
+            "created": time.time(),
+        })
+        self._acquire(name)
+        return self._view(shm, shape, dtype)
+
+    def commit(self, file_path: str | Path, data: np.ndarray) -> None:
+        """Mark the segment complete (fully written) so later processes can attach it."""
+        ident = self.identify(file_path)
+        if ident is None:
+            return
+        _, checksum, name = ident
+        entry = self.entries().get(name)
+        if entry is None or entry.get("checksum") != checksum:
+            return
+        entry.update(complete=True, pcm_crc=pcm_checksum(data))
+        self._update(name, entry)
+        self.published += 1
+
+    def publish(self, file_path: str | Path, data: np.ndarray) -> np.ndarray:
+        """Copy decoded ``data`` into a complete segment; returns the shared array (``data`` on failure)."""
+        shared = self.create(file_path, data.shape, data.dtype.name)
+        if shared is None:
+            return data
+        np.copyto(shared, data)
+        self.commit(file_path, shared)
+        return shared
+
+    def _unlink(self, name: str) -> None:
+        try:
+            shm = _open_segment(name)
+        except FileNotFoundError:
+            return
+        try:
+            shm.unlink()
+        finally:
+            _close_quietly(shm)
+
+    def discard(self, file_path: str | Path) -> None:
+        """Drop a reference on ``file_path``'s segment; the last one unlinks it and drops it from the manifest."""
+        ident = self.identify(file_path)
+        if ident is None:
+            return
+        name = ident[2]
+        if not self._release(name):
+            return
+        self._unlink(name)
+        self._update(name, None)
+
+    def prune(self, keep: List[str]) -> int:
+        """Unlink every segment whose name is not in ``keep``; returns how many."""
+        removed = 0
+        for name in list(self.entries()):
+            if name not in keep:
+                self._unlink(name)
+                self._update(name, None)
+                with self._refs_lock:
+                    self._refs.pop(name, None)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, float]:
+        segments = self.entries()
+        total = 0
+        for entry in segments.values():
+            total += int(np.prod(entry.get("shape", [0]))) * np.dtype(entry.get("dtype", "float32")).itemsize
+        return {
+            "segments": len(segments),
+            "mb": total / (1024 * 1024),
+            "attached": self.attached,
+            "published": self.published,
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Shared memory PCM store of audio_server.py")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST,
+                        help=f"Manifest file (default: {DEFAULT_MANIFEST})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show the segments in the manifest")
+    sub.add_parser("clear", help="Unlink every segment in the manifest")
+    args = parser.parse_args()
+
+    store = SharedPCMStore(args.manifest)
+    if args.command == "list":
+        segments = store.entries()
+        for name, entry in sorted(segments.items(), key=lambda item: item[1].get("source", "")):
+            shape = entry.get("shape", [0, 0])
+            state = "complete" if entry.get("complete") else "incomplete"
+            print(f"  {name}  {Path(entry.get('source', '?')).name}  {shape[0]} frames "
+                  f"{entry.get('dtype', '?')}  {state}")
+        print(f"📦 {len(segments)} segments, {store.stats()['mb']:.1f} MB")
+        return 0
+
+    removed = store.prune([])
+    print(f"🧹 Unlinked {removed} shared memory segments")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark player mixing: one render call per player vs the batched player matrix.
+
+For 4, 8, 12 and 20 players (4 decks × up to 5 stems) routed round-robin onto
+the four deck buses, measures the per-chunk cost of
+- loop     StemPlayer.get_audio_chunk per player, added to its deck bus
+- matrix   _PlayerMatrix: one batched gather + interpolation + routing matmul
+
+at unity rate (copy path) and at a non-unity rate (interpolated), and checks
+that both engines produce the same deck buses. ``--sample-format int16``
+stores the decoded stems as int16 (half the memory read per gather).
+
+Usage:
+    python scripts/benchmark_mix_engine.py [--chunks 1000] [--chunk-size 1024] [--interpolation linear]
+                                           [--sample-format float32]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "audio-mixer"))
+from audio_cache import SAMPLE_FORMATS  # noqa: E402
+from audio_server import AudioBuffer, StemPlayer, _PlayerMatrix  # noqa: E402
+
+SR = 44100
+PLAYER_COUNTS = (4, 8, 12, 20)
+
+
+def _buffers(tmp: Path, count: int, seconds: float, sample_format: str = "float32") -> list:
+    rng = np.random.default_rng(0)
+    buffers = []
+    for i in range(count):
+        path = tmp / f"stem_{i}.wav"
+        frames = int(SR * seconds) + i * 37  # different lengths: loops wrap at different chunks
+        sf.write(path, (rng.standard_normal((frames, 2)) * 0.1).astype(np.float32), SR, subtype="FLOAT")
+        buffers.append(AudioBuffer(path, 100 + i, sample_format=sample_format))
+    return buffers
+
+
+def _players(buffers: list, count: int, rate: float, interpolation: str) -> list:
+    players = []
+    for i, buf in enumerate(buffers[:count]):
+        p = StemPlayer(buf, rate=rate, volume=0.5 + 0.02 * i, start_pos=0.1 * (i % 5),
+                       interpolation=interpolation)
+        p.playing = True
+        players.append(p)
+    return players
+
+
+def bench_loop(players: list, chunks: int, chunk: int):
+    bus = np.zeros((4, chunk, 2), dtype=np.float32)
+    out = np.zeros((chunk, 2), dtype=np.float32)
+    times = np.empty(chunks)
+    digest = []
+    for c in range(chunks):
+        t0 = time.perf_counter()
+        bus.fill(0.0)
+        for i, p in enumerate(players):
+            p.get_audio_chunk(chunk, out=out)
+            bus[i % 4] += out
+        times[c] = time.perf_counter() - t0
+        digest.append(bus.copy()) if c < 8 else None
+    return times, digest
+
+
+def bench_matrix(players: list, chunks: int, chunk: int, interpolation: str):
+    bus = np.zeros((4, chunk, 2), dtype=np.float32)
+    matrix = _PlayerMatrix(chunk, decks=4)
+    batch = [(p, i % 4, None) for i, p in enumerate(players)]
+    times = np.empty(chunks)
+    digest = []
+    for c in range(chunks):
+        t0 = time.perf_counter()
+        bus.fill(0.0)
+        matrix.render(batch, bus, chunk, interpolation)
+        times[c] = time.perf_counter() - t0
+        digest.append(bus.copy()) if c < 8 else None
+    return times, digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-player loop vs batched player matrix")
+    parser.add_argument("--chunks", type=int, default=1000, help="Chunks per run (default: 1000)")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Frames per chunk (default: 1024)")
+    parser.add_argument("--interpolation", choices=["linear", "cubic"], default="linear")
+    parser.add_argument("--sample-format", choices=list(SAMPLE_FORMATS), default="float32",
+                        help="Storage dtype of the decoded stems (default: float32)")
+    args = parser.parse_args()
+
+    chunk = args.chunk_size
+    budget_ms = chunk / SR * 1000
+    print(f"📊 Player mixing @ {chunk} frames/chunk, {args.chunks} chunks, {args.interpolation}, "
+          f"{args.sample_format} stems (budget {budget_ms:.1f} ms/chunk)")
+    print(f"{'rate':>6} {'players':>8} {'loop µs':>10} {'matrix µs':>10} {'speedup':>8} {'max err':>9}")
+    worst = 0.0
+    with tempfile.TemporaryDirectory() as tmp:
+        buffers = _buffers(Path(tmp), max(PLAYER_COUNTS), seconds=3.0, sample_format=args.sample_format)
+        for rate in (1.0, 0.95):
+            for count in PLAYER_COUNTS:
+                t_loop, d_loop = bench_loop(_players(buffers, count, rate, args.interpolation),
+                                            args.chunks, chunk)
+                t_mat, d_mat = bench_matrix(_players(buffers, count, rate, args.interpolation),
+                                            args.chunks, chunk, args.interpolation)
+                err = max(float(np.max(np.abs(a - b))) for a, b in zip(d_loop, d_mat))
+                worst = max(worst, err)
+                print(f"{rate:>6.2f} {count:>8} {t_loop.mean() * 1e6:>10.1f} {t_mat.mean() * 1e6:>10.1f} "
+                      f"{t_loop.mean() / t_mat.mean():>7.1f}x {err:>9.1e}")
+    if worst > 1e-5:
+        print(f"❌ Engines disagree (max abs error {worst:.2e})")
+        return 1
+    print("✅ Matching deck buses for both engines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the 3-band deck EQ: four per-deck filters vs one batched MultiDeckEQ.
+
+Compares, per mixer chunk with all four decks filtered:
+- python      four _ThreeBand instances (per-sample Python loop)
+- per-deck    four _ThreeBandOptimized instances (two lfilter calls per deck)
+- multi-deck  one MultiDeckEQ (one lfilter call per band for all decks/channels)
+
+and checks that the per-deck and multi-deck outputs match.
+
+Usage:
+    python scripts/benchmark_multideck_eq.py [--chunks 2000] [--chunk-size 1024]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "audio-mixer"))
+from audio_server import SCIPY_AVAILABLE, MultiDeckEQ, _ThreeBand, _ThreeBandOptimized  # noqa: E402
+
+SR = 44100
+DECKS = "ABCD"
+GAINS = {"low": 0.3, "mid": 1.0, "high": 0.6}
+
+
+def _bus(chunks: int, chunk: int) -> list:
+    rng = np.random.default_rng(0)
+    return [(rng.standard_normal((4, chunk, 2)) * 0.1).astype(np.float32) for _ in range(min(chunks, 16))]
+
+
+def bench_per_deck(cls, blocks: list, chunks: int):
+    filters = [cls(SR) for _ in DECKS]
+    for f in filters:
+        for band, g in GAINS.items():
+            f.set_gain(band, g)
+    times = np.empty(chunks)
+    outs = []
+    for i in range(chunks):
+        bus = blocks[i % len(blocks)].copy()
+        t0 = time.perf_counter()
+        for d, f in enumerate(filters):
+            bus[d] = f.process(bus[d])
+        times[i] = time.perf_counter() - t0
+        if i < len(blocks):
+            outs.append(bus)
+    return times, outs
+
+
+def bench_multi_deck(blocks: list, chunks: int):
+    eq = MultiDeckEQ(SR, decks=len(DECKS))
+    for d in range(len(DECKS)):
+        for band, g in GAINS.items():
+            eq.set_gain(d, band, g)
+    times = np.empty(chunks)
+    outs = []
+    for i in range(chunks):
+        bus = blocks[i % len(blocks)].copy()
+        t0 = time.perf_counter()
+        eq.process(bus)
+        times[i] = time.perf_counter() - t0
+        if i < len(blocks):
+            outs.append(bus)
+    return times, outs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-deck vs batched multi-deck EQ")
+    parser.add_argument("--chunks", type=int, default=2000, help="Chunks to process (default: 2000)")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Frames per chunk (default: 1024)")
+    parser.add_argument("--skip-python", action="store_true", help="Skip the (slow) pure-Python filters")
+    args = parser.parse_args()
+
+    if not SCIPY_AVAILABLE:
+        print("❌ scipy not installed - the optimized filters need it")
+        return 1
+
+    chunk = args.chunk_size
+    budget_ms = chunk / SR * 1000
+    blocks = _bus(args.chunks, chunk)
+
+    results = {}
+    if not args.skip_python:
+        results["python"] = bench_per_deck(_ThreeBand, blocks, min(args.chunks, 50))
+    results["per-deck"] = bench_per_deck(_ThreeBandOptimized, blocks, args.chunks)
+    results["multi-deck"] = bench_multi_deck(blocks, args.chunks)
+
+    print(f"📊 4-deck 3-band EQ @ {chunk} frames/chunk, {args.chunks} chunks (budget {budget_ms:.1f} ms/chunk)")
+    print(f"{'implementation':<12} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10} {'% budget':>9}")
+    for name, (times, _) in results.items():
+        us = times * 1e6
+        print(f"{name:<12} {us.mean():>10.1f} {np.percentile(us, 50):>10.1f} "
+              f"{np.percentile(us, 99):>10.1f} {us.mean() / 10 / budget_ms:>8.2f}%")
+
+    err = max(float(np.max(np.abs(a - b))) for a, b in zip(results["per-deck"][1], results["multi-deck"][1]))
+    if err > 1e-4:
+        print(f"❌ Outputs differ between per-deck and multi-deck (max abs error {err:.2e})")
+        return 1
+    speedup = results["per-deck"][0].mean() / results["multi-deck"][0].mean()
+    print(f"✅ Matching output (max abs error {err:.1e}); multi-deck is {speedup:.1f}x faster than per-deck")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixer-loop jitter under an OSC message flood, per OSC receiver mode.
+
+A stand-in mixer loop runs on the main thread at the audio chunk period
+(1024 frames @ 44.1 kHz = 23.2 ms), doing a fixed amount of NumPy and Python
+work per chunk and then sleeping until the next deadline. Meanwhile a separate
+process floods the OSC port with /deck_eq messages (default 2 kHz). The
+handler does what the server's /deck_eq handler does (parse, map percent to
+gain, write a control slot).
+
+For each receiver (threading = thread per datagram, blocking / asyncio = one
+thread draining the socket in batches) it reports how late the mixer woke up
+for its deadlines (p50/p99/max), the chunk render time and how many messages
+arrived.
+
+Usage:
+    python scripts/benchmark_osc_receiver.py [--rate 2000] [--seconds 5]
+"""
+import argparse
+import itertools
+import multiprocessing as mp
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from pythonosc import dispatcher
+from pythonosc.udp_client import SimpleUDPClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "audio-mixer"))
+from osc_receiver import RECEIVER_MODES, make_osc_server  # noqa: E402
+
+SR = 44100
+CHUNK = 1024
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _flood(port: int, rate: float, seconds: float, ready) -> None:
+    """Sender process: /deck_eq at ``rate`` messages/s, paced in 5 ms bursts."""
+    client = SimpleUDPClient("127.0.0.1", port)
+    per_burst = max(1, int(rate * 0.005))
+    ready.wait()
+    t_end = time.perf_counter() + seconds
+    next_t = time.perf_counter()
+    i = 0
+    while time.perf_counter() < t_end:
+        for _ in range(per_burst):
+            client.send_message("/deck_eq", ["AB"[i % 2], ("low", "mid", "high")[i % 3], float(i % 50)])
+            i += 1
+        next_t += 0.005
+        delay = next_t - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _mixer_loop(seconds: float, players: int = 20):
+    """Fixed per-chunk work on the main thread; returns wakeup lateness and render times (ms)."""
+    rng = np.random.default_rng(0)
+    sources = [(rng.standard_normal((SR, 2)) * 0.1).astype(np.float32) for _ in range(4)]
+    bus = np.zeros((4, CHUNK, 2), dtype=np.float32)
+    period = CHUNK / SR
+    late, render = [], []
+    t_next = time.perf_counter() + period
+    t_end = time.perf_counter() + seconds
+    pos = 0
+    while t_next < t_end:
+        delay = t_next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = time.perf_counter()
+        late.append((t0 - t_next) * 1000)
+        bus.fill(0.0)
+        for p in range(players):
+            src = sources[p % 4]
+            bus[p % 4] += src[pos:pos + CHUNK] * (0.5 + 0.01 * p)
+        mix = np.tanh(bus.sum(axis=0))
+        pos = (pos + CHUNK) % (SR - CHUNK)
+        render.append((time.perf_counter() - t0) * 1000)
+        t_next += period
+    del mix
+    return np.array(late), np.array(render)
+
+
+def run(mode: str, rate: float, seconds: float):
+    slots = {}
+    received = itertools.count()  # next() is atomic across handler threads
+
+    def on_deck_eq(address, *args):
+        deck, band, percent = str(args[0]).upper(), str(args[1]).lower(), float(args[2])
+        gain = 0.0 if percent <= 0 else 1.0 if percent >= 50 else 10.0 ** ((percent / 50.0 - 1.0) * 24.0 / 20.0)
+        slots[(deck, band)] = gain
+        next(received)
+
+    disp = dispatcher.Dispatcher()
+    disp.map("/deck_eq", on_deck_eq)
+    port = _free_port()
+    server = make_osc_server(mode, ("127.0.0.1", port), disp)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    ctx = mp.get_context("spawn")
+    ready = ctx.Event()
+    sender = None
+    if rate > 0:
+        sender = ctx.Process(target=_flood, args=(port, rate, seconds, ready), daemon=True)
+        sender.start()
+        time.sleep(0.5)  # let the sender process start up
+    ready.set()
+    late, render = _mixer_loop(seconds)
+    if sender is not None:
+        sender.join(timeout=5)
+    time.sleep(0.2)
+    server.shutdown()
+    return late, render, next(received)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixer-loop jitter under an OSC flood, per receiver mode")
+    parser.add_argument("--rate", type=float, default=2000.0, help="Flood rate in messages/s (default: 2000)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration per mode (default: 5)")
+    parser.add_argument("--modes", nargs="+", default=list(RECEIVER_MODES), choices=list(RECEIVER_MODES))
+    args = parser.parse_args()
+
+    budget_ms = CHUNK / SR * 1000
+    print(f"📊 Mixer jitter @ {CHUNK} frames ({budget_ms:.1f} ms period), /deck_eq flood {args.rate:.0f} msg/s, "
+          f"{args.seconds:.0f}s per mode")
+    print(f"{'receiver':<12} {'late p50':>9} {'late p99':>9} {'late max':>9} {'render p99':>11} {'received':>9}")
+    _mixer_loop(0.5)  # warm up NumPy and the allocator before measuring
+    rows = [("idle", 0.0, "blocking")] + [(m, args.rate, m) for m in args.modes]
+    for label, rate, mode in rows:
+        late, render, received = run(mode, rate, args.seconds)
+        print(f"{label:<12} {np.percentile(late, 50):>8.2f}ms {np.percentile(late, 99):>8.2f}ms "
+              f"{late.max():>8.2f}ms {np.percentile(render, 99):>9.2f}ms {received:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
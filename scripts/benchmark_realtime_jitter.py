@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixer-loop jitter with the server's real-time mode off and on.
+
+Each mode runs in a fresh process (gc.freeze, mlockall and the scheduling class
+can't be undone cleanly). The process holds a populated Python heap
+(``--heap-objects`` containers, like an interpreter with the server's imports
+and state). A background thread allocates cyclic garbage the way OSC handlers
+and loaders do. Optional ``--hogs`` busy processes stand in for the detector
+competing for the CPU. The mixer loop renders ``--players`` interpolated stems
+through ``_PlayerMatrix`` at the chunk period, sleeping until each deadline like
+a blocking device write would. It records
+
+- loop time: render time per chunk, including any GC pause or preemption
+- late: how far past its deadline the loop woke up
+
+``on`` applies what ``--realtime`` does in the server (realtime.py):
+gc.freeze + GC from the mixer, SCHED_FIFO or nice for the loop thread, mlockall.
+Without root/CAP_SYS_NICE/CAP_IPC_LOCK those fall back and the report says so.
+
+Usage:
+    python scripts/benchmark_realtime_jitter.py [--seconds 10] [--hogs 2] [--heap-objects 500000]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "audio-mixer"))
+from audio_server import AudioBuffer, StemPlayer, _PlayerMatrix  # noqa: E402
+from realtime import GCController, lock_memory, promote_thread  # noqa: E402
+
+SR = 44100
+CHUNK = 1024
+
+
+def _hog(stop) -> None:
+    """Busy CPU load (stand-in for the detector)."""
+    x = 0
+    while not stop.is_set():
+        for _ in range(100000):
+            x += 1
+
+
+def _churn(stop: threading.Event, rate: float) -> None:
+    """Cyclic garbage at ``rate`` objects/s, in 10 ms batches (handler/loader stand-in)."""
+    per_batch = max(1, int(rate * 0.01))
+    while not stop.is_set():
+        for i in range(per_batch):
+            a = {"i": i, "payload": [i, str(i)]}
+            b = {"peer": a}
+            a["peer"] = b
+        time.sleep(0.01)
+
+
+def _run(realtime: bool, seconds: float, heap_objects: int, churn_rate: float, players: int, wav: str, results) -> None:
+    heap = [{"k": i, "v": [i]} for i in range(heap_objects)]  # long-lived containers
+    buffers = [AudioBuffer(wav, 100 + i) for i in range(4)]
+    batch = []
+    for i in range(players):
+        p = StemPlayer(buffers[i % 4], rate=0.97, volume=0.5, start_pos=0.1 * i, interpolation="cubic")
+        p.playing = True
+        batch.append((p, i % 4, None))
+    matrix = _PlayerMatrix(CHUNK, decks=4)
+    bus = np.zeros((4, CHUNK, 2), dtype=np.float32)
+    mix = np.zeros((CHUNK, 2), dtype=np.float32)
+
+    status = {"thread": "normal priority", "memory": "not locked"}
+    gcc = None
+    if realtime:
+        gcc = GCController()
+        gcc.freeze()
+        gcc.start()
+        status["memory"] = lock_memory()
+        status["thread"] = promote_thread()
+
+    stop = threading.Event()
+    churn = threading.Thread(target=_churn, args=(stop, churn_rate), daemon=True)
+    churn.start()
+    period = CHUNK / SR
+    loop, late = [], []
+    t_next = time.perf_counter() + period
+    t_end = t_next + seconds
+    while t_next < t_end:
+        delay = t_next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = time.perf_counter()
+        late.append((t0 - t_next) * 1000)
+        bus.fill(0.0)
+        matrix.render(batch, bus, CHUNK, "cubic")
+        np.sum(bus, axis=0, out=mix)
+        np.tanh(mix, out=mix)
+        # Per-chunk Python bookkeeping, as the server's loop does
+        _ = [(p.position, p.rate) for p, _, _ in batch]
+        elapsed = time.perf_counter() - t0
+        loop.append(elapsed * 1000)
+        if gcc is not None:
+            gcc.tick(t0, True, period - elapsed)
+        t_next += period
+    stop.set()
+    churn.join()
+    del heap
+    results.put({
+        "loop": np.array(loop),
+        "late": np.array(late),
+        "status": status,
+        "gc": gcc.stats() if gcc is not None else None,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixer-loop jitter with real-time mode off and on")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration per mode (default: 10)")
+    parser.add_argument("--players", type=int, default=8, help="Interpolated stems rendered per chunk (default: 8)")
+    parser.add_argument("--heap-objects", type=int, default=500000,
+                        help="Long-lived containers on the heap (default: 500000)")
+    parser.add_argument("--churn", type=float, default=20000.0,
+                        help="Cyclic garbage objects allocated per second by a background thread (default: 20000)")
+    parser.add_argument("--hogs", type=int, default=0, help="Busy processes competing for the CPU (default: 0)")
+    args = parser.parse_args()
+
+    budget_ms = CHUNK / SR * 1000
+    print(f"📊 Mixer jitter @ {CHUNK} frames ({budget_ms:.1f} ms period), {args.players} cubic stems, "
+          f"{args.heap_objects} heap objects, {args.churn:.0f} garbage objects/s, {args.hogs} CPU hogs, "
+          f"{args.seconds:.0f}s per mode")
+    ctx = mp.get_context("spawn")
+    stop_hogs = ctx.Event()
+    hogs = [ctx.Process(target=_hog, args=(stop_hogs,), daemon=True) for _ in range(args.hogs)]
+    for h in hogs:
+        h.start()
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            wav = os.path.join(tmp, "stem.wav")
+            rng = np.random.default_rng(0)
+            sf.write(wav, (rng.standard_normal((SR * 10, 2)) * 0.1).astype(np.float32), SR, subtype="FLOAT")
+            for label, realtime in (("off", False), ("on", True)):
+                results = ctx.Queue()
+                proc = ctx.Process(target=_run, args=(realtime, args.seconds, args.heap_objects, args.churn,
+                                                      args.players, wav, results))
+                proc.start()
+                rows.append((label, results.get()))
+                proc.join()
+    finally:
+        stop_hogs.set()
+        for h in hogs:
+            h.join(timeout=2)
+
+    print(f"{'realtime':<9} {'loop p50':>9} {'loop p99':>9} {'loop max':>9} {'late p99':>9} {'late max':>9} "
+          f"{'over budget':>11}")
+    for label, r in rows:
+        loop, late = r["loop"], r["late"]
+        over = int(np.count_nonzero(loop + np.maximum(late, 0.0) > budget_ms))
+        print(f"{label:<9} {np.percentile(loop, 50):>7.2f}ms {np.percentile(loop, 99):>7.2f}ms "
+              f"{loop.max():>7.2f}ms {np.percentile(late, 99):>7.2f}ms {late.max():>7.2f}ms {over:>11}")
+    on = rows[-1][1]
+    print(f"   on: thread {on['status']['thread']}; memory {on['status']['memory']}")
+    gc_stats = on["gc"]
+    print(f"   on: {gc_stats['frozen']} objects frozen, {gc_stats['young_collections']} young collections "
+          f"from the mixer (max pause {gc_stats['max_pause_ms']:.2f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-chunk cost of the time-stretch input/output buffering.
+
+Compares the previous strategy (np.vstack to append + slicing from the front,
+which copies the whole backlog) with the circular float32 buffers now used by
+PythonAudioServer._apply_time_stretch, at the 86-chunk output target.
+
+The stretch itself is replaced by a cheap nearest-neighbour resample that is
+identical for both strategies, so the numbers isolate the buffer management.
+
+Usage:
+    python scripts/benchmark_stretch_buffers.py [--chunks 4000] [--chunk-size 1024] [--ratio 1.05]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "audio-mixer"))
+from audio_server import _AudioRingBuffer  # noqa: E402
+
+
+def _null_stretch(x: np.ndarray, ratio: float) -> np.ndarray:
+    """Stand-in for the TSM: ratio > 1 yields more frames (slower playback)."""
+    n_out = int(round(x.shape[0] * ratio))
+    idx = np.minimum((np.arange(n_out) / ratio).astype(np.int64), x.shape[0] - 1)
+    return x[idx]
+
+
+def _min_process(output_level: int, input_level: int, chunk: int) -> int:
+    """Same batch-size policy as _apply_time_stretch; 0 means wait for input."""
+    if output_level < chunk * 20:
+        min_process = chunk * 8
+    elif output_level < chunk * 43:
+        min_process = chunk * 16
+    else:
+        min_process = chunk * 64
+    if input_level < min_process:
+        if output_level < chunk * 2 and input_level >= chunk:
+            return chunk
+        if output_level < chunk * 4 and input_level >= chunk * 2:
+            return chunk * 2
+        return 0
+    return min_process
+
+
+class VstackBuffers:
+    """Previous implementation: grow with vstack, consume by slicing."""
+
+    def __init__(self, chunk: int, target: int, batch: int):
+        self.chunk, self.target, self.batch = chunk, target, batch
+        self.inp = np.zeros((0, 2), dtype=np.float32)
+        self.out = np.zeros((0, 2), dtype=np.float32)
+
+    def step(self, mix: np.ndarray, ratio: float) -> np.ndarray:
+        self.inp = np.vstack((self.inp, mix)) if self.inp.shape[0] > 0 else mix
+        while self.out.shape[0] < self.target:
+            if not _min_process(self.out.shape[0], self.inp.shape[0], self.chunk):
+                break
+            take = min(self.inp.shape[0], self.batch)
+            to_process = self.inp[:take]
+            self.inp = self.inp[take:]
+            stretched = _null_stretch(to_process, ratio)
+            self.out = np.vstack((self.out, stretched)) if self.out.shape[0] > 0 else stretched
+        if self.out.shape[0] >= self.chunk:
+            output = self.out[:self.chunk]
+            self.out = self.out[self.chunk:]
+            return output.astype(np.float32)
+        return np.zeros((self.chunk, 2), dtype=np.float32)
+
+
+class RingBuffers:
+    """Current implementation: fixed-capacity circular buffers."""
+
+    def __init__(self, chunk: int, target: int, batch: int):
+        self.chunk, self.target, self.batch = chunk, target, batch
+        self.inp = _AudioRingBuffer(batch * 2)
+        self.out = _AudioRingBuffer(target + batch * 2)
+        self.scratch = np.zeros((batch, 2), dtype=np.float32)
+        self.result = np.zeros((chunk, 2), dtype=np.float32)
+
+    def step(self, mix: np.ndarray, ratio: float) -> np.ndarray:
+        self.inp.reserve(mix.shape[0])
+        self.inp.write(mix)
+        while self.out.available < self.target:
+            if not _min_process(self.out.available, self.inp.available, self.chunk):
+                break
+            take = self.inp.read_into(self.scratch[:min(self.inp.available, self.batch)])
+            stretched = _null_stretch(self.scratch[:take], ratio)
+            self.out.reserve(stretched.shape[0])
+            self.out.write(stretched)
+        if self.out.available >= self.chunk:
+            self.out.read_into(self.result)
+            return self.result
+        self.result.fill(0.0)
+        return self.result
+
+
+def _measure(buffers, chunks: int, chunk: int, ratio: float):
+    rng = np.random.default_rng(0)
+    mixes = [(rng.standard_normal((chunk, 2)) * 0.1).astype(np.float32) for _ in range(16)]
+    times = np.empty(chunks)
+    digest = 0.0
+    for i in range(chunks):
+        t0 = time.perf_counter()
+        out = buffers.step(mixes[i % len(mixes)], ratio)
+        times[i] = time.perf_counter() - t0
+        digest += float(out[0, 0])
+    return times, digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time-stretch buffering (vstack vs ring)")
+    parser.add_argument("--chunks", type=int, default=4000, help="Chunks to process (default: 4000, ~93s of audio)")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Frames per chunk (default: 1024)")
+    parser.add_argument("--ratio", type=float, default=1.05, help="Stretch ratio (default: 1.05)")
+    args = parser.parse_args()
+
+    chunk = args.chunk_size
+    target = chunk * 86
+    batch = chunk * 64
+    budget_ms = chunk / 44100 * 1000
+
+    print(f"📊 Time-stretch buffering @ {chunk} frames/chunk, output target 86 chunks, "
+          f"ratio {args.ratio}, {args.chunks} chunks (budget {budget_ms:.1f} ms/chunk)")
+    print(f"{'strategy':<10} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10} {'max µs':>10}")
+    results = {}
+    for name, cls in (("vstack", VstackBuffers), ("ring", RingBuffers)):
+        times, digest = _measure(cls(chunk, target, batch), args.chunks, chunk, args.ratio)
+        us = times * 1e6
+        results[name] = (us.mean(), digest)
+        print(f"{name:<10} {us.mean():>10.1f} {np.percentile(us, 50):>10.1f} "
+              f"{np.percentile(us, 99):>10.1f} {us.max():>10.1f}")
+
+    if results["vstack"][1] != results["ring"][1]:
+        print("❌ Outputs differ between strategies")
+        return 1
+    print(f"✅ Identical output; ring is {results['vstack'][0] / results['ring'][0]:.1f}x faster per chunk")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark the time-stretch methods at 1024-sample chunks.
+
+Measures, for each method the audio server can use:
+- throughput: processing time per 1024-sample output chunk (and realtime factor)
+- latency: input that has to be fed before the first output chunk is ready,
+  plus (for batch methods) the time of the call that produces it
+
+Methods:
+- phase_vocoder       in-process NumPy phase vocoder (time_stretch.PhaseVocoderStretch)
+- audiotsm (stream)   one persistent WSOLA instance (time_stretch.AudiotsmStretch)
+- audiotsm (batch)    new WSOLA per 64-chunk batch (previous server behaviour)
+- pyrubberband        rubberband CLI per 64-chunk batch and per single chunk
+
+Missing optional libraries are reported and skipped.
+
+Usage:
+    python scripts/benchmark_time_stretch.py [--seconds 20] [--ratio 1.08]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "audio-mixer"))
+from time_stretch import AUDIOTSM_AVAILABLE, AudiotsmStretch, PhaseVocoderStretch  # noqa: E402
+
+try:
+    import pyrubberband as pyrb
+except Exception:
+    pyrb = None
+
+SR = 44100
+CHUNK = 1024
+BATCH_CHUNKS = 64
+
+
+class _Fifo:
+    """Minimal sink (reserve/write) collecting frames for the benchmark."""
+
+    def __init__(self):
+        self.blocks = []
+        self.available = 0
+
+    def reserve(self, n):
+        pass
+
+    def write(self, frames):
+        self.blocks.append(np.array(frames, dtype=np.float32))
+        self.available += frames.shape[0]
+        return frames.shape[0]
+
+
+def _test_signal(seconds: float) -> np.ndarray:
+    """Two-tone stereo signal with a beat-like amplitude envelope."""
+    t = np.arange(int(SR * seconds)) / SR
+    env = 0.6 + 0.4 * (np.sin(2 * np.pi * 2.0 * t) > 0)
+    left = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 1320 * t)
+    right = 0.3 * np.sin(2 * np.pi * 330 * t) + 0.1 * np.sin(2 * np.pi * 2640 * t)
+    return (np.column_stack([left, right]) * env[:, None]).astype(np.float32)
+
+
+def bench_streaming(stage, x: np.ndarray):
+    sink = _Fifo()
+    times = []
+    first_output_in = None
+    for i in range(0, x.shape[0] - CHUNK + 1, CHUNK):
+        t0 = time.perf_counter()
+        stage.process(x[i:i + CHUNK], sink)
+        times.append(time.perf_counter() - t0)
+        if first_output_in is None and sink.available >= CHUNK:
+            first_output_in = i + CHUNK
+    out_frames = max(sink.available, 1)
+    return {
+        "per_out_chunk_ms": sum(times) / (out_frames / CHUNK) * 1000,
+        "p99_call_ms": float(np.percentile(times, 99)) * 1000,
+        "latency_ms": (first_output_in or 0) / SR * 1000,
+    }
+
+
+def bench_batch(fn, x: np.ndarray, batch_frames: int):
+    times = []
+    out_frames = 0
+    for i in range(0, x.shape[0] - batch_frames + 1, batch_frames):
+        t0 = time.perf_counter()
+        y = fn(x[i:i + batch_frames])
+        times.append(time.perf_counter() - t0)
+        out_frames += y.shape[0]
+    if not times:
+        return None
+    return {
+        "per_out_chunk_ms": sum(times) / (max(out_frames, 1) / CHUNK) * 1000,
+        "p99_call_ms": float(np.percentile(times, 99)) * 1000,
+        "latency_ms": batch_frames / SR * 1000 + float(np.median(times)) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time-stretch methods at 1024-sample chunks")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Length of the test signal (default: 20)")
+    parser.add_argument("--ratio", type=float, default=1.08,
+                        help="Stretch ratio base_bpm/current_bpm (default: 1.08, e.g. 120→111 BPM)")
+    args = parser.parse_args()
+
+    x = _test_signal(args.seconds)
+    ratio = args.ratio
+    budget_ms = CHUNK / SR * 1000
+    results = {}
+
+    results["phase_vocoder"] = bench_streaming(PhaseVocoderStretch(ratio=ratio), x)
+
+    if AUDIOTSM_AVAILABLE:
+        from audiotsm import wsola
+        from audiotsm.io.array import ArrayReader, ArrayWriter
+
+        results["audiotsm (stream)"] = bench_streaming(AudiotsmStretch(ratio=ratio), x)
+
+        def _audiotsm_batch(block):
+            reader = ArrayReader(block.T)
+            writer = ArrayWriter(channels=2)
+            wsola(reader.channels, speed=1.0 / ratio).run(reader, writer)
+            return writer.data.T.astype(np.float32)
+
+        results["audiotsm (batch)"] = bench_batch(_audiotsm_batch, x, CHUNK * BATCH_CHUNKS)
+    else:
+        print("⚠️  audiotsm not installed - skipping")
+
+    if pyrb is not None:
+        try:
+            def _rubberband(block):
+                return pyrb.time_stretch(block, SR, ratio)
+
+            results["pyrubberband (batch)"] = bench_batch(_rubberband, x, CHUNK * BATCH_CHUNKS)
+            results["pyrubberband (1024)"] = bench_batch(_rubberband, x[:CHUNK * 40], CHUNK)
+        except Exception as exc:
+            print(f"⚠️  pyrubberband failed ({exc}) - is the rubberband CLI installed?")
+    else:
+        print("⚠️  pyrubberband not installed - skipping")
+
+    print(f"\n📊 Time-stretch @ {CHUNK} samples/chunk, ratio {ratio}, {args.seconds:.0f}s signal "
+          f"(budget {budget_ms:.1f} ms/chunk)")
+    print(f"{'method':<22} {'ms/chunk':>9} {'x realtime':>11} {'p99 call ms':>12} {'latency ms':>11}")
+    for name, r in results.items():
+        if r is None:
+            continue
+        rt = budget_ms / r["per_out_chunk_ms"] if r["per_out_chunk_ms"] > 0 else float("inf")
+        print(f"{name:<22} {r['per_out_chunk_ms']:>9.3f} {rt:>11.1f} {r['p99_call_ms']:>12.2f} {r['latency_ms']:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import sys
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# audio-mixer/ is a directory of scripts, not an installed package
+AUDIO_MIXER_DIR = Path(__file__).resolve().parents[2] / "audio-mixer"
+if str(AUDIO_MIXER_DIR) not in sys.path:
+    sys.path.insert(0, str(AUDIO_MIXER_DIR))
+
+# audio_server imports PyAudio at module level, but nothing under test opens a
+# stream. Without PortAudio, stand in the constants it reads so the suite runs.
+try:
+    import pyaudio  # noqa: F401
+except ImportError:
+    pyaudio = types.ModuleType("pyaudio")
+    pyaudio.paFloat32 = 1
+    pyaudio.paContinue = 0
+    pyaudio.PyAudio = None
+    pyaudio.Stream = None
+    sys.modules["pyaudio"] = pyaudio
+
+SR = 44100
+
+
+@pytest.fixture
+def wav_track(tmp_path):
+    """Factory writing a stereo WAV into ``tmp_path``; returns ``(path, data)``.
+
+    Seeded noise by default; pass ``data`` to write specific samples.
+    """
+    def write(name="track.wav", frames=20000, seed=0, data=None, subtype="FLOAT", sample_rate=SR):
+        if data is None:
+            data = (np.random.default_rng(seed).standard_normal((frames, 2)) * 0.25).astype(np.float32)
+        path = tmp_path / name
+        sf.write(path, data, sample_rate, subtype=subtype)
+        return path, data
+
+    return write
+
+
+class FakeStream:
+    """Output stream that hands every written chunk to ``on_write`` instead of a device.
+
+    Without ``on_write`` it paces the mixer like a device would (one chunk per chunk time).
+    """
+
+    def __init__(self, on_write=None, **kwargs):
+        self.kwargs = kwargs
+        self.on_write = on_write
+        self.chunks = 0
+
+    def write(self, frames, num_frames=None, exception_on_underflow=False):
+        self.chunks += 1
+        if self.on_write is not None:
+            self.on_write(frames)
+        else:
+            time.sleep(len(frames) / SR)
+
+    def is_active(self):
+        return True
+
+    def start_stream(self):
+        pass
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePyAudio:
+    def __init__(self, on_write=None):
+        self.on_write = on_write
+        self.streams = []
+
+    def open(self, **kwargs):
+        stream = FakeStream(self.on_write, **kwargs)
+        self.streams.append(stream)
+        return stream
+
+    def terminate(self):
+        pass
+
+
+@pytest.fixture
+def make_server(monkeypatch):
+    """Factory of PythonAudioServer instances on a fake PyAudio (OSC on a free port).
+
+    The mixer thread starts in the constructor, as with a real device;
+    ``on_write(frames)`` sees every chunk it renders. Servers are torn down
+    after the test.
+    """
+    import audio_server
+
+    servers = []
+
+    def make(on_write=None, **kwargs):
+        monkeypatch.setattr(audio_server.pyaudio, "PyAudio", lambda: FakePyAudio(on_write))
+        kwargs.setdefault("osc_port", 0)
+        server = audio_server.PythonAudioServer(**kwargs)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.running = False
+        thread = getattr(server, "audio_thread", None)
+        if thread is not None:
+            thread.join(2.0)
+        if server.osc_server is not None:
+            server.osc_server.server_close()
@@ -0,0 +1,37 @@
+import threading
+
+import numpy as np
+
+from audio_cache import DecodedAudioCache
+
+
+def test_store_then_load_roundtrip(tmp_path, wav_track):
+    path, data = wav_track()
+    cache = DecodedAudioCache(tmp_path / "cache")
+
+    assert cache.load(path) is None
+    entry = cache.store(path, data)
+    assert entry is not None and entry.exists()
+    np.testing.assert_array_equal(cache.load(path), data)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_concurrent_stores_of_one_track_do_not_interleave(tmp_path, wav_track):
+    path, data = wav_track(frames=200000)
+    cache = DecodedAudioCache(tmp_path / "cache")
+    barrier = threading.Barrier(6)
+    entries = []
+
+    def store():
+        barrier.wait()
+        entries.append(cache.store(path, data))
+
+    threads = [threading.Thread(target=store) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(entries)) == 1 and None not in entries
+    np.testing.assert_array_equal(cache.load(path), data)
+    assert not list((tmp_path / "cache").glob("*.tmp"))
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import AudioBuffer, _BufferRegistry
+
+FRAMES = 4096
+BUFFER_BYTES = FRAMES * 2 * 4  # float32 stereo
+
+
+@pytest.fixture
+def registry(wav_track):
+    """Four resident buffers; buffer 1 was used longest ago, buffer 4 most recently."""
+    reg = _BufferRegistry(budget_bytes=2 * BUFFER_BYTES)
+    for i in range(1, 5):
+        path, _ = wav_track(f"track_{i}.wav", data=np.full((FRAMES, 2), 0.01 * i, dtype=np.float32))
+        buf = AudioBuffer(path, i)
+        buf.last_used = float(i)
+        reg[i] = buf
+    return reg
+
+
+def test_evicts_least_recently_used_until_within_budget(registry):
+    assert registry.resident_bytes() == 4 * BUFFER_BYTES
+    assert registry.enforce(set()) == [1, 2]
+    assert registry.resident_bytes() == 2 * BUFFER_BYTES
+    assert registry.evictions == 2
+    assert [b for b, buf in registry.items() if buf.resident_bytes] == [3, 4]
+
+
+def test_buffers_in_use_are_never_evicted(registry):
+    registry[1].last_used = registry[2].last_used = 0.0
+    assert registry.enforce({1, 2}) == [3, 4]
+    assert registry[1].resident_bytes and registry[2].resident_bytes
+
+
+def test_in_use_counts_as_used_now(registry):
+    registry.budget_bytes = 0
+    registry.enforce({1})
+    assert registry[1].last_used > registry[4].last_used
+    registry.budget_bytes = 3 * BUFFER_BYTES
+    assert registry.enforce(set()) == [2]
+
+
+def test_kept_buffers_are_protected_without_being_touched(registry):
+    assert registry.enforce(set(), keep=(1,)) == [2, 3]
+    assert registry[1].last_used == 1.0
+
+
+def test_budget_exceeded_when_everything_is_in_use(registry):
+    assert registry.enforce({1, 2, 3}, keep=(4,)) == []
+    assert registry.resident_bytes() == 4 * BUFFER_BYTES
+
+
+def test_decoding_buffers_are_skipped(registry):
+    registry[1].decode = SimpleNamespace(done=False, cancelled=False)
+    assert registry[1].decoding
+    assert registry.enforce(set()) == [2, 3]
+
+
+def test_unlimited_budget_evicts_nothing(registry):
+    registry.budget_bytes = 0
+    assert registry.enforce(set()) == []
+
+
+def test_evicted_buffer_reloads(registry):
+    registry.enforce(set())
+    buf = registry[1]
+    assert buf.audio_data is None and buf.loaded
+    assert buf.ensure_resident()
+    assert buf.resident_bytes == BUFFER_BYTES
+    assert buf.reloads == 1
+    assert registry.stats()["evicted"] == 1
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import _ControlTable
+
+
+def test_last_value_wins():
+    applied = []
+    table = _ControlTable(lambda key, value: applied.append((key, value)))
+    for value in range(5):
+        table.post(("A", "volume"), value)
+    table.post(("B", "volume"), 0.5)
+
+    assert table.drain() == 2
+    assert sorted(applied) == [(("A", "volume"), 4), (("B", "volume"), 0.5)]
+    assert table.stats() == {"received": 6, "applied": 2, "pending": 0, "coalesced": 4}
+
+
+def test_drain_empties_the_table():
+    applied = []
+    table = _ControlTable(lambda key, value: applied.append((key, value)))
+    assert table.drain() == 0
+
+    table.post("x", 1)
+    table.drain()
+    assert table.drain() == 0
+    table.post("x", 2)
+    assert table.stats()["pending"] == 1
+    table.drain()
+    assert applied == [("x", 1), ("x", 2)]
+    assert table.stats() == {"received": 2, "applied": 2, "pending": 0, "coalesced": 0}
+
+
+def test_failing_slot_does_not_block_the_others():
+    applied = []
+
+    def apply(key, value):
+        if key == "bad":
+            raise ValueError("unknown band")
+        applied.append(key)
+
+    table = _ControlTable(apply)
+    table.post("bad", 1)
+    table.post("good", 2)
+    assert table.drain() == 2
+    assert applied == ["good"]
+    assert table.stats()["pending"] == 0
@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import _DegradationLadder
+
+BUDGET = 0.010  # 10 ms chunk
+CALM = 0.3 * BUDGET
+BUSY = 0.65 * BUDGET  # between low and high: neither steps
+HOT = 0.9 * BUDGET
+
+
+class _Feed:
+    """Feeds whole windows of equal loop times (three loops per 1 s window)."""
+
+    def __init__(self, **kwargs):
+        self.ladder = _DegradationLadder(("interpolation", "filters"), **kwargs)
+        self.now = 0.0
+
+    def windows(self, n, loop_time, degraded=True, spike=None):
+        decisions = []
+        for _ in range(n):
+            for i in range(3):
+                t = spike if spike is not None and i == 1 else loop_time
+                decision = self.ladder.observe(self.now, t, BUDGET, degraded)
+                self.now += 0.5
+            decisions.append(decision)
+        return decisions
+
+
+def test_rejects_unknown_steps_and_bad_thresholds():
+    with pytest.raises(ValueError):
+        _DegradationLadder(("interpolation", "reverb"))
+    with pytest.raises(ValueError):
+        _DegradationLadder(("filters",), high=0.5, low=0.6)
+
+
+def test_steps_down_after_consecutive_overloaded_windows():
+    feed = _Feed(down_windows=2)
+    assert feed.windows(3, HOT, degraded=False) == [0, -1, 0]
+    assert feed.ladder.last_window == (pytest.approx(9.0), pytest.approx(9.0))
+
+
+def test_one_overrun_marks_the_window_overloaded():
+    feed = _Feed(down_windows=2)
+    assert feed.windows(2, CALM, degraded=False, spike=1.5 * BUDGET) == [0, -1]
+
+
+def test_overloaded_windows_must_be_consecutive():
+    feed = _Feed(down_windows=2)
+    decisions = feed.windows(1, HOT) + feed.windows(1, BUSY) + feed.windows(1, HOT)
+    assert decisions == [0, 0, 0]
+
+
+def test_steps_up_after_calm_windows_only_when_degraded():
+    feed = _Feed(up_windows=3)
+    assert feed.windows(5, CALM, degraded=False) == [0] * 5
+    assert feed.windows(3, CALM) == [0, 0, 1]
+
+
+def test_hysteresis_band_holds_the_current_rung():
+    feed = _Feed(down_windows=1, up_windows=2)
+    assert feed.windows(20, BUSY) == [0] * 20
+    # A spike above ``high`` of the budget (not an overrun) also breaks the calm stretch
+    assert feed.windows(1, CALM) + feed.windows(1, CALM, spike=HOT) + feed.windows(1, CALM) == [0, 0, 0]
+
+
+def test_restoring_too_early_doubles_the_calm_stretch():
+    feed = _Feed(down_windows=1, up_windows=3)
+    assert feed.windows(1, HOT) == [-1]
+    assert feed.windows(3, CALM) == [0, 0, 1]
+    assert feed.windows(1, HOT) == [-1]  # overloaded again right after the restore
+    assert feed.windows(6, CALM) == [0] * 5 + [1]
+
+    assert feed.ladder._up_required == 6
+    feed.ladder.settled()  # back at full quality
+    assert feed.ladder._up_required == 3
+
+
+def test_backoff_is_capped():
+    feed = _Feed(down_windows=1, up_windows=1)
+    for _ in range(8):
+        assert feed.windows(1, HOT) == [-1]
+        while feed.windows(1, CALM) != [1]:
+            pass
+    assert feed.ladder._up_required == 16
+
+
+def test_late_restore_keeps_the_calm_stretch():
+    feed = _Feed(down_windows=1, up_windows=2)
+    assert feed.windows(1, HOT) == [-1]
+    assert feed.windows(2, CALM) == [0, 1]
+    feed.windows(9, BUSY)  # longer than 4 * up_windows after the restore
+    assert feed.windows(1, HOT) == [-1]
+    assert feed.windows(2, CALM) == [0, 1]
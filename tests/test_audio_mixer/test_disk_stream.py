@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from disk_stream import DiskStream
+
+FRAMES = 40000
+BLOCK = 1024
+
+
+class _ManualReader:
+    """Stands in for the read-ahead thread; the test calls ``service`` itself."""
+
+    def __init__(self):
+        self.wakes = 0
+
+    def register(self, stream):
+        pass
+
+    def wake(self):
+        self.wakes += 1
+
+
+@pytest.fixture
+def ramp(wav_track):
+    """Stereo file whose left channel holds the frame index (scaled exactly into float32)."""
+    index = np.arange(FRAMES, dtype=np.float32) / 65536
+    return wav_track("ramp.wav", data=np.stack([index, -index], axis=1))[0]
+
+
+def _stream(path, start_frame=0, loop=True):
+    return DiskStream(path, start_frame=start_frame, loop=loop, ring_seconds=0.25,
+                      block_frames=BLOCK, reader=_ManualReader())
+
+
+def _frames(stream, n=256):
+    """File frames returned by ``peek``: the history frame first, then ``position`` on."""
+    out = np.zeros((n + DiskStream.HISTORY, 2), dtype=np.float32)
+    got = stream.peek(out)
+    return np.rint(out[:got, 0] * 65536).astype(int).tolist()
+
+
+def test_primed_on_open_with_history_before_the_start(ramp):
+    stream = _stream(ramp, start_frame=5000)
+    assert stream.available > 0
+    assert _frames(stream, 4) == [4999, 5000, 5001, 5002, 5003]
+
+
+def test_consume_advances_through_the_ring(ramp):
+    stream = _stream(ramp)
+    stream.consume(300)
+    assert stream.position == 300
+    assert _frames(stream, 3) == [299, 300, 301, 302]
+    assert stream.underruns == 0
+
+
+def test_seek_is_pending_until_the_reader_catches_up(ramp):
+    stream = _stream(ramp)
+    stream.consume(100)
+    stream.seek(20000)
+    assert stream.seeking
+    assert stream.position == 20000
+    assert stream.peek(np.zeros((8, 2), dtype=np.float32)) == 0
+
+    stream.service()
+    assert not stream.seeking
+    assert _frames(stream, 3) == [19999, 20000, 20001, 20002]
+
+
+def test_frames_played_during_a_seek_are_skipped(ramp):
+    stream = _stream(ramp)
+    stream.seek(20000)
+    stream.consume(256)  # the audio thread keeps going while the seek is pending
+    assert stream.underruns == 1
+    assert stream.position == 20256
+
+    stream.service()
+    assert _frames(stream, 2)[1:] == [20256, 20257]
+
+
+def test_underrun_keeps_the_timeline_and_counts_the_skip(ramp):
+    stream = _stream(ramp)
+    have = stream.available
+    stream.consume(have + 500)
+    assert stream.underruns == 1
+    assert stream.position == have + 500
+    assert stream._skip_requested == 500
+    assert stream.stats()["underruns"] == 1
+
+    stream.service()
+    assert stream._skip_done == stream._skip_requested
+    assert _frames(stream, 2)[1:] == [have + 500, have + 501]
+
+
+def test_loop_wraps_to_the_start(ramp):
+    stream = _stream(ramp, start_frame=FRAMES - 100)
+    assert _frames(stream, 102)[-3:] == [FRAMES - 1, 0, 1]
+
+    stream.consume(150)
+    assert stream.position == 50
+
+
+def test_one_shot_plays_silence_past_the_end(ramp):
+    stream = _stream(ramp, start_frame=FRAMES - 10, loop=False)
+    out = np.ones((21, 2), dtype=np.float32)
+    assert stream.peek(out) == 21
+    assert np.all(out[11:] == 0.0)
+    stream.consume(20)
+    assert stream.position == FRAMES + 10
+
+
+def test_set_loop_region_rereads_inside_it(ramp):
+    stream = _stream(ramp)
+    stream.set_loop(True, 1000, 2000)
+    stream.service()
+    assert stream.position == 0
+    stream.seek(1990)
+    stream.service()
+    assert _frames(stream, 12)[-3:] == [1999, 1000, 1001]
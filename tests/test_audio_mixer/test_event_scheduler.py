@@ -0,0 +1,192 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import PythonAudioServer, _ControlTable, _EventScheduler
+
+SR = 44100
+
+
+def _recorder(scheduler, log, name):
+    return lambda: log.append((name, scheduler.current_frame))
+
+
+def test_next_offset_within_chunk():
+    sched = _EventScheduler(SR)
+    assert sched.next_offset(0, 512) is None
+
+    sched.schedule(1000, lambda: None)
+    assert sched.next_offset(0, 512) is None      # next chunk
+    assert sched.next_offset(512, 512) == 488
+    assert sched.next_offset(1024, 512) == 0      # already late: start of the chunk
+
+
+def test_run_due_in_frame_order_fifo_on_ties():
+    sched = _EventScheduler(SR)
+    log = []
+    sched.schedule(300, _recorder(sched, log, "c"))
+    sched.schedule(100, _recorder(sched, log, "a"))
+    sched.schedule(100, _recorder(sched, log, "b"))
+    sched.schedule(900, _recorder(sched, log, "d"))
+
+    sched.run_due(100)
+    assert log == [("a", 100), ("b", 100)]
+    sched.run_due(500)
+    assert log[-1] == ("c", 500)
+    assert sched.pending == 1
+    assert sched.late == 1
+    assert sched.max_late_frames == 200
+
+
+def test_lateness_stats():
+    sched = _EventScheduler(SR)
+    sched.schedule(0, lambda: None)
+    sched.schedule(441, lambda: None)
+    sched.run_due(441)
+
+    stats = sched.stats()
+    assert stats["applied"] == 2
+    assert stats["late"] == 1
+    assert stats["pending"] == 0
+    assert stats["max_late_ms"] == pytest.approx(10.0)
+    assert stats["mean_late_ms"] == pytest.approx(10.0)
+
+
+def test_schedule_many_and_frame_for_time():
+    sched = _EventScheduler(SR)
+    sched.frame = 4410
+    sched.publish(100.0, SR)
+    assert sched.frame_for_time(100.0) == 4410
+    assert sched.frame_for_time(100.5) == 4410 + SR // 2
+    assert sched.frame_for_time(100.0 + 37 / SR) == 4410 + 37
+
+    sched.schedule_many([(5000, lambda: None), (4500, lambda: None)])
+    assert sched.pending == 2
+    assert sched.next_offset(4410, 1024) == 90
+
+
+def _mix_server(sched, chunk_size=512):
+    segments = []
+    server = SimpleNamespace(
+        chunk_size=chunk_size,
+        _scheduler=sched,
+        _control=_ControlTable(lambda key, value: None),
+        _mix_out=np.zeros((chunk_size, 2), dtype=np.float32),
+        _render_segment=lambda a, b: segments.append((a, b)),
+    )
+    return server, segments
+
+
+def test_render_mix_splits_at_event_offsets():
+    sched = _EventScheduler(SR)
+    sched.frame = 1024
+    log = []
+    server, segments = _mix_server(sched)
+    for frame in (1024 + 100, 1024 + 100, 1024 + 300, 1024 + 512):
+        sched.schedule(frame, _recorder(sched, log, frame - 1024))
+
+    PythonAudioServer._render_mix(server)
+    assert segments == [(0, 100), (100, 300), (300, 512)]
+    assert log == [(100, 1124), (100, 1124), (300, 1324)]
+    assert sched.frame == 1536
+    assert sched.pending == 1  # due at the first frame of the next chunk
+
+    segments.clear()
+    PythonAudioServer._render_mix(server)
+    assert segments == [(0, 512)]
+    assert log[-1] == (512, 1536)
+
+
+def test_render_mix_runs_late_events_first_without_empty_segment():
+    sched = _EventScheduler(SR)
+    sched.frame = 2048
+    log = []
+    server, segments = _mix_server(sched)
+    sched.schedule(2000, _recorder(sched, log, "late"))
+    sched.schedule(2048 + 511, _recorder(sched, log, "last"))
+
+    PythonAudioServer._render_mix(server)
+    assert segments == [(0, 511), (511, 512)]
+    assert log == [("late", 2048), ("last", 2559)]
+    assert sched.late == 1
+
+
+def test_render_mix_event_scheduled_by_event():
+    sched = _EventScheduler(SR)
+    log = []
+    server, segments = _mix_server(sched)
+
+    def first():
+        log.append(("first", sched.current_frame))
+        sched.schedule(sched.current_frame + 50, _recorder(sched, log, "second"))
+
+    sched.schedule(200, first)
+    PythonAudioServer._render_mix(server)
+    assert segments == [(0, 200), (200, 250), (250, 512)]
+    assert log == [("first", 200), ("second", 250)]
+
+
+def _gate_server(sched, chunk_size=512):
+    """Stand-in whose render writes each deck's gate (0 until started, then 1)."""
+    gates = np.zeros(2, dtype=np.float32)
+    server = SimpleNamespace(chunk_size=chunk_size, _scheduler=sched,
+                             _control=_ControlTable(lambda key, value: None),
+                             _mix_out=np.zeros((chunk_size, 2), dtype=np.float32))
+
+    def render(a, b):
+        server._mix_out[a:b] = gates
+
+    server._render_segment = render
+    return server, gates
+
+
+def _render_chunks(server, count):
+    return np.concatenate([PythonAudioServer._render_mix(server).copy() for _ in range(count)])
+
+
+@pytest.mark.parametrize("target", [0, 1, 337, 511, 512, 513, 1500, 2047])
+def test_start_lands_on_its_exact_sample(target):
+    sched = _EventScheduler(SR)
+    sched.publish(50.0, SR)
+    server, gates = _gate_server(sched)
+
+    frame = sched.schedule(sched.frame_for_time(50.0 + target / SR), lambda: gates.__setitem__(0, 1.0))
+    assert frame == target
+    out = _render_chunks(server, 4)
+    assert np.flatnonzero(out[:, 0])[0] == target
+    assert np.all(out[target:, 0] == 1.0)
+    assert sched.late == 0
+
+
+def test_decks_start_the_requested_number_of_samples_apart():
+    sched = _EventScheduler(SR)
+    sched.frame = 10 * 512
+    sched.publish(10.0, SR)
+    server, gates = _gate_server(sched)
+
+    # B starts 10 ms (441 samples) after A, across a chunk boundary
+    start_a = sched.frame_for_time(10.0 + 0.0101)
+    start_b = sched.frame_for_time(10.0 + 0.0201)
+    sched.schedule(start_a, lambda: gates.__setitem__(0, 1.0))
+    sched.schedule(start_b, lambda: gates.__setitem__(1, 1.0))
+    out = _render_chunks(server, 3)
+
+    first_a = np.flatnonzero(out[:, 0])[0]
+    first_b = np.flatnonzero(out[:, 1])[0]
+    assert first_b - first_a == 441
+    assert first_a == start_a - 10 * 512
+
+
+def test_late_start_is_reported_in_samples():
+    sched = _EventScheduler(SR)
+    sched.frame = 1024
+    server, gates = _gate_server(sched)
+
+    sched.schedule(1000, lambda: gates.__setitem__(0, 1.0))  # already rendered
+    out = _render_chunks(server, 1)
+    assert np.all(out[:, 0] == 1.0)  # runs at the first frame of the chunk
+    assert sched.max_late_frames == 24
+    assert sched.stats()["max_late_ms"] == pytest.approx(24 * 1000.0 / SR)
@@ -0,0 +1,77 @@
+import gc
+
+import pytest
+
+from realtime import GCController
+
+THRESHOLDS = (700, 10, 10)
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    """A started controller whose view of the GC is ``counts``; collections land in ``collected``."""
+    counts = [0, 0, 0]
+    collected = []
+    monkeypatch.setattr(gc, "get_threshold", lambda: THRESHOLDS)
+    monkeypatch.setattr(gc, "get_count", lambda: tuple(counts))
+    monkeypatch.setattr(gc, "collect", lambda generation=2: collected.append(generation) or 0)
+    controller = GCController(idle_interval_s=2.0, min_headroom_s=0.005)
+    controller.start()
+    yield controller, counts, collected
+    controller.stop()
+
+
+def test_no_collection_while_playing_below_threshold(collector):
+    controller, counts, collected = collector
+    counts[0] = THRESHOLDS[0] - 1
+    controller.tick(10.0, playing=True, headroom_s=0.02)
+    assert collected == []
+
+
+def test_no_collection_while_playing_without_headroom(collector):
+    controller, counts, collected = collector
+    counts[0] = THRESHOLDS[0] * 3
+    controller.tick(10.0, playing=True, headroom_s=0.004)
+    assert collected == []
+
+    controller.tick(10.01, playing=True, headroom_s=0.005)
+    assert collected == [0]
+    assert controller.young_collections == 1
+
+
+def test_generation_1_is_collected_once_its_count_passes_threshold(collector):
+    controller, counts, collected = collector
+    counts[:2] = [THRESHOLDS[0], THRESHOLDS[1] - 1]
+    controller.tick(10.0, playing=True, headroom_s=0.02)
+    counts[:2] = [THRESHOLDS[0], THRESHOLDS[1]]
+    controller.tick(10.01, playing=True, headroom_s=0.02)
+    assert collected == [0, 1]
+
+
+def test_idle_full_collection_is_rate_limited(collector):
+    controller, counts, collected = collector
+    for now in (10.0, 10.5, 11.9, 12.0, 13.0, 14.1):
+        controller.tick(now, playing=False, headroom_s=0.0)
+    assert collected == [2, 2, 2]
+    assert controller.full_collections == 3
+
+
+def test_tick_is_a_no_op_until_started(monkeypatch):
+    collected = []
+    monkeypatch.setattr(gc, "collect", lambda generation=2: collected.append(generation) or 0)
+    GCController().tick(100.0, playing=False, headroom_s=0.0)
+    assert collected == []
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_stop_restores_automatic_collection(enabled):
+    was_enabled = gc.isenabled()
+    try:
+        gc.enable() if enabled else gc.disable()
+        controller = GCController()
+        controller.start()
+        assert not gc.isenabled()
+        controller.stop()
+        assert gc.isenabled() is enabled
+    finally:
+        gc.enable() if was_enabled else gc.disable()
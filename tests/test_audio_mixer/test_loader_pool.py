@@ -0,0 +1,103 @@
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from pythonosc.osc_message import OscMessage
+
+
+@pytest.fixture
+def gated_server(make_server):
+    """Server whose decodes block until ``server.release(path)`` (or ``release()`` for all)."""
+    server = make_server()
+    decode = server._decode_buffer
+    gates = {}
+    lock = threading.Lock()
+
+    def gate(path):
+        with lock:
+            return gates.setdefault(str(path), threading.Event())
+
+    def gated_decode(buffer_id, path, *args, **kwargs):
+        assert gate(path).wait(5.0)
+        return decode(buffer_id, path, *args, **kwargs)
+
+    def release(path=None):
+        with lock:
+            events = list(gates.values()) if path is None else [gates.setdefault(str(path), threading.Event())]
+        for event in events:
+            event.set()
+
+    server._decode_buffer = gated_decode
+    server.release = release
+    yield server
+    release()
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_newer_load_supersedes_older_one(gated_server, wav_track):
+    old_path, _ = wav_track("old.wav")
+    new_path, _ = wav_track("new.wav", seed=1)
+    results = {}
+
+    old = gated_server._submit_load(100, old_path, "old", lambda buf, current: results.setdefault("old", (buf, current)))
+    new = gated_server._submit_load(100, new_path, "new", lambda buf, current: results.setdefault("new", (buf, current)))
+    gated_server.release(new_path)
+    assert new.result(5.0) is not None
+    gated_server.release(old_path)
+    assert old.result(5.0) is None
+
+    assert results["old"] == (None, False)
+    buf, current = results["new"]
+    assert current and buf is gated_server.buffers[100]
+    assert gated_server.buffers[100].file_path == str(new_path)
+    assert 100 not in gated_server._pending_loads
+
+
+def test_start_group_waits_for_deck_ready(gated_server, wav_track):
+    path, _ = wav_track()
+    gated_server.osc_cue(None, "/cue", "A", str(path), 0.5)
+    assert not gated_server._deck_ready["A"].is_set()
+
+    handler = threading.Thread(target=gated_server.osc_start_group, args=("/start_group", 0.0, "A"))
+    handler.start()
+    time.sleep(0.2)
+    # The group start is blocked on the deck's ready event
+    assert "A" not in gated_server._deck_actual_start and 100 not in gated_server.active_players
+
+    gated_server.release()
+    handler.join(5.0)
+    assert _wait_until(lambda: "A" in gated_server._deck_actual_start)
+    assert gated_server._armed["A"] == 100
+    assert gated_server.active_players[100].playing
+
+
+def test_cue_ready_reply_carries_load_ms(make_server, wav_track):
+    server = make_server()
+    path, _ = wav_track()
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client.bind(("127.0.0.1", 0))
+    client.settimeout(5.0)
+    try:
+        server.osc_cue(client.getsockname(), "/cue", "B", str(path))
+        reply = OscMessage(client.recv(1024))
+    finally:
+        client.close()
+
+    assert reply.address == "/cue_ready"
+    deck, buffer_id, load_ms = reply.params
+    assert (deck, buffer_id) == ("B", 1100)
+    assert load_ms == pytest.approx(server._last_load_ms["B"], abs=1e-3)
+    assert load_ms >= 0.0
+    assert server._deck_ready["B"].is_set() and server._armed["B"] == 1100
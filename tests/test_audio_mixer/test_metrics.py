@@ -0,0 +1,156 @@
+import re
+import tracemalloc
+
+import pytest
+
+import metrics
+from metrics import LoopHistogram, MetricsRegistry
+
+
+@pytest.mark.parametrize("us", [0, 1, 127, 128, 129, 1000, 5803, 23219, 10 ** 6, 3 * 10 ** 8])
+def test_bucket_holds_its_value_within_the_precision(us):
+    index = LoopHistogram._index(us)
+    if us < 128:
+        assert LoopHistogram._value(index) == us
+    else:
+        assert LoopHistogram._value(index) == pytest.approx(us, rel=1 / 64)
+
+
+def test_bucket_index_is_monotonic_and_in_range():
+    hist = LoopHistogram()
+    indices = [LoopHistogram._index(us) for us in range(0, 1 << 20, 37)]
+    assert indices == sorted(indices)
+    assert LoopHistogram._index(1 << 60) == len(hist.counts) - 1
+
+
+def test_quantiles():
+    hist = LoopHistogram()
+    for ms in range(1, 101):  # 1..100 ms
+        hist.record(ms / 1000.0)
+    assert hist.count == 100
+    assert hist.total == pytest.approx(5.05)
+    assert hist.quantile(0.5) == pytest.approx(0.050, rel=1 / 64)
+    assert hist.quantile(0.95) == pytest.approx(0.095, rel=1 / 64)
+    assert hist.quantile(0.99) == pytest.approx(0.099, rel=1 / 64)
+    assert hist.quantile(1.0) == 0.1
+    assert LoopHistogram().quantile(0.5) == 0.0
+
+
+def test_quantile_never_exceeds_the_max():
+    hist = LoopHistogram()
+    hist.record(0.0058)
+    assert hist.quantile(0.5) <= hist.max == 0.0058
+
+
+def test_since_reports_only_later_values():
+    hist = LoopHistogram()
+    for _ in range(10):
+        hist.record(0.050)
+    mark = hist.copy()
+    hist.record(0.002)
+    hist.record(0.003)
+
+    recent = hist.since(mark)
+    assert recent.count == 2
+    assert recent.total == pytest.approx(0.005)
+    assert recent.max == pytest.approx(0.003, rel=1 / 64)
+    assert recent.quantile(0.99) < 0.01
+
+
+def test_record_loop_allocates_nothing():
+    reg = MetricsRegistry()
+    reg.register_rate("msgs_per_second", "help", lambda: {"/a": 1}, label="address")
+    for _ in range(100):
+        reg.record_loop(0.004)
+    tracemalloc.start()
+    try:
+        for i in range(1000):
+            reg.record_loop(0.001 + (i % 50) * 1e-4)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 512
+
+
+def test_recent_window_rotates_on_read(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(metrics.time, "perf_counter", lambda: clock[0])
+    reg = MetricsRegistry(window_s=10.0)
+    reg.record_loop(0.050)
+
+    clock[0] = 105.0
+    assert reg.recent().count == 1  # first window: since start
+    clock[0] = 111.0
+    reg.record_loop(0.002)
+    assert reg.recent().count == 2  # marks now at start and 111 s
+    clock[0] = 122.0
+    reg.record_loop(0.003)
+    recent = reg.recent()  # since the 111 s mark
+    assert recent.count == 1 and recent.max == pytest.approx(0.003, rel=1 / 64)
+    assert reg.loop.count == 3
+
+
+def test_rates_are_computed_on_read(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(metrics.time, "perf_counter", lambda: clock[0])
+    totals = {"/a": 0}
+    calls = []
+
+    def counts():
+        calls.append(clock[0])
+        return dict(totals)
+
+    reg = MetricsRegistry()
+    reg.register_rate("msgs_per_second", "help", counts, label="address")
+    totals["/a"] = 50
+    clock[0] = 0.5
+    assert reg.snapshot().get("msgs_per_second:/a") is None  # under a second: nothing yet
+    clock[0] = 2.0
+    assert reg.snapshot()["msgs_per_second:/a"] == pytest.approx(25.0)
+    clock[0] = 2.5
+    assert reg.snapshot()["msgs_per_second:/a"] == pytest.approx(25.0)  # reused
+    totals["/a"] = 80
+    clock[0] = 5.0
+    assert reg.snapshot()["msgs_per_second:/a"] == pytest.approx(10.0)
+    assert calls == [0.0, 2.0, 5.0]
+
+
+def test_snapshot_flattens_labels():
+    reg = MetricsRegistry()
+    reg.register("underruns_total", "counter", "Underruns", lambda: 3)
+    reg.register("messages_total", "counter", "Messages", lambda: {"/b": 2, "/a": 1}, label="address")
+    reg.record_loop(0.004)
+    snap = reg.snapshot()
+    assert snap["underruns_total"] == 3.0
+    assert snap["messages_total:/a"] == 1.0 and snap["messages_total:/b"] == 2.0
+    assert snap["loops"] == 1.0
+    assert snap["loop_max_ms"] == pytest.approx(4.0)
+    assert snap["loop_p50_ms"] == pytest.approx(4.0, rel=1 / 64)
+
+
+def test_prometheus_text_format():
+    reg = MetricsRegistry()
+    reg.register("underruns_total", "counter", "Underruns", lambda: 3)
+    reg.register("messages_total", "counter", "Messages", lambda: {'/q"x': 2}, label="address")
+    reg.register("resident_bytes", "gauge", "Resident", lambda: 1.5e9)
+    reg.record_loop(0.004)
+    text = reg.prometheus()
+    lines = text.splitlines()
+
+    assert text.endswith("\n")
+    assert "# TYPE crowdstream_audio_loop_seconds summary" in lines
+    assert 'crowdstream_audio_loop_seconds{quantile="0.5"} 0.004000' in lines
+    assert 'crowdstream_audio_loop_seconds{quantile="1"} 0.004000' in lines
+    assert "crowdstream_audio_loop_seconds_count 1" in lines
+    assert "# HELP crowdstream_underruns_total Underruns" in lines
+    assert "# TYPE crowdstream_underruns_total counter" in lines
+    assert "crowdstream_underruns_total 3" in lines
+    assert 'crowdstream_messages_total{address="/q\\"x"} 2' in lines
+    assert "crowdstream_resident_bytes 1.5e+09" in lines
+    sample = re.compile(r'^[a-z_]+(\{[a-z_]+="(?:[^"\\]|\\.)*"\})? \S+$')
+    assert all(line.startswith("# ") or sample.match(line) for line in lines)
+
+
+def test_rejects_unknown_metric_kind():
+    with pytest.raises(ValueError):
+        MetricsRegistry().register("x", "histogram", "help", lambda: 0)
@@ -0,0 +1,59 @@
+import threading
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import AudioBuffer, StemPlayer
+
+CHUNK = 2048
+WARMUP = 10
+CHUNKS = 30
+
+
+class _TracedChunks:
+    """Stream hook: largest heap growth within one loop iteration, over ``CHUNKS`` chunks after a warm-up."""
+
+    def __init__(self):
+        self.go = threading.Event()
+        self.done = threading.Event()
+        self.chunks = 0
+        self.peak = 0
+        self._last = 0
+
+    def __call__(self, frames):
+        self.go.wait()
+        self.chunks += 1
+        if self.chunks == WARMUP:
+            tracemalloc.start()
+        elif WARMUP < self.chunks <= WARMUP + CHUNKS:
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak - self._last)
+            if self.chunks == WARMUP + CHUNKS:
+                tracemalloc.stop()
+                self.done.set()
+                return
+        else:
+            return
+        tracemalloc.reset_peak()
+        self._last = tracemalloc.get_traced_memory()[0]
+
+
+@pytest.mark.parametrize("tempo_ratio", [1.0, 1.03])
+def test_steady_state_mix_pass_allocates_no_arrays(make_server, wav_track, tempo_ratio):
+    traced = _TracedChunks()
+    server = make_server(on_write=traced, chunk_size=CHUNK)
+    server.time_stretch_ratio = tempo_ratio  # playback_rate method: players run at 1 / ratio
+    for deck, buffer_id in enumerate((100, 1100, 2100, 3100)):
+        path, _ = wav_track(f"deck_{deck}.wav", frames=131072, seed=deck)
+        player = StemPlayer(AudioBuffer(path, buffer_id), volume=0.5, start_pos=0.1 * deck)
+        player.playing = True
+        server.active_players[buffer_id] = player
+    server.deck_a_volume = server.deck_b_volume = 0.8
+
+    traced.go.set()
+    assert traced.done.wait(10.0)
+    # The smallest chunk-sized array, one float32 channel, holds 8 KB; what the mix
+    # pass, soft clip and output hand-off may allocate is scalars and array views
+    assert traced.peak < CHUNK * 4
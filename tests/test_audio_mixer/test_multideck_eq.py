@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pythonosc")
+pytest.importorskip("scipy")
+
+from audio_server import MultiDeckEQ, _ThreeBandOptimized
+
+SR = 44100
+CHUNK = 256
+DECKS = 4
+
+
+def _envelope(v0, v1):
+    return np.linspace(v0, v1, CHUNK, dtype=np.float32)[:, None]
+
+
+# chunk -> per-deck (low, mid, high) ramp envelopes, as _ParamRamps hands them to the EQ
+RAMPS = {
+    8: [None, (_envelope(1.0, 0.2), None, None), None, (None, _envelope(0.5, 1.5), _envelope(1.0, 0.0))],
+    9: [None, (_envelope(0.2, 0.1), None, None), None, (None, _envelope(1.5, 1.2), None)],
+    10: [(None, None, _envelope(0.3, 0.9)), None, None, None],
+}
+
+
+def test_multideck_eq_matches_per_deck_filters():
+    multi = MultiDeckEQ(SR, decks=DECKS)
+    singles = [_ThreeBandOptimized(SR) for _ in range(DECKS)]
+    rng = np.random.default_rng(0)
+    targets = {
+        0: [("low", 0.0), ("high", 1.8), ("mid", 0.5), ("low", 1.3)],
+        5: [("mid", 1.6), ("low", 0.7), ("high", 0.0), ("mid", 0.25)],
+        14: [("high", 0.4), ("mid", 1.0), ("low", 2.0), ("high", 1.1)],
+    }
+
+    for chunk in range(20):
+        for deck, (band, value) in enumerate(targets.get(chunk, ())):
+            multi.deck(deck).set_gain(band, value)
+            singles[deck].set_gain(band, value)
+        bus = rng.uniform(-0.5, 0.5, (DECKS, CHUNK, 2)).astype(np.float32)
+        ramps = RAMPS.get(chunk)
+
+        expected = [eq.process(bus[d], None if ramps is None else ramps[d]) for d, eq in enumerate(singles)]
+        multi.process(bus, ramps)
+
+        # Half-scale input: the two only differ in float32 rounding order
+        np.testing.assert_allclose(bus, np.stack(expected), rtol=0, atol=1.2e-7, err_msg=f"chunk {chunk}")
+        for d, eq in enumerate(singles):
+            view = multi.deck(d)
+            assert (view.low_gain, view.mid_gain, view.high_gain) == pytest.approx(
+                (eq.low_gain, eq.mid_gain, eq.high_gain), abs=1e-12)
+
+    # Gains are still gliding towards the last targets (smoothing in progress)
+    assert multi.deck(2).low_gain != pytest.approx(2.0, abs=1e-3)
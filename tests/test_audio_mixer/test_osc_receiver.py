@@ -0,0 +1,128 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from pythonosc.osc_bundle_builder import IMMEDIATELY, OscBundleBuilder
+from pythonosc.osc_message_builder import build_msg
+
+from audio_server import PythonAudioServer, _EventScheduler
+from osc_receiver import BundleDispatcher
+
+SR = 44100
+CLIENT = ("127.0.0.1", 9000)
+
+
+def _bundle(timetag, *contents):
+    builder = OscBundleBuilder(timetag)
+    for content in contents:
+        builder.add_content(content)
+    return builder.build()
+
+
+def _recording_dispatcher(log, **kwargs):
+    """Dispatcher whose scope and handlers append to ``log``."""
+    @contextmanager
+    def scope(timetag):
+        log.append(("enter", timetag))
+        yield
+        log.append(("exit", timetag))
+
+    disp = BundleDispatcher(scope, **kwargs)
+    disp.set_default_handler(lambda address, *args: log.append((address, *args)))
+    return disp
+
+
+def test_plain_message_is_dispatched_without_a_scope():
+    log = []
+    disp = _recording_dispatcher(log)
+    disp.call_handlers_for_packet(build_msg("/play", [1]).dgram, CLIENT)
+    assert log == [("/play", 1)]
+
+
+def test_bundle_runs_inside_its_timetag_scope():
+    log = []
+    disp = _recording_dispatcher(log)
+    timetag = time.time() + 2.0
+    packet = _bundle(timetag, build_msg("/play", [1]), build_msg("/play", [2]))
+    disp.call_handlers_for_packet(packet.dgram, CLIENT)
+
+    assert [entry[0] for entry in log] == ["enter", "/play", "/play", "exit"]
+    assert log[0][1] == pytest.approx(timetag, abs=1e-6)
+    assert log[1:3] == [("/play", 1), ("/play", 2)]
+
+
+def test_immediate_bundle_has_no_timetag():
+    log = []
+    disp = _recording_dispatcher(log)
+    disp.call_handlers_for_packet(_bundle(IMMEDIATELY, build_msg("/stop", [1])).dgram, CLIENT)
+    assert log == [("enter", None), ("/stop", 1), ("exit", None)]
+
+
+def test_nested_bundles_get_their_own_scope_after_the_outer_messages():
+    log = []
+    disp = _recording_dispatcher(log)
+    outer_at = time.time() + 1.0
+    inner_at = outer_at + 0.5
+    inner = _bundle(inner_at, build_msg("/inner", [2]))
+    packet = _bundle(outer_at, inner, build_msg("/outer", [1]))
+    disp.call_handlers_for_packet(packet.dgram, CLIENT)
+
+    assert [entry[0] for entry in log] == ["enter", "/outer", "exit", "enter", "/inner", "exit"]
+    assert log[0][1] == pytest.approx(outer_at, abs=1e-6)
+    assert log[3][1] == pytest.approx(inner_at, abs=1e-6)
+
+
+def test_bundle_handler_replies_are_returned():
+    disp = BundleDispatcher(lambda timetag: nullcontext())
+    disp.map("/ping", lambda address, n: ("/pong", n))
+    packet = _bundle(IMMEDIATELY, build_msg("/ping", [1]), build_msg("/ping", [2]))
+    assert disp.call_handlers_for_packet(packet.dgram, CLIENT) == [("/pong", 1), ("/pong", 2)]
+
+
+def test_message_counts_fold_extra_addresses_into_other():
+    disp = _recording_dispatcher([], max_addresses=2)
+    for address in ("/a", "/b", "/a", "/c", "/d"):
+        disp.call_handlers_for_packet(build_msg(address, [0]).dgram, CLIENT)
+    snapshot = disp.message_counts_snapshot()
+    assert snapshot == {"/a": 2, "/b": 1, "other": 2}
+
+    disp.call_handlers_for_packet(build_msg("/a", [0]).dgram, CLIENT)
+    assert snapshot["/a"] == 2  # a copy, not the live table
+    assert disp.message_counts_snapshot()["/a"] == 3
+
+
+def _bundle_server():
+    sched = _EventScheduler(SR)
+    server = SimpleNamespace(_t0=time.perf_counter(), _bundle=threading.local(), _scheduler=sched,
+                             _bundles_received=0, _bundles_late=0)
+    sched.publish(time.perf_counter(), SR)
+    disp = BundleDispatcher(lambda timetag: PythonAudioServer._osc_bundle(server, timetag))
+
+    def play(address, deck):
+        PythonAudioServer._schedule_at(server, PythonAudioServer._now(server), lambda: None)
+
+    disp.map("/play", play)
+    return server, disp
+
+
+def test_bundle_messages_are_scheduled_together_at_the_timetag_frame():
+    server, disp = _bundle_server()
+    packet = _bundle(time.time() + 0.5, build_msg("/play", ["A"]), build_msg("/play", ["B"]))
+    disp.call_handlers_for_packet(packet.dgram, CLIENT)
+
+    frames = sorted(frame for frame, _, _ in server._scheduler._heap)
+    assert len(frames) == 2 and frames[0] == frames[1]
+    assert frames[0] == pytest.approx(0.5 * SR, abs=0.01 * SR)
+    assert (server._bundles_received, server._bundles_late) == (1, 0)
+
+
+def test_bundle_past_its_timetag_is_counted_late():
+    server, disp = _bundle_server()
+    disp.call_handlers_for_packet(_bundle(time.time() - 1.0, build_msg("/play", ["A"])).dgram, CLIENT)
+    assert (server._bundles_received, server._bundles_late) == (1, 1)
+    assert server._scheduler.pending == 1
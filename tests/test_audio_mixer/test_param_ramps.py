@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import _ParamRamps, _Ramp
+
+CHUNK = 64
+
+
+def _ramps(values):
+    return _ParamRamps(CHUNK, values.__getitem__, values.__setitem__)
+
+
+def _run(ramps, key, frames, segment=CHUNK):
+    """Advance until the ramp on ``key`` finishes; returns its envelope frame by frame."""
+    env = []
+    while True:
+        ramps.advance(segment)
+        chunk = ramps.env(key)
+        env.append(chunk[:, 0].copy())
+        if key not in ramps.active_keys():
+            return np.concatenate(env)[:frames]
+
+
+@pytest.mark.parametrize("curve", _ParamRamps.CURVES)
+@pytest.mark.parametrize("v0, v1", [(0.0, 1.0), (1.0, 0.0), (0.25, 0.75)])
+def test_curve_endpoints(curve, v0, v1):
+    values = {"gain": v0}
+    ramps = _ramps(values)
+    ramps.submit(_Ramp("gain", v0, v1, 200, curve, CHUNK))
+
+    env = _run(ramps, "gain", 200)
+    assert env[-1] == np.float32(v1)
+    assert values["gain"] == v1
+    # First frame is one step along the curve, from the start value
+    tolerance = 0.05 if curve != "exp" else 0.1
+    assert abs(env[0] - v0) < tolerance
+    steps = np.diff(env)
+    assert np.all(steps >= -1e-6) if v1 >= v0 else np.all(steps <= 1e-6)
+
+
+def test_linear_values():
+    values = {"gain": 0.0}
+    ramps = _ramps(values)
+    ramps.submit(_Ramp("gain", 0.0, 1.0, 128, "linear", CHUNK))
+
+    env = _run(ramps, "gain", 128)
+    np.testing.assert_allclose(env, np.arange(1, 129) / 128.0, rtol=1e-6)
+
+
+def test_ramp_ending_inside_a_segment_lands_on_target():
+    values = {"gain": 0.0}
+    ramps = _ramps(values)
+    ramps.submit(_Ramp("gain", 0.0, 1.0, 10, "linear", CHUNK))
+
+    for _ in range(2):
+        ramps.advance(4)
+    ramps.advance(4)
+    env = ramps.env("gain")[:, 0]
+    np.testing.assert_allclose(env, [0.9, 1.0, 1.0, 1.0], rtol=1e-6)
+    assert values["gain"] == 1.0
+    ramps.advance(4)
+    assert ramps.env("gain") is None
+
+
+def test_equal_power_pair_is_complementary():
+    values = {"in": 0.0, "out": 1.0}
+    ramps = _ramps(values)
+    ramps.submit(_Ramp("in", 0.0, 1.0, CHUNK, "equal_power", CHUNK))
+    ramps.submit(_Ramp("out", 1.0, 0.0, CHUNK, "equal_power", CHUNK))
+    ramps.advance(CHUNK)
+
+    rise, fall = ramps.env("in")[:, 0], ramps.env("out")[:, 0]
+    angle = np.arange(1, CHUNK + 1) / CHUNK * np.pi / 2
+    np.testing.assert_allclose(rise, np.sin(angle), atol=1e-6)
+    np.testing.assert_allclose(fall, np.cos(angle), atol=1e-6)
+    np.testing.assert_allclose(rise ** 2 + fall ** 2, 1.0, atol=1e-5)  # constant power
+
+
+def test_exp_curve_is_linear_in_db_with_floor():
+    values = {"gain": 1.0}
+    ramps = _ramps(values)
+    ramps.submit(_Ramp("gain", 1.0, 0.0, 100, "exp", CHUNK))
+
+    env = _run(ramps, "gain", 100)
+    db = 20 * np.log10(np.maximum(env[:-1], 1e-9))
+    np.testing.assert_allclose(np.diff(db), -0.6, atol=1e-3)  # -60 dB over 100 frames
+    assert env[-1] == 0.0
+
+
+def test_start_from_current_value_and_retarget():
+    values = {"gain": 0.5}
+    ramps = _ramps(values)
+    ramps.submit(_Ramp("gain", None, 1.0, 4 * CHUNK, "linear", CHUNK))
+    ramps.advance(CHUNK)
+    env = ramps.env("gain")[:, 0]
+    assert env[0] == pytest.approx(0.5 + 0.5 / (4 * CHUNK))
+    midway = float(env[-1])
+
+    # A new ramp on the same key continues from where the running one is
+    ramps.submit(_Ramp("gain", None, 0.0, CHUNK, "linear", CHUNK))
+    ramps.advance(CHUNK)
+    env = ramps.env("gain")[:, 0]
+    assert env[0] == pytest.approx(midway * (1 - 1 / CHUNK), rel=1e-5)
+    assert env[-1] == 0.0
+    assert values["gain"] == 0.0
+
+
+def test_cancel_and_transform():
+    values = {"gain": 0.0, "eq": 100.0}
+    ramps = _ramps(values)
+    ramps.submit(_Ramp("gain", 0.0, 1.0, 1000, "linear", CHUNK))
+    ramps.submit(_Ramp("eq", 100.0, 0.0, CHUNK, "linear", CHUNK,
+                       transform=lambda env: np.multiply(env, 0.01, out=env)))
+    ramps.advance(CHUNK)
+    assert ramps.env("eq")[-1, 0] == 0.0
+    assert ramps.env("eq")[0, 0] == pytest.approx((100.0 - 100.0 / CHUNK) * 0.01)
+    assert values["eq"] == 0.0  # the scalar gets the untransformed target
+
+    ramps.cancel("gain")
+    ramps.advance(CHUNK)
+    assert not ramps.has_envelopes
+    assert ramps.active_keys() == []
+    assert values["gain"] == 0.0
@@ -0,0 +1,149 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import AudioBuffer, StemPlayer, _PlayerMatrix
+
+CHUNK = 256
+LENGTHS = (3000, 2711, 1999, 4096)
+
+
+@pytest.fixture
+def stems(wav_track):
+    """Noise stems of different lengths, so loops wrap at different frames."""
+    return [wav_track(f"stem_{i}.wav", frames=frames, seed=i)[0] for i, frames in enumerate(LENGTHS)]
+
+
+def _players(stems, rates, loop=True, start_pos=0.3, sample_format="float32"):
+    players = []
+    for i, rate in enumerate(rates):
+        buf = AudioBuffer(stems[i], 100 + i, sample_format=sample_format)
+        player = StemPlayer(buf, rate=rate, volume=0.4 + 0.15 * i,
+                            start_pos=start_pos, loop=loop)
+        player._frac = 0.25 * i
+        player.playing = True
+        players.append(player)
+    return players
+
+
+def _loop_render(players, bus, frames, envs, interpolation):
+    """The per-player path of _render_segment (one player per deck)."""
+    out = np.zeros((CHUNK, 2), dtype=np.float32)[:frames]
+    for deck, player in enumerate(players):
+        player.interpolation = interpolation
+        env = envs[deck]
+        if env is None:
+            player.get_audio_chunk(frames, out=out)
+        else:
+            volume, player.volume = player.volume, 1.0
+            player.get_audio_chunk(frames, out=out)
+            player.volume = volume
+            out *= env
+        bus[deck] += out
+
+
+def _compare(stems, rates, interpolation, segments=(CHUNK,), loop=True, start_pos=0.3, ramp=False, chunks=6,
+             sample_format="float32", atol=0.0):
+    reference = _players(stems, rates, loop, start_pos, sample_format)
+    batched = _players(stems, rates, loop, start_pos, sample_format)
+    matrix = _PlayerMatrix(CHUNK, decks=4)
+    ref_bus = np.zeros((4, CHUNK, 2), dtype=np.float32)
+    mat_bus = np.zeros((4, CHUNK, 2), dtype=np.float32)
+    for _ in range(chunks):
+        ref_bus.fill(0.0)
+        mat_bus.fill(0.0)
+        a = 0
+        for frames in segments:
+            b = a + frames
+            envs = [None] * 4
+            if ramp:
+                envs[1] = np.linspace(0.2, 0.9, frames, dtype=np.float32)[:, None]
+            _loop_render(reference, ref_bus[:, a:b], frames, envs, interpolation)
+            batch = [(player, deck, envs[deck]) for deck, player in enumerate(batched)]
+            matrix.render(batch, mat_bus[:, a:b], frames, interpolation)
+            a = b
+        np.testing.assert_allclose(mat_bus, ref_bus, rtol=0, atol=atol)
+        assert [p.position for p in batched] == [p.position for p in reference]
+        assert [p._frac for p in batched] == [p._frac for p in reference]
+
+
+@pytest.mark.parametrize("interpolation", ["linear", "cubic"])
+@pytest.mark.parametrize("rates", [(1.0, 1.0, 1.0, 1.0), (1.03, 0.97, 1.5, 0.5), (1.0, 1.03, 1.0, 0.91)])
+def test_matches_per_player_render_bit_for_bit(stems, rates, interpolation):
+    _compare(stems, rates, interpolation)
+
+
+@pytest.mark.parametrize("rates", [(1.0, 1.0, 1.0, 1.0), (1.03, 0.97, 1.0, 0.5)])
+def test_matches_on_split_segments(stems, rates):
+    _compare(stems, rates, "cubic", segments=(100, 37, 119))
+
+
+@pytest.mark.parametrize("rates", [(1.0, 1.0, 1.0, 1.0), (1.03, 0.97, 1.0, 0.5)])
+def test_matches_past_the_end_without_loop(stems, rates):
+    _compare(stems, rates, "linear", loop=False, start_pos=0.9, chunks=4)
+
+
+def test_matches_with_volume_ramp(stems):
+    _compare(stems, (1.03, 1.0, 0.97, 1.0), "linear", segments=(200, 56), ramp=True)
+
+
+@pytest.mark.parametrize("sample_format", ["int16", "float16"])
+def test_matches_with_compact_samples_at_unity_rate(stems, sample_format):
+    _compare(stems, (1.0, 1.0, 1.0, 1.0), "cubic", segments=(100, 156), sample_format=sample_format)
+
+
+@pytest.mark.parametrize("sample_format", ["int16", "float16"])
+def test_matches_with_compact_samples_interpolated(stems, sample_format):
+    # StemPlayer folds the volume into the conversion scale; the matrix applies it
+    # in the routing matmul, after the weighted sum: the last bit may differ
+    _compare(stems, (1.03, 0.97, 1.0, 0.5), "cubic", segments=(100, 156), sample_format=sample_format,
+             atol=2 ** -23)
+
+
+@pytest.mark.parametrize("sample_format", ["float32", "int16"])
+@pytest.mark.parametrize("rates", [(1.0, 1.0, 1.0, 1.0), (1.03, 0.97, 1.0, 0.5)])
+def test_steady_state_render_allocates_no_arrays(stems, rates, sample_format):
+    players = _players(stems, rates, sample_format=sample_format)
+    matrix = _PlayerMatrix(CHUNK, decks=4)
+    bus = np.zeros((4, CHUNK, 2), dtype=np.float32)
+    half = CHUNK // 2
+    full_env = np.linspace(0.2, 0.9, CHUNK, dtype=np.float32)[:, None]
+    half_env = full_env[:half]
+    full = [(player, deck, full_env if deck == 1 else None) for deck, player in enumerate(players)]
+    split = [(player, deck, half_env if deck == 1 else None) for deck, player in enumerate(players)]
+    for _ in range(3):
+        matrix.render(full, bus, CHUNK, "cubic")
+        matrix.render(split, bus[:, :half], half, "cubic")
+
+    tracemalloc.start()
+    try:
+        for _ in range(20):
+            matrix.render(full, bus, CHUNK, "cubic")
+            matrix.render(split, bus[:, :half], half, "cubic")  # split segment
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The smallest per-chunk array here, (players, frames) float32, is 4 KB
+    assert peak < 4096
+
+
+@pytest.mark.parametrize("rates", [(1.0, 1.0, 1.0, 1.0), (1.03, 0.97, 1.0, 0.5)])
+def test_per_player_compact_render_allocates_no_arrays(stems, rates):
+    players = _players(stems, rates, sample_format="int16")
+    out = np.zeros((CHUNK, 2), dtype=np.float32)
+    for player in players:
+        player.interpolation = "cubic"
+        player.get_audio_chunk(CHUNK, out=out)
+
+    tracemalloc.start()
+    try:
+        for _ in range(20):
+            for player in players:
+                player.get_audio_chunk(CHUNK, out=out)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 2048  # one chunk of one player is 2 KB
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from disk_stream import ProgressiveDecode
+
+BLOCK = 1000
+FRAMES = 10 * BLOCK + 500  # ten full blocks and a short last one
+
+
+@pytest.fixture
+def source(wav_track):
+    return wav_track(frames=FRAMES)
+
+
+def _decode(path, dtype=np.float32):
+    return ProgressiveDecode(path, np.zeros((FRAMES, 2), dtype=dtype), block_frames=BLOCK)
+
+
+def test_nothing_is_ready_before_decoding(source):
+    path, _ = source
+    dec = _decode(path)
+    assert not dec.ready(0, 1)
+    assert dec.ready(5, 5)  # empty range
+    assert dec.stats()["decoded_pct"] == 0.0
+
+
+def test_decode_range_covers_every_overlapping_block(source):
+    path, data = source
+    dec = _decode(path)
+    dec.decode_range(2500, 4001)  # blocks 2, 3 and 4
+
+    assert dec.ready(2000, 5000)
+    assert not dec.ready(1999, 2001)
+    assert not dec.ready(4999, 5001)
+    np.testing.assert_array_equal(dec.data[2000:5000], data[2000:5000])
+    assert not dec.data[:2000].any() and not dec.data[5000:].any()
+    assert dec._cursor == 5
+
+
+def test_decode_range_is_clamped_to_the_file(source):
+    path, data = source
+    dec = _decode(path)
+    dec.decode_range(FRAMES - 10, FRAMES + 5000)
+    assert dec.ready(10 * BLOCK, FRAMES, loop=False)
+    assert dec._cursor == 0  # wraps to the start after the last block
+    np.testing.assert_array_equal(dec.data[10 * BLOCK:], data[10 * BLOCK:])
+
+    dec.decode_range(-300, 0)  # at least one frame from 0
+    assert dec.ready(0, BLOCK)
+    assert not dec.ready(BLOCK, BLOCK + 1)
+
+
+def test_ready_wraps_past_the_end_when_looping(source):
+    path, _ = source
+    dec = _decode(path)
+    dec.decode_range(FRAMES - 1, FRAMES)
+    assert dec.ready(FRAMES - 100, FRAMES + 50, loop=False)
+    assert not dec.ready(FRAMES - 100, FRAMES + 50, loop=True)
+    dec.decode_range(0, 1)
+    assert dec.ready(FRAMES - 100, FRAMES + 50, loop=True)
+
+
+def test_service_continues_from_the_cue_and_finishes(source):
+    path, data = source
+    dec = _decode(path)
+    finished = []
+    dec.on_done = lambda: finished.append(True)
+    dec.decode_range(7000, 7001)
+
+    assert dec.service(limit=2)
+    assert dec.ready(7000, 10000) and not dec.ready(0, 1)
+    while dec.service(limit=2):
+        pass
+    assert dec.done and finished == [True]
+    assert dec.ready(0, FRAMES) and dec.stats()["decoded_pct"] == 100.0
+    np.testing.assert_array_equal(dec.data, data)
+
+
+def test_prioritize_moves_the_cursor(source):
+    path, _ = source
+    dec = _decode(path)
+    dec.prioritize(3500)
+    dec.service(limit=1)
+    assert dec.ready(3000, 4000) and not dec.ready(0, 3000)
+
+
+def test_int16_storage(wav_track):
+    data = (np.random.default_rng(1).standard_normal((FRAMES, 2)) * 3000).astype(np.int16)
+    path, _ = wav_track("pcm16.wav", data=data, subtype="PCM_16")
+    dec = _decode(path, dtype=np.int16)
+    while dec.service(limit=4):
+        pass
+    np.testing.assert_array_equal(dec.data, data)
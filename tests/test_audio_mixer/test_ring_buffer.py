@@ -0,0 +1,136 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pyaudio
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import PythonAudioServer, _AudioRingBuffer
+
+
+def _frames(start, count):
+    values = np.arange(start, start + count, dtype=np.float32)
+    return np.stack([values, -values], axis=1)
+
+
+def test_write_read_roundtrip():
+    ring = _AudioRingBuffer(8)
+    assert ring.write(_frames(0, 5)) == 5
+    assert ring.available == 5
+    assert ring.free == 3
+
+    out = np.zeros((5, 2), dtype=np.float32)
+    assert ring.read_into(out) == 5
+    np.testing.assert_array_equal(out, _frames(0, 5))
+    assert ring.available == 0
+    assert ring.free == 8
+
+
+def test_wraparound_keeps_frame_order():
+    ring = _AudioRingBuffer(8)
+    ring.write(_frames(0, 6))
+    out = np.zeros((4, 2), dtype=np.float32)
+    ring.read_into(out)
+
+    # 2 unread frames at the end, 5 new ones wrap to the start of the storage
+    assert ring.write(_frames(6, 5)) == 5
+    out = np.zeros((7, 2), dtype=np.float32)
+    assert ring.read_into(out) == 7
+    np.testing.assert_array_equal(out, _frames(4, 7))
+
+
+def test_write_stops_at_capacity():
+    ring = _AudioRingBuffer(4)
+    assert ring.write(_frames(0, 6)) == 4
+    assert ring.free == 0
+    assert ring.write(_frames(6, 1)) == 0
+
+    out = np.zeros((4, 2), dtype=np.float32)
+    ring.read_into(out)
+    np.testing.assert_array_equal(out, _frames(0, 4))
+
+
+def test_read_short_when_empty():
+    ring = _AudioRingBuffer(8)
+    ring.write(_frames(0, 3))
+    out = np.full((5, 2), 7.0, dtype=np.float32)
+    assert ring.read_into(out) == 3
+    np.testing.assert_array_equal(out[:3], _frames(0, 3))
+    np.testing.assert_array_equal(out[3:], 7.0)  # untouched: the caller fills silence
+    assert ring.read_into(out) == 0
+
+
+def test_clear_drops_unread_frames():
+    ring = _AudioRingBuffer(8)
+    ring.write(_frames(0, 5))
+    ring.clear()
+    assert ring.available == 0
+    assert ring.free == 8
+
+
+def test_reserve_grows_and_keeps_unread_frames():
+    ring = _AudioRingBuffer(4)
+    ring.write(_frames(0, 3))
+    out = np.zeros((2, 2), dtype=np.float32)
+    ring.read_into(out)
+    ring.write(_frames(3, 3))  # wraps
+
+    ring.reserve(10)
+    assert ring.capacity >= 14
+    assert ring.write(_frames(6, 10)) == 10
+    out = np.zeros((14, 2), dtype=np.float32)
+    assert ring.read_into(out) == 14
+    np.testing.assert_array_equal(out, _frames(2, 14))
+
+
+def _callback_server(ring, chunk_size=64):
+    return SimpleNamespace(
+        channels=2,
+        chunk_size=chunk_size,
+        sample_rate=44100,
+        running=True,
+        output_mode="callback",
+        stream=SimpleNamespace(is_active=lambda: True),
+        _callback_out=np.zeros((chunk_size, 2), dtype=np.float32),
+        _output_ring=ring,
+        _ring_space=threading.Event(),
+        output_underrun_count=0,
+        output_overrun_count=0,
+    )
+
+
+def test_callback_counts_underrun_and_pads_silence():
+    ring = _AudioRingBuffer(256)
+    server = _callback_server(ring)
+    ring.write(_frames(1, 40))
+
+    out, flag = PythonAudioServer._audio_callback(server, None, 64, {}, 0)
+    assert flag == pyaudio.paContinue
+    np.testing.assert_array_equal(out[:40], _frames(1, 40))
+    np.testing.assert_array_equal(out[40:], 0.0)
+    assert server.output_underrun_count == 1
+    assert server._ring_space.is_set()
+
+    ring.write(_frames(0, 64))
+    PythonAudioServer._audio_callback(server, None, 64, {}, 0)
+    assert server.output_underrun_count == 1
+
+
+def test_emit_counts_overrun_when_ring_stays_full():
+    ring = _AudioRingBuffer(128)
+    server = _callback_server(ring)
+    chunk = _frames(0, 64)
+
+    PythonAudioServer._emit_chunk(server, chunk)
+    PythonAudioServer._emit_chunk(server, chunk)
+    assert ring.free == 0
+    assert server.output_overrun_count == 0
+
+    # Nobody reads: the chunk is dropped after the wait, the ring is unchanged
+    PythonAudioServer._emit_chunk(server, _frames(100, 64))
+    assert server.output_overrun_count == 1
+    out = np.zeros((128, 2), dtype=np.float32)
+    ring.read_into(out)
+    np.testing.assert_array_equal(out, np.concatenate([chunk, chunk]))
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from shm_store import SharedPCMStore
+
+FRAMES = 6000
+
+
+@pytest.fixture
+def source(wav_track):
+    return wav_track(frames=FRAMES)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SharedPCMStore(tmp_path / "shm-manifest.json")
+    yield store
+    store.prune([])
+
+
+def test_create_commit_attach_roundtrip(store, source, tmp_path):
+    path, data = source
+    shared = store.create(path, data.shape, "float32")
+    assert shared is not None and not shared.any()
+    assert store.attach(path) is None  # incomplete until committed
+
+    np.copyto(shared, data)
+    store.commit(path, shared)
+    # A new process: a second store reading the same manifest
+    restarted = SharedPCMStore(tmp_path / "shm-manifest.json")
+    attached = restarted.attach(path)
+    assert attached is not None
+    np.testing.assert_array_equal(attached, data)
+    assert (store.published, restarted.attached) == (1, 1)
+    assert restarted.stats()["segments"] == 1
+
+
+def test_corrupted_segment_is_not_attached(store, source):
+    path, data = source
+    shared = store.publish(path, data)
+    shared[0, 0] += 1.0
+    assert store.attach(path) is None
+    assert store.entries() == {}
+
+
+def test_segment_stays_until_its_last_holder_discards_it(store, source):
+    path, data = source
+    store.publish(path, data)
+    assert store.attach(path) is not None
+    assert store.references(path) == 2
+
+    store.discard(path)
+    assert store.references(path) == 1
+    np.testing.assert_array_equal(store.attach(path), data)
+
+    store.discard(path)
+    store.discard(path)
+    assert store.references(path) == 0
+    assert store.attach(path) is None
+    assert store.entries() == {}
+
+
+def test_create_does_not_replace_a_segment_in_use(store, source):
+    path, data = source
+    filling = store.create(path, data.shape, "float32")
+    assert store.create(path, data.shape, "float32") is None
+    assert store.publish(path, data) is data  # falls back to the private array
+
+    np.copyto(filling, data)
+    store.commit(path, filling)
+    np.testing.assert_array_equal(store.attach(path), data)
+
+
+def test_stale_segment_without_holders_is_replaced(store, source, tmp_path):
+    path, data = source
+    store.create(path, data.shape, "float32")
+    # An earlier process left it incomplete: this process holds no reference
+    restarted = SharedPCMStore(tmp_path / "shm-manifest.json")
+    shared = restarted.publish(path, data)
+    assert shared is not data
+    np.testing.assert_array_equal(restarted.attach(path), data)
+
+
+def test_buffers_of_one_file_share_its_segment(store, source):
+    pytest.importorskip("pythonosc")
+    from audio_server import AudioBuffer
+
+    path, _ = source
+    first = AudioBuffer(path, 1, pcm_store=store)
+    second = AudioBuffer(path, 2, pcm_store=store)
+    assert first.shared and second.shared
+    assert store.references(path) == 2
+
+    first.release()  # evicted: the segment stays for the other buffer
+    assert store.attach(path) is not None
+    store.discard(path)
+    second.discard_shared()
+    assert store.references(path) == 0
+    assert store.entries() == {}
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import AudioBuffer, StemPlayer
+
+
+def _player(wav_track, data=None, frames=4096, **kwargs):
+    path, data = wav_track(frames=frames, data=data)
+    player = StemPlayer(AudioBuffer(path, 100), **kwargs)
+    player.playing = True
+    return player, data
+
+
+def _linear_reference(data, start, rate, count):
+    """Sample-by-sample linear interpolation with loop wrap."""
+    pos = start + np.arange(count, dtype=np.float64) * rate
+    i0 = np.floor(pos).astype(np.int64)
+    t = (pos - i0)[:, None]
+    frames = data.shape[0]
+    return data[i0 % frames] * (1.0 - t) + data[(i0 + 1) % frames] * t
+
+
+@pytest.mark.parametrize("kind", ["linear", "cubic"])
+def test_phase_carries_across_chunks(wav_track, kind):
+    split, _ = _player(wav_track, rate=0.73, volume=1.0, start_pos=0.25, interpolation=kind)
+    whole, _ = _player(wav_track, rate=0.73, volume=1.0, start_pos=0.25, interpolation=kind)
+
+    halves = np.concatenate([split.get_audio_chunk(512).copy(), split.get_audio_chunk(512).copy()])
+    np.testing.assert_allclose(halves, whole.get_audio_chunk(1024), atol=1e-6)
+    assert split.position == whole.position
+    assert split._frac == pytest.approx(whole._frac)
+
+
+def test_loop_wrap_is_continuous_at_non_integer_rate(wav_track):
+    frames = 1000
+    data = np.stack([np.sin(2 * np.pi * np.arange(frames) / 100)] * 2, axis=1).astype(np.float32)
+    player, data = _player(wav_track, data=data, rate=1.37, volume=1.0, start_pos=0.9)
+    start = player.position
+
+    out = np.concatenate([player.get_audio_chunk(256).copy() for _ in range(4)])
+
+    np.testing.assert_allclose(out, _linear_reference(data, start, 1.37, out.shape[0]), atol=1e-5)
+    # The sine has a whole number of periods, so the wrap introduces no jump
+    assert np.abs(np.diff(out[:, 0])).max() < 1.37 * 2 * np.pi / 100
+
+
+def test_cubic_reproduces_linear_ramp(wav_track):
+    ramp = np.arange(4096, dtype=np.float32) * 1e-4
+    player, _ = _player(wav_track, data=np.stack([ramp, -ramp], axis=1), rate=0.61,
+                        volume=1.0, start_pos=0.1, loop=False, interpolation="cubic")
+    start = player.position
+
+    out = np.concatenate([player.get_audio_chunk(256).copy() for _ in range(3)])
+
+    expected = (start + np.arange(out.shape[0]) * 0.61) * 1e-4
+    np.testing.assert_allclose(out[:, 0], expected, rtol=1e-5)
+    np.testing.assert_allclose(out[:, 1], -expected, rtol=1e-5)
+
+
+def test_unity_rate_returns_source_samples(wav_track):
+    player, data = _player(wav_track, volume=1.0, start_pos=0.5)
+    start = player.position
+
+    out = np.concatenate([player.get_audio_chunk(300).copy() for _ in range(3)])
+
+    np.testing.assert_array_equal(out, data[start:start + 900])
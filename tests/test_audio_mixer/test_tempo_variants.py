@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from audio_cache import DecodedAudioCache
+from time_stretch import TempoVariantStore, render_tempo_variant, stretch_offline
+
+KEY = ("/music/track.wav", 1000)
+
+
+class _ManualPool:
+    """Stands in for the process pool; the test resolves the futures itself."""
+
+    def __init__(self):
+        self.submitted = []
+        self.job_args = []
+
+    def submit(self, fn, file_path, ratio, *args):
+        future = Future()
+        self.submitted.append((ratio, future))
+        self.job_args.append((file_path, ratio) + args)
+        return future
+
+
+def _store(ratios=(0.5, 2.0), budget_mb=1.0, **kwargs):
+    store = TempoVariantStore(ratios, budget_mb=budget_mb, **kwargs)
+    pool = _ManualPool()
+    store._get_pool = lambda: pool
+    return store, pool
+
+
+def _render(pool, frames=1000):
+    for ratio, future in pool.submitted:
+        if not future.done():
+            future.set_result(np.zeros((int(frames * ratio), 2), dtype=np.float32))
+
+
+def test_ensure_queues_missing_ratios_once():
+    store, pool = _store()
+    store.ensure(KEY)
+    store.ensure(KEY)
+    assert sorted(r for r, _ in pool.submitted) == [0.5, 2.0]
+
+    _render(pool)
+    assert store.nearest(KEY, 1.9)[0] == 2.0
+    store.ensure(KEY)
+    assert len(pool.submitted) == 2
+
+
+def test_discard_with_pending_renders_does_not_deadlock():
+    store, pool = _store()
+    store.ensure(KEY)
+
+    done = threading.Event()
+
+    def discard():
+        store.discard(KEY)
+        done.set()
+
+    threading.Thread(target=discard, daemon=True).start()
+    assert done.wait(2.0), "discard() deadlocked on its own done callback"
+    assert all(future.cancelled() for _, future in pool.submitted)
+    assert store.stats()["pending"] == 0
+
+
+def test_render_finishing_after_discard_is_dropped():
+    store, pool = _store()
+    store.ensure(KEY)
+    for _, future in pool.submitted:
+        future.set_running_or_notify_cancel()  # already running: cancel() fails
+    store.discard(KEY)
+
+    _render(pool)
+    assert store.nearest(KEY, 2.0) == (1.0, None)
+    assert store.stats()["variants"] == 0
+
+
+def test_evicted_variants_render_again():
+    # Budget fits the 0.5x variant (4 KB) but not both with the 2x one (16 KB)
+    store, pool = _store(budget_mb=16000 / (1024 * 1024))
+    store.ensure(KEY)
+    _render(pool)
+    assert store.evicted == 1
+    missing = [r for r in (0.5, 2.0) if store.nearest(KEY, r)[0] != r]
+    assert len(missing) == 1
+
+    store.ensure(KEY)
+    assert [r for r, f in pool.submitted if not f.done()] == missing
+
+
+def test_render_reuses_the_servers_int16_cache_entry(tmp_path, wav_track):
+    path, _ = wav_track(frames=8192)
+    cache = DecodedAudioCache(tmp_path / "cache", 44100, "int16")
+    stored, _, _ = cache.get_or_decode(path)
+    assert stored.dtype == np.int16
+
+    variant = render_tempo_variant(str(path), 1.25, 44100, str(tmp_path / "cache"), "int16")
+
+    # No second (float32) entry; the variant is the stretch of the dequantized samples
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+    expected = stretch_offline(stored.astype(np.float32) / 32768, 1.25)
+    assert variant.dtype == np.float32
+    np.testing.assert_allclose(variant, expected, atol=1e-6)
+
+
+def test_store_passes_sample_format_to_render_jobs():
+    store, pool = _store(ratios=(2.0,), sample_format="int16")
+    store.ensure(KEY)
+    assert pool.job_args == [(KEY[0], 2.0, store.target_sr, None, "int16")]
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pythonosc")
+
+from audio_server import _ThreeBand
+
+SR = 44100
+
+
+def _recursion(g, target, k, n):
+    out = np.empty(n)
+    for i in range(n):
+        g += (target - g) * k
+        out[i] = g
+    return out
+
+
+def test_smoothed_gains_match_per_sample_recursion():
+    eq = _ThreeBand(SR, smoothing_time_ms=5.0)
+    eq.set_gain("low", 0.2)
+    eq.set_gain("high", 1.7)
+    k = eq._smoothing_factor
+
+    low, mid, high = eq._smoothed_gains(256)
+
+    np.testing.assert_allclose(low, _recursion(1.0, 0.2, k, 256), rtol=1e-12)
+    np.testing.assert_allclose(high, _recursion(1.0, 1.7, k, 256), rtol=1e-12)
+    assert mid == 1.0  # settled bands stay scalars
+    assert (eq.low_gain, eq.high_gain) == (low[-1], high[-1])
+
+
+def test_smoothed_gains_carry_into_next_chunk():
+    eq = _ThreeBand(SR, smoothing_time_ms=5.0)
+    eq.set_gain("mid", 0.0)
+    k = eq._smoothing_factor
+    expected = _recursion(1.0, 0.0, k, 300 + 212)
+
+    first = eq._smoothed_gains(300)[1]
+    second = eq._smoothed_gains(212)[1]
+
+    np.testing.assert_allclose(np.concatenate([first, second]), expected, rtol=1e-12, atol=1e-15)
+    assert eq.mid_gain == second[-1]
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from time_stretch import PhaseVocoderStretch, StreamingTimeStretch, stretch_offline
+
+SR = 44100
+
+
+class _Sink:
+    def __init__(self):
+        self.blocks = []
+
+    def reserve(self, n):
+        pass
+
+    def write(self, frames):
+        self.blocks.append(np.array(frames, dtype=np.float32))
+
+    @property
+    def frames(self):
+        return np.concatenate(self.blocks) if self.blocks else np.zeros((0, 2), dtype=np.float32)
+
+
+def _sine(frames, freq=440.0):
+    t = np.arange(frames) / SR
+    tone = (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+    return np.stack([tone, tone], axis=1)
+
+
+def test_streaming_interface_is_abstract():
+    with pytest.raises(TypeError):
+        StreamingTimeStretch()
+
+
+@pytest.mark.parametrize("ratio", [0.8, 1.25])
+def test_audiotsm_stretch_output_length_follows_ratio(ratio):
+    pytest.importorskip("audiotsm")
+    from time_stretch import AudiotsmStretch
+
+    stage = AudiotsmStretch(channels=2, ratio=ratio)
+    signal = _sine(512 * 200)
+    sink = _Sink()
+    written = sum(stage.process(chunk, sink) for chunk in np.split(signal, 200))
+
+    assert written == sink.frames.shape[0]
+    # WSOLA holds back up to one analysis frame; speed is quantized to 1/512
+    assert written == pytest.approx(signal.shape[0] * ratio, abs=2 * stage.frame_length)
+
+
+def _stream(stage, signal, chunk=512):
+    sink = _Sink()
+    for start in range(0, signal.shape[0], chunk):
+        stage.process(signal[start:start + chunk], sink)
+    return sink.frames
+
+
+def _peak_hz(signal):
+    spectrum = np.abs(np.fft.rfft(signal[:, 0] * np.hanning(signal.shape[0])))
+    return np.argmax(spectrum) * SR / signal.shape[0]
+
+
+def _rms(signal):
+    return float(np.sqrt(np.mean(signal.astype(np.float64) ** 2)))
+
+
+@pytest.mark.parametrize("ratio", [0.8, 1.25])
+def test_phase_vocoder_output_length_follows_ratio(ratio):
+    stage = PhaseVocoderStretch(channels=2, ratio=ratio)
+    signal = _sine(SR * 2)
+
+    out = _stream(stage, signal)
+
+    # Output i lines up with input i / ratio; up to one input frame is still
+    # waiting for analysis or sitting in the overlap-add
+    expected = signal.shape[0] * ratio
+    assert expected - stage.frame_length * ratio <= out.shape[0] <= expected
+
+
+@pytest.mark.parametrize("ratio", [0.8, 1.25])
+def test_phase_vocoder_keeps_pitch_and_level(ratio):
+    stage = PhaseVocoderStretch(channels=2, ratio=ratio)
+    signal = _sine(SR * 2, freq=1000.0)
+
+    out = _stream(stage, signal)
+    steady = out[stage.frame_length:-stage.frame_length]
+    reference = signal[stage.frame_length:-stage.frame_length]
+
+    assert _peak_hz(steady) == pytest.approx(_peak_hz(reference), abs=SR / steady.shape[0])
+    assert _rms(steady) == pytest.approx(_rms(reference), rel=0.03)
+
+
+@pytest.mark.parametrize("ratio", [0.8, 1.25])
+def test_stretch_offline_matches_streaming_apart_from_latency(ratio):
+    signal = _sine(SR, freq=330.0)
+
+    offline = stretch_offline(signal, ratio)
+    streamed = _stream(PhaseVocoderStretch(channels=2, ratio=ratio), signal)
+
+    assert offline.shape == (round(signal.shape[0] * ratio), 2)
+    # The streaming stage holds back its last frame; everything it has emitted agrees
+    assert 0 < streamed.shape[0] < offline.shape[0]
+    np.testing.assert_allclose(streamed, offline[:streamed.shape[0]], atol=1e-5)
+    assert _rms(offline) == pytest.approx(_rms(signal), rel=0.03)